@@ -0,0 +1,98 @@
+"""
+Benchmark of incoming parameters parsing.
+
+It compares per-parameter `parse_params` with the compiled
+`ParamsValidator` for a task with several pydantic-model arguments.
+
+Usage:
+
+    python benchmarks/bench_params_parsing.py [--iterations N]
+"""
+import argparse
+import inspect
+from time import perf_counter
+from typing import Any, Callable, Dict, List, get_type_hints
+
+from pydantic import BaseModel
+
+from taskiq.compat import model_copy
+from taskiq.message import TaskiqMessage
+from taskiq.receiver.params_parser import ParamsValidator, parse_params
+
+
+class Address(BaseModel):
+    """Nested model."""
+
+    city: str
+    street: str
+    building: int
+
+
+class User(BaseModel):
+    """Model with nested fields."""
+
+    id: int
+    name: str
+    tags: List[str]
+    address: Address
+
+
+class Order(BaseModel):
+    """Another model."""
+
+    id: int
+    items: Dict[str, int]
+    total: float
+
+
+def task(user: User, order: Order, coupon: Order, owner: User, count: int) -> None:
+    """Task with several pydantic-model arguments."""
+
+
+USER = {
+    "id": 1,
+    "name": "user",
+    "tags": ["a", "b", "c"],
+    "address": {"city": "city", "street": "street", "building": "1"},
+}
+ORDER = {"id": "2", "items": {"a": 1, "b": 2}, "total": "10.5"}
+
+
+def _measure(name: str, iterations: int, func: Callable[[TaskiqMessage], Any]) -> None:
+    message = TaskiqMessage(
+        task_id="id",
+        task_name="task",
+        labels={},
+        args=[USER, ORDER],
+        kwargs={"coupon": ORDER, "owner": USER, "count": "3"},
+    )
+    messages = [model_copy(message, deep=True) for _ in range(iterations)]
+    start = perf_counter()
+    for msg in messages:
+        func(msg)
+    elapsed = perf_counter() - start
+    print(f"{name:<24} {elapsed / iterations * 1e6:8.2f} us/message")  # noqa: T201
+
+
+def main(iterations: int) -> None:
+    """
+    Run all benchmarks.
+
+    :param iterations: number of messages to parse.
+    """
+    signature = inspect.signature(task)
+    type_hints = get_type_hints(task)
+    validator = ParamsValidator(signature, type_hints)
+
+    _measure(
+        "parse_params",
+        iterations,
+        lambda msg: parse_params(signature, type_hints, msg),
+    )
+    _measure("ParamsValidator", iterations, validator.validate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,150 @@
+"""
+Benchmark of worker startup with and without `--preload`.
+
+It generates a project with a slow and memory-hungry tasks module,
+starts `taskiq worker` and measures the time until all workers are ready,
+and memory of worker processes. PSS counts shared pages proportionally,
+so it shows memory that is really used by each worker. Linux only.
+
+Usage:
+
+    python benchmarks/bench_preload.py [--workers N] [--module-mb MB] [--import-time S]
+"""
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+BROKER_MODULE = """
+import asyncio
+import time
+
+from taskiq.abc.broker import AsyncBroker
+
+
+class IdleBroker(AsyncBroker):
+    async def kick(self, message):
+        pass
+
+    async def listen(self):
+        while True:
+            await asyncio.sleep(1)
+        yield b""
+
+
+broker = IdleBroker()
+
+# Emulates heavy libraries: slow import and a lot of objects.
+time.sleep({import_time})
+DATA = [str(i) for i in range({objects})]
+
+
+@broker.task
+async def my_task(a: int) -> int:
+    return a
+"""
+
+_STARTED = re.compile(r"Started process worker-\d+ with pid (\d+)")
+_READY = re.compile(r"workers are ready")
+
+
+def _memory(pid: int) -> Dict[str, int]:
+    """
+    Get memory usage of a process in KiB.
+
+    :param pid: process id.
+    :return: dict with Rss and Pss values.
+    """
+    result = {}
+    with Path(f"/proc/{pid}/smaps_rollup").open() as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if name in {"Rss", "Pss"}:
+                result[name] = int(value.split()[0])
+    return result
+
+
+def run(project: Path, workers: int, preload: bool) -> Tuple[float, List[int]]:
+    """
+    Start worker and wait until it's ready.
+
+    :param project: directory with the project.
+    :param workers: number of worker processes.
+    :param preload: whether to use preloading.
+    :return: startup time, total RSS and PSS of workers in MiB.
+    """
+    cmd = [
+        sys.executable,
+        "-m",
+        "taskiq",
+        "worker",
+        "tasks:broker",
+        "--workers",
+        str(workers),
+    ]
+    if preload:
+        cmd.append("--preload")
+    start = perf_counter()
+    proc = subprocess.Popen(  # noqa: S603
+        cmd,
+        cwd=project,
+        stderr=subprocess.STDOUT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    pids = []
+    try:
+        assert proc.stdout is not None  # noqa: S101
+        for line in proc.stdout:
+            started = _STARTED.search(line)
+            if started:
+                pids.append(int(started.group(1)))
+            if _READY.search(line):
+                break
+        elapsed = perf_counter() - start
+        memory = [_memory(pid) for pid in pids]
+    finally:
+        proc.send_signal(signal.SIGINT)
+        proc.wait()
+    rss = sum(item["Rss"] for item in memory) // 1024
+    pss = sum(item["Pss"] for item in memory) // 1024
+    return elapsed, [rss, pss]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--module-mb", type=int, default=100)
+    parser.add_argument("--import-time", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        (project / "tasks.py").write_text(
+            BROKER_MODULE.format(
+                import_time=args.import_time,
+                # Every short string with its list slot takes ~60 bytes.
+                objects=args.module_mb * 1024 * 1024 // 60,
+            ),
+        )
+        os.environ["PYTHONPATH"] = os.pathsep.join(
+            [str(Path(__file__).parent.parent), os.environ.get("PYTHONPATH", "")],
+        )
+        print(  # noqa: T201
+            f"{'mode':<12} {'startup, s':>10} {'RSS, MB':>10} {'PSS, MB':>10}",
+        )
+        for preload in (False, True):
+            elapsed, (rss, pss) = run(project, args.workers, preload)
+            mode = "preload" if preload else "default"
+            print(f"{mode:<12} {elapsed:>10.2f} {rss:>10} {pss:>10}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Microbenchmark of per-message overhead in the Receiver.
+
+It measures average time of `Receiver.run_task` and `Receiver.callback`
+for tiny tasks, so the cost of the receiver itself dominates.
+
+Usage:
+
+    python benchmarks/bench_run_task.py [--iterations N]
+"""
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Any, Callable, Coroutine
+
+from taskiq import InMemoryBroker, TaskiqMiddleware
+from taskiq.message import TaskiqMessage
+from taskiq.receiver import Receiver
+
+
+class _NoopMiddleware(TaskiqMiddleware):
+    """Middleware that implements only one hook."""
+
+    def post_save(self, message: Any, result: Any) -> None:
+        """Does nothing."""
+
+
+async def _measure(
+    name: str,
+    iterations: int,
+    func: Callable[[], Coroutine[Any, Any, Any]],
+) -> None:
+    for _ in range(iterations // 10):
+        await func()
+    start = perf_counter()
+    for _ in range(iterations):
+        await func()
+    elapsed = perf_counter() - start
+    print(f"{name:<32} {elapsed / iterations * 1e6:8.2f} us/call")  # noqa: T201
+
+
+async def main(iterations: int) -> None:
+    """
+    Run all benchmarks.
+
+    :param iterations: number of calls for every benchmark.
+    """
+    broker = InMemoryBroker()
+    broker.add_middlewares(*[_NoopMiddleware() for _ in range(5)])
+
+    @broker.task
+    async def noop_async() -> None:
+        """Tiny async task."""
+
+    @broker.task
+    async def typed_async(a: int, b: str) -> None:
+        """Tiny async task with parameters."""
+
+    receiver = Receiver(broker, max_async_tasks=10)
+
+    async def run_noop() -> None:
+        await receiver.run_task(
+            noop_async.original_func,
+            TaskiqMessage(
+                task_id="id",
+                task_name=noop_async.task_name,
+                labels={},
+                args=[],
+                kwargs={},
+            ),
+        )
+
+    async def run_typed() -> None:
+        await receiver.run_task(
+            typed_async.original_func,
+            TaskiqMessage(
+                task_id="id",
+                task_name=typed_async.task_name,
+                labels={},
+                args=[1, "b"],
+                kwargs={},
+            ),
+        )
+
+    message = broker.formatter.dumps(
+        TaskiqMessage(
+            task_id="id",
+            task_name=noop_async.task_name,
+            labels={},
+            args=[],
+            kwargs={},
+        ),
+    ).message
+
+    async def callback_noop() -> None:
+        await receiver.callback(message)
+
+    await _measure("run_task(noop async)", iterations, run_noop)
+    await _measure("run_task(typed async)", iterations, run_typed)
+    await _measure("callback(noop async)", iterations, callback_noop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().iterations))
@@ -0,0 +1,295 @@
+"""
+Microbenchmark of serializers and formatters.
+
+Messages and results with different payloads are encoded and decoded
+by every combination of a serializer and a formatter. `JSONFormatter`
+doesn't use the serializer of the broker, so it's measured once.
+
+For every combination it reports time of a round trip, size
+of encoded data and peak of memory allocated by a round trip,
+which is measured with tracemalloc.
+
+Usage:
+
+    python benchmarks/bench_serializers.py [--iterations N]
+        [--output results.json] [--baseline old.json] [--payload NAME]
+"""
+
+import argparse
+import json
+import platform
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from taskiq import InMemoryBroker, TaskiqResult
+from taskiq.abc.formatter import TaskiqFormatter
+from taskiq.abc.serializer import TaskiqSerializer
+from taskiq.compat import (
+    model_dump,
+    model_dump_json,
+    model_validate,
+    model_validate_json,
+)
+from taskiq.formatters.json_formatter import JSONFormatter
+from taskiq.formatters.proxy_formatter import ProxyFormatter
+from taskiq.message import TaskiqMessage
+from taskiq.serializers import (
+    CBORSerializer,
+    JSONSerializer,
+    MSGPackSerializer,
+    ORJSONSerializer,
+)
+
+Codec = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+SERIALIZERS: Dict[str, Callable[[], TaskiqSerializer]] = {
+    "json": JSONSerializer,
+    "orjson": ORJSONSerializer,
+    "msgpack": MSGPackSerializer,
+    "cbor": CBORSerializer,
+}
+
+
+def _record(index: int) -> Dict[str, Any]:
+    return {
+        "id": index,
+        "name": f"user-{index}",
+        "email": f"user-{index}@example.com",
+        "active": index % 2 == 0,
+        "score": index / 7,
+        "tags": ["a", "b", "c"],
+    }
+
+
+def _nested(depth: int) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"leaf": True, "values": [1, 2.5, "three", None]}
+    for level in range(depth):
+        node = {"level": level, "child": node, "siblings": [_record(level)]}
+    return node
+
+
+PAYLOADS: Dict[str, Any] = {
+    "small": {"user_id": 42, "action": "notify"},
+    "large": {"records": [_record(index) for index in range(1000)]},
+    "nested": _nested(20),
+}
+
+
+def _message(payload: Any) -> TaskiqMessage:
+    return TaskiqMessage(
+        task_id="4b3d6c4fe0d64a5fbb8f3c1d2e9e7a10",
+        task_name="benchmarks:process",
+        labels={"retry_on_error": True, "max_retries": 3},
+        args=[],
+        kwargs={"payload": payload},
+    )
+
+
+def _result(payload: Any) -> "TaskiqResult[Any]":
+    return TaskiqResult(
+        is_err=False,
+        return_value=payload,
+        execution_time=0.012,
+        labels={"retry_on_error": True},
+    )
+
+
+def _error_result() -> "TaskiqResult[Any]":
+    try:
+        raise ValueError("Cannot process the payload.")
+    except ValueError as exc:
+        error = exc
+    return TaskiqResult(
+        is_err=True,
+        return_value=None,
+        execution_time=0.012,
+        error=error,
+    )
+
+
+def _objects(names: Optional[List[str]]) -> Dict[str, Any]:
+    objects: Dict[str, Any] = {}
+    for name, payload in PAYLOADS.items():
+        objects[f"message_{name}"] = _message(payload)
+        objects[f"result_{name}"] = _result(payload)
+    objects["result_error"] = _error_result()
+    if names:
+        objects = {name: obj for name, obj in objects.items() if name in names}
+    return objects
+
+
+def _formatter_codec(formatter: TaskiqFormatter) -> Codec:
+    def dumps(message: TaskiqMessage) -> bytes:
+        return formatter.dumps(message).message
+
+    return dumps, formatter.loads
+
+
+def _result_codec(serializer: Optional[TaskiqSerializer]) -> Codec:
+    def dumps(result: "TaskiqResult[Any]") -> bytes:
+        if serializer is None:
+            return model_dump_json(result).encode()
+        return serializer.dumpb(model_dump(result))
+
+    def loads(data: bytes) -> "TaskiqResult[Any]":
+        if serializer is None:
+            return model_validate_json(TaskiqResult[Any], data)
+        return model_validate(TaskiqResult[Any], serializer.loadb(data))
+
+    return dumps, loads
+
+
+def _codecs(obj: Any) -> Dict[str, Codec]:
+    """
+    Create functions to encode and decode the object.
+
+    Messages are encoded by formatters, results are encoded
+    like result backends do it, with `model_dump` and the serializer
+    or with pydantic's JSON.
+
+    :param obj: message or result.
+    :return: dict of codec names and pairs of encode and decode functions.
+    """
+    is_message = isinstance(obj, TaskiqMessage)
+    codecs: Dict[str, Codec] = {}
+    for name, serializer_cls in SERIALIZERS.items():
+        try:
+            serializer = serializer_cls()
+        except ImportError:
+            continue
+        codecs[f"proxy+{name}"] = (
+            _formatter_codec(
+                ProxyFormatter(InMemoryBroker().with_serializer(serializer)),
+            )
+            if is_message
+            else _result_codec(serializer)
+        )
+    codecs["json_formatter"] = (
+        _formatter_codec(JSONFormatter()) if is_message else _result_codec(None)
+    )
+    return codecs
+
+
+@dataclass
+class CaseResult:
+    """Results of a combination."""
+
+    payload: str
+    codec: str
+    dumps_us: float
+    loads_us: float
+    round_trips_per_sec: float
+    size_bytes: int
+    peak_alloc_bytes: int
+
+
+def _measure(func: Callable[[], Any], iterations: int) -> float:
+    for _ in range(max(iterations // 10, 1)):
+        func()
+    start = perf_counter()
+    for _ in range(iterations):
+        func()
+    return (perf_counter() - start) / iterations
+
+
+def _allocated(func: Callable[[], Any]) -> int:
+    """
+    Measure memory allocated by a call.
+
+    :param func: function to call.
+    :return: peak of memory traced during the call in bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _run_case(
+    payload: str,
+    codec: str,
+    obj: Any,
+    impl: Codec,
+    iterations: int,
+) -> CaseResult:
+    dumps, loads = impl
+    data = dumps(obj)
+    dumps_time = _measure(lambda: dumps(obj), iterations)
+    loads_time = _measure(lambda: loads(data), iterations)
+    return CaseResult(
+        payload=payload,
+        codec=codec,
+        dumps_us=round(dumps_time * 1e6, 3),
+        loads_us=round(loads_time * 1e6, 3),
+        round_trips_per_sec=round(1 / (dumps_time + loads_time), 1),
+        size_bytes=len(data),
+        peak_alloc_bytes=_allocated(lambda: loads(dumps(obj))),
+    )
+
+
+def _print(results: List[CaseResult], baseline: Dict[Tuple[str, str], Any]) -> None:
+    print(  # noqa: T201
+        f"{'payload':<16} {'codec':<16} {'dumps us':>10} {'loads us':>10} "
+        f"{'trips/s':>10} {'bytes':>8} {'peak B':>9} {'change':>8}",
+    )
+    for result in results:
+        change = ""
+        old = baseline.get((result.payload, result.codec))
+        if old is not None:
+            change = (
+                f"{result.round_trips_per_sec / old['round_trips_per_sec'] - 1:+.1%}"
+            )
+        print(  # noqa: T201
+            f"{result.payload:<16} {result.codec:<16} {result.dumps_us:>10.2f} "
+            f"{result.loads_us:>10.2f} {result.round_trips_per_sec:>10.1f} "
+            f"{result.size_bytes:>8} {result.peak_alloc_bytes:>9} {change:>8}",
+        )
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Run all benchmarks.
+
+    :param args: parsed arguments.
+    """
+    results = []
+    for payload, obj in _objects(args.payload).items():
+        for codec, impl in _codecs(obj).items():
+            results.append(_run_case(payload, codec, obj, impl, args.iterations))
+
+    baseline: Dict[Tuple[str, str], Any] = {}
+    if args.baseline:
+        with Path(args.baseline).open() as file:
+            baseline = {
+                (case["payload"], case["codec"]): case
+                for case in json.load(file)["cases"]
+            }
+    _print(results, baseline)
+    if args.output:
+        with Path(args.output).open("w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "iterations": args.iterations,
+                    "cases": [asdict(result) for result in results],
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="JSON file for results.")
+    parser.add_argument("--baseline", help="JSON file with results to compare to.")
+    parser.add_argument("--payload", action="append", help="Run only these payloads.")
+    main(parser.parse_args())
@@ -0,0 +1,385 @@
+"""
+End-to-end throughput benchmark of the Receiver.
+
+Messages are sent with `kiq` to an in-process loopback broker and
+executed by `Receiver.listen`, like in a worker. The client keeps
+a fixed number of messages in flight, so the benchmark measures
+both throughput and latency from `kiq` to the saved result.
+
+Results are written to a JSON file, so runs on different
+commits can be compared with `--baseline`.
+
+Usage:
+
+    python benchmarks/bench_throughput.py [--tasks N] [--concurrency N]
+        [--output results.json] [--baseline old.json] [--case NAME]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from taskiq import AsyncBroker, TaskiqDepends, TaskiqMiddleware, TaskiqResult
+from taskiq.abc.result_backend import AsyncResultBackend
+from taskiq.abc.serializer import TaskiqSerializer
+from taskiq.message import BrokerMessage
+from taskiq.receiver import Receiver
+from taskiq.serializers import (
+    CBORSerializer,
+    JSONSerializer,
+    MSGPackSerializer,
+    ORJSONSerializer,
+)
+
+PAYLOAD = {"user_id": 42, "tags": ["a", "b", "c"], "score": 0.5}
+
+
+class LoopbackBroker(AsyncBroker):
+    """Broker that passes messages to its own listener."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+
+    async def kick(self, message: BrokerMessage) -> None:
+        """
+        Put message to the queue.
+
+        :param message: message to send.
+        """
+        self.queue.put_nowait(message.message)
+
+    async def listen(self) -> AsyncGenerator[bytes, None]:
+        """
+        Get messages until the broker is closed.
+
+        :yield: sent messages.
+        """
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                return
+            yield message
+
+    def close(self) -> None:
+        """Stop listening."""
+        self.queue.put_nowait(None)
+
+
+class TimingResultBackend(AsyncResultBackend[Any]):
+    """Result backend that measures latency of tasks."""
+
+    def __init__(self) -> None:
+        self.sent: Dict[str, float] = {}
+        self.latencies: List[float] = []
+        self.on_result: Callable[[], None] = lambda: None
+
+    async def set_result(self, task_id: str, result: TaskiqResult[Any]) -> None:
+        """
+        Record latency of the task.
+
+        :param task_id: id of the task.
+        :param result: result of the task.
+        """
+        self.latencies.append(perf_counter() - self.sent.pop(task_id))
+        self.on_result()
+
+    async def is_result_ready(self, task_id: str) -> bool:
+        """
+        Results aren't stored.
+
+        :param task_id: id of the task.
+        :return: False.
+        """
+        return False
+
+    async def get_result(
+        self,
+        task_id: str,
+        with_logs: bool = False,
+    ) -> TaskiqResult[Any]:
+        """
+        Results aren't stored.
+
+        :param task_id: id of the task.
+        :param with_logs: ignored.
+        :raises KeyError: always.
+        """
+        raise KeyError(task_id)
+
+
+class TimingMiddleware(TaskiqMiddleware):
+    """Middleware that records the time messages are sent."""
+
+    def __init__(self, backend: TimingResultBackend) -> None:
+        super().__init__()
+        self.backend = backend
+
+    def post_send(self, message: Any) -> None:
+        """
+        Record time of sending.
+
+        :param message: sent message.
+        """
+        self.backend.sent[message.task_id] = perf_counter()
+
+
+class NoopMiddleware(TaskiqMiddleware):
+    """Middleware with all worker-side hooks."""
+
+    def pre_execute(self, message: Any) -> Any:
+        """
+        Return the message.
+
+        :param message: received message.
+        :return: the same message.
+        """
+        return message
+
+    def post_execute(self, message: Any, result: Any) -> None:
+        """Does nothing."""
+
+    def post_save(self, message: Any, result: Any) -> None:
+        """Does nothing."""
+
+
+@dataclass
+class CaseResult:
+    """Results of a benchmark case."""
+
+    name: str
+    tasks: int
+    seconds: float
+    tasks_per_sec: float
+    p50_ms: float
+    p99_ms: float
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1] * 1000
+
+
+async def _run_case(
+    name: str,
+    setup: Callable[[LoopbackBroker], Callable[[], Awaitable[Any]]],
+    tasks: int,
+    concurrency: int,
+    serializer: Optional[TaskiqSerializer] = None,
+) -> CaseResult:
+    """
+    Send messages through the loopback broker and the receiver.
+
+    :param name: name of the case.
+    :param setup: function that registers tasks and returns a function to send one.
+    :param tasks: number of messages.
+    :param concurrency: number of messages in flight.
+    :param serializer: serializer of the broker.
+    :return: results of the case.
+    """
+    backend = TimingResultBackend()
+    broker = LoopbackBroker().with_result_backend(backend)
+    broker.add_middlewares(TimingMiddleware(backend))
+    if serializer is not None:
+        broker.with_serializer(serializer)
+    send = setup(broker)
+    in_flight = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    def on_result() -> None:
+        in_flight.release()
+        if len(backend.latencies) == tasks:
+            done.set()
+
+    backend.on_result = on_result
+    with ThreadPoolExecutor(4) as executor:
+        receiver = Receiver(
+            broker,
+            executor=executor,
+            max_async_tasks=concurrency,
+            max_prefetch=concurrency,
+        )
+        listener = asyncio.create_task(receiver.listen())
+        start = perf_counter()
+        for _ in range(tasks):
+            await in_flight.acquire()
+            await send()
+        await done.wait()
+        elapsed = perf_counter() - start
+        broker.close()
+        await listener
+    return CaseResult(
+        name=name,
+        tasks=tasks,
+        seconds=round(elapsed, 4),
+        tasks_per_sec=round(tasks / elapsed, 1),
+        p50_ms=round(_percentile(backend.latencies, 50), 4),
+        p99_ms=round(_percentile(backend.latencies, 99), 4),
+    )
+
+
+def _async_noop(broker: LoopbackBroker) -> Callable[[], Awaitable[Any]]:
+    @broker.task
+    async def noop() -> None:
+        """Tiny async task."""
+
+    return noop.kiq
+
+
+def _sync_noop(broker: LoopbackBroker) -> Callable[[], Awaitable[Any]]:
+    @broker.task
+    def noop() -> None:
+        """Tiny sync task."""
+
+    return noop.kiq
+
+
+def _dependencies(broker: LoopbackBroker) -> Callable[[], Awaitable[Any]]:
+    def settings() -> Dict[str, int]:
+        return {"limit": 10}
+
+    async def session(settings: Dict[str, int] = TaskiqDepends(settings)) -> int:
+        return settings["limit"]
+
+    @broker.task
+    async def with_deps(
+        limit: int = TaskiqDepends(session),
+        settings: Dict[str, int] = TaskiqDepends(settings),
+    ) -> None:
+        """Task with a small dependency graph."""
+
+    return with_deps.kiq
+
+
+def _middlewares(broker: LoopbackBroker) -> Callable[[], Awaitable[Any]]:
+    broker.add_middlewares(*[NoopMiddleware() for _ in range(5)])
+    return _async_noop(broker)
+
+
+def _payload(broker: LoopbackBroker) -> Callable[[], Awaitable[Any]]:
+    @broker.task
+    async def with_payload(user_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Task with typed arguments and a returned value."""
+        return payload
+
+    return lambda: with_payload.kiq(42, PAYLOAD)
+
+
+SERIALIZERS: Dict[str, Callable[[], TaskiqSerializer]] = {
+    "json": JSONSerializer,
+    "orjson": ORJSONSerializer,
+    "msgpack": MSGPackSerializer,
+    "cbor": CBORSerializer,
+}
+
+CASES: Dict[str, Callable[[LoopbackBroker], Callable[[], Awaitable[Any]]]] = {
+    "async_noop": _async_noop,
+    "sync_noop": _sync_noop,
+    "dependencies": _dependencies,
+    "middlewares": _middlewares,
+}
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print(results: List[CaseResult], baseline: Dict[str, Dict[str, Any]]) -> None:
+    print(  # noqa: T201
+        f"{'case':<24} {'tasks/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'change':>8}",
+    )
+    for result in results:
+        change = ""
+        old = baseline.get(result.name)
+        if old is not None:
+            change = f"{result.tasks_per_sec / old['tasks_per_sec'] - 1:+.1%}"
+        print(  # noqa: T201
+            f"{result.name:<24} {result.tasks_per_sec:>10.1f} "
+            f"{result.p50_ms:>8.3f} {result.p99_ms:>8.3f} {change:>8}",
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    """
+    Run all benchmarks.
+
+    :param args: parsed arguments.
+    """
+    # Warm up the interpreter and imports of the receiver.
+    await _run_case("warmup", _async_noop, args.tasks // 10, args.concurrency)
+    results = []
+    for name, setup in CASES.items():
+        if not args.case or name in args.case:
+            results.append(
+                await _run_case(name, setup, args.tasks, args.concurrency),
+            )
+    for serializer_name, serializer in SERIALIZERS.items():
+        name = f"serializer_{serializer_name}"
+        if args.case and name not in args.case:
+            continue
+        try:
+            instance = serializer()
+        except ImportError:
+            print(f"Skipping {name}: serializer isn't installed.")  # noqa: T201
+            continue
+        results.append(
+            await _run_case(
+                name,
+                _payload,
+                args.tasks,
+                args.concurrency,
+                serializer=instance,
+            ),
+        )
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with Path(args.baseline).open() as file:
+            baseline = {case["name"]: case for case in json.load(file)["cases"]}
+    _print(results, baseline)
+    if args.output:
+        with Path(args.output).open("w") as file:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "tasks": args.tasks,
+                    "concurrency": args.concurrency,
+                    "cases": [asdict(result) for result in results],
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--output", help="JSON file for results.")
+    parser.add_argument("--baseline", help="JSON file with results to compare to.")
+    parser.add_argument("--case", action="append", help="Run only these cases.")
+    asyncio.run(main(parser.parse_args()))
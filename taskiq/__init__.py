@@ -1,39 +1,92 @@
-"""Distributed task manager."""
-from importlib.metadata import version
+"""
+Distributed task manager.
 
-from taskiq_dependencies import Depends as TaskiqDepends
+Public names are imported on first access (PEP 562), so
+`import taskiq` doesn't load brokers, middlewares or the scheduler
+that aren't used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-from taskiq.abc.broker import AsyncBroker, AsyncTaskiqDecoratedTask
-from taskiq.abc.formatter import TaskiqFormatter
-from taskiq.abc.middleware import TaskiqMiddleware
-from taskiq.abc.result_backend import AsyncResultBackend
-from taskiq.abc.schedule_source import ScheduleSource
-from taskiq.acks import AckableMessage
-from taskiq.brokers.inmemory_broker import InMemoryBroker
-from taskiq.brokers.shared_broker import async_shared_broker
-from taskiq.brokers.zmq_broker import ZeroMQBroker
-from taskiq.context import Context
-from taskiq.events import TaskiqEvents
-from taskiq.exceptions import (
-    NoResultError,
-    ResultGetError,
-    ResultIsReadyError,
-    SecurityError,
-    SendTaskError,
-    TaskiqError,
-    TaskiqResultTimeoutError,
-)
-from taskiq.funcs import gather
-from taskiq.message import BrokerMessage, TaskiqMessage
-from taskiq.middlewares.prometheus_middleware import PrometheusMiddleware
-from taskiq.middlewares.retry_middleware import SimpleRetryMiddleware
-from taskiq.result import TaskiqResult
-from taskiq.scheduler.scheduled_task import ScheduledTask
-from taskiq.scheduler.scheduler import TaskiqScheduler
-from taskiq.state import TaskiqState
-from taskiq.task import AsyncTaskiqTask
+if TYPE_CHECKING:  # pragma: no cover
+    from taskiq_dependencies import Depends as TaskiqDepends
 
-__version__ = version("taskiq")
+    from taskiq.abc.broker import AsyncBroker, AsyncTaskiqDecoratedTask
+    from taskiq.abc.formatter import TaskiqFormatter
+    from taskiq.abc.middleware import TaskiqMiddleware
+    from taskiq.abc.result_backend import AsyncResultBackend
+    from taskiq.abc.schedule_source import ScheduleSource
+    from taskiq.abc.span_exporter import TaskiqSpanExporter
+    from taskiq.acks import AckableMessage
+    from taskiq.brokers.inmemory_broker import InMemoryBroker
+    from taskiq.brokers.shared_broker import async_shared_broker
+    from taskiq.brokers.zmq_broker import ZeroMQBroker
+    from taskiq.context import Context
+    from taskiq.events import TaskiqEvents
+    from taskiq.exceptions import (
+        NoResultError,
+        ResultGetError,
+        ResultIsReadyError,
+        SecurityError,
+        SendTaskError,
+        TaskiqError,
+        TaskiqResultTimeoutError,
+    )
+    from taskiq.funcs import gather
+    from taskiq.message import BrokerMessage, TaskiqMessage
+    from taskiq.middlewares.metrics_middleware import MetricsMiddleware
+    from taskiq.middlewares.prometheus_middleware import PrometheusMiddleware
+    from taskiq.middlewares.retry_middleware import SimpleRetryMiddleware
+    from taskiq.result import TaskiqResult
+    from taskiq.scheduler.scheduled_task import ScheduledTask
+    from taskiq.scheduler.scheduler import TaskiqScheduler
+    from taskiq.state import TaskiqState
+    from taskiq.task import AsyncTaskiqTask, SyncTaskiqTask
+
+    __version__: str
+
+# Public names and modules with them.
+_LAZY_IMPORTS: Dict[str, Tuple[str, str]] = {
+    "TaskiqDepends": ("taskiq_dependencies", "Depends"),
+    "AsyncBroker": ("taskiq.abc.broker", "AsyncBroker"),
+    "AsyncTaskiqDecoratedTask": ("taskiq.abc.broker", "AsyncTaskiqDecoratedTask"),
+    "TaskiqFormatter": ("taskiq.abc.formatter", "TaskiqFormatter"),
+    "TaskiqMiddleware": ("taskiq.abc.middleware", "TaskiqMiddleware"),
+    "AsyncResultBackend": ("taskiq.abc.result_backend", "AsyncResultBackend"),
+    "ScheduleSource": ("taskiq.abc.schedule_source", "ScheduleSource"),
+    "TaskiqSpanExporter": ("taskiq.abc.span_exporter", "TaskiqSpanExporter"),
+    "AckableMessage": ("taskiq.acks", "AckableMessage"),
+    "InMemoryBroker": ("taskiq.brokers.inmemory_broker", "InMemoryBroker"),
+    "async_shared_broker": ("taskiq.brokers.shared_broker", "async_shared_broker"),
+    "ZeroMQBroker": ("taskiq.brokers.zmq_broker", "ZeroMQBroker"),
+    "Context": ("taskiq.context", "Context"),
+    "TaskiqEvents": ("taskiq.events", "TaskiqEvents"),
+    "NoResultError": ("taskiq.exceptions", "NoResultError"),
+    "ResultGetError": ("taskiq.exceptions", "ResultGetError"),
+    "ResultIsReadyError": ("taskiq.exceptions", "ResultIsReadyError"),
+    "SecurityError": ("taskiq.exceptions", "SecurityError"),
+    "SendTaskError": ("taskiq.exceptions", "SendTaskError"),
+    "TaskiqError": ("taskiq.exceptions", "TaskiqError"),
+    "TaskiqResultTimeoutError": ("taskiq.exceptions", "TaskiqResultTimeoutError"),
+    "gather": ("taskiq.funcs", "gather"),
+    "BrokerMessage": ("taskiq.message", "BrokerMessage"),
+    "TaskiqMessage": ("taskiq.message", "TaskiqMessage"),
+    "MetricsMiddleware": ("taskiq.middlewares.metrics_middleware", "MetricsMiddleware"),
+    "PrometheusMiddleware": (
+        "taskiq.middlewares.prometheus_middleware",
+        "PrometheusMiddleware",
+    ),
+    "SimpleRetryMiddleware": (
+        "taskiq.middlewares.retry_middleware",
+        "SimpleRetryMiddleware",
+    ),
+    "TaskiqResult": ("taskiq.result", "TaskiqResult"),
+    "ScheduledTask": ("taskiq.scheduler.scheduled_task", "ScheduledTask"),
+    "TaskiqScheduler": ("taskiq.scheduler.scheduler", "TaskiqScheduler"),
+    "TaskiqState": ("taskiq.state", "TaskiqState"),
+    "AsyncTaskiqTask": ("taskiq.task", "AsyncTaskiqTask"),
+    "SyncTaskiqTask": ("taskiq.task", "SyncTaskiqTask"),
+}
 __all__ = [
     "__version__",
     "gather",
@@ -53,17 +106,45 @@ __all__ = [
     "NoResultError",
     "SendTaskError",
     "AckableMessage",
+    "SyncTaskiqTask",
     "InMemoryBroker",
     "ScheduleSource",
     "TaskiqScheduler",
     "TaskiqFormatter",
     "AsyncTaskiqTask",
     "TaskiqMiddleware",
+    "MetricsMiddleware",
     "ResultIsReadyError",
     "AsyncResultBackend",
+    "TaskiqSpanExporter",
     "async_shared_broker",
     "PrometheusMiddleware",
     "SimpleRetryMiddleware",
     "AsyncTaskiqDecoratedTask",
     "TaskiqResultTimeoutError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import public names on first access.
+
+    :param name: name of the attribute.
+    :raises AttributeError: if there's no such attribute.
+    :return: value of the attribute.
+    """
+    if name == "__version__":
+        from importlib.metadata import version  # noqa: PLC0415
+
+        value: Any = version("taskiq")
+    elif name in _LAZY_IMPORTS:
+        module, attribute = _LAZY_IMPORTS[name]
+        value = getattr(import_module(module), attribute)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import warnings
@@ -34,12 +35,15 @@ from taskiq.message import BrokerMessage
 from taskiq.result_backends.dummy import DummyResultBackend
 from taskiq.serializers.json_serializer import JSONSerializer
 from taskiq.state import TaskiqState
+from taskiq.sync_client import SyncClient
+from taskiq.tracing import Tracer
 from taskiq.utils import maybe_awaitable, remove_suffix
 from taskiq.warnings import TaskiqDeprecationWarning
 
 if TYPE_CHECKING:  # pragma: no cover
     from taskiq.abc.formatter import TaskiqFormatter
     from taskiq.abc.result_backend import AsyncResultBackend
+    from taskiq.abc.span_exporter import TaskiqSpanExporter
 
 _T = TypeVar("_T")
 _FuncParams = ParamSpec("_FuncParams")
@@ -101,6 +105,11 @@ class AsyncBroker(ABC):
         self.decorator_class = AsyncTaskiqDecoratedTask
         self.serializer: TaskiqSerializer = JSONSerializer()
         self.formatter: "TaskiqFormatter" = ProxyFormatter(self)
+        self.tracer = Tracer()
+        # Number of messages sent concurrently by the default `kick_batch`.
+        self.max_concurrent_kicks = 100
+        # Runs the broker in a background event loop for sync code.
+        self.sync_client = SyncClient(self)
         self.id_generator = task_id_generator
         self.local_task_registry: Dict[str, AsyncTaskiqDecoratedTask[Any, Any]] = {}
         # Every event has a list of handlers.
@@ -236,6 +245,48 @@ class AsyncBroker(ABC):
         :param message: name of a task.
         """
 
+    async def kick_batch(
+        self,
+        messages: List[BrokerMessage],
+    ) -> None:
+        """
+        This method is used to kick multiple tasks at once.
+
+        By default it calls `kick` for every message, sending
+        at most `max_concurrent_kicks` messages concurrently.
+        Brokers that support pipelining or bulk publishing
+        should override this method to send all messages
+        in a single round-trip.
+
+        :param messages: list of messages to send.
+        """
+        pending = iter(messages)
+
+        async def send() -> None:
+            for message in pending:
+                await self.kick(message)
+
+        senders = min(self.max_concurrent_kicks, len(messages))
+        await asyncio.gather(*[send() for _ in range(senders)])
+
+    async def ack_batch(
+        self,
+        messages: List[AckableMessage],
+    ) -> None:
+        """
+        This method is used to acknowledge multiple messages at once.
+
+        It's called by the receiver when batched acks are enabled.
+        By default it calls `ack` of every message concurrently.
+        Brokers that can acknowledge many messages in a single
+        request should override this method.
+
+        :param messages: list of messages to acknowledge.
+        """
+        await asyncio.gather(
+            *[maybe_awaitable(message.ack()) for message in messages],
+        )
+
     @abstractmethod
     def listen(self) -> AsyncGenerator[Union[bytes, AckableMessage], None]:
         """
@@ -496,6 +547,16 @@ class AsyncBroker(ABC):
         self.serializer = serializer
         return self
 
+    def with_span_exporter(self, exporter: "TaskiqSpanExporter") -> "Self":
+        """
+        Enable tracing with the exporter and return updated broker.
+
+        :param exporter: exporter of finished spans.
+        :return: self
+        """
+        self.tracer = Tracer(exporter)
+        return self
+
     def with_formatter(self, formatter: "TaskiqFormatter") -> "Self":
         """
         Set new formatter and return an updated broker.
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Coroutine, Union
+from typing import TYPE_CHECKING, Any, Coroutine, Optional, Union
 
 if TYPE_CHECKING:  # pragma: no cover  # pragma: no cover
     from taskiq.abc.broker import AsyncBroker
@@ -126,3 +126,19 @@ class TaskiqMiddleware:  # pragma: no cover
         :param result: returned value.
         :param exception: found exception.
         """
+
+    def on_slow_callback(
+        self,
+        message: "Optional[TaskiqMessage]",
+        duration: float,
+    ) -> "Optional[Coroutine[Any, Any, None]]":
+        """
+        This function is called when the event loop was blocked.
+
+        This is a worker-side hook. It's called only
+        if slow callback threshold is set in the receiver.
+
+        :param message: message of the task that blocked the loop,
+            if it's known.
+        :param duration: time the loop was blocked in seconds.
+        """
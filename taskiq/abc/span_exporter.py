@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from taskiq.tracing import Span
+
+
+class TaskiqSpanExporter(ABC):
+    """Exporter of finished tracing spans."""
+
+    @abstractmethod
+    def export(self, span: "Span") -> None:
+        """
+        Export finished span.
+
+        This method is called in the event loop,
+        so it shouldn't block. Exporters that send
+        spans over the network should buffer them.
+
+        :param span: finished span.
+        """
@@ -1,5 +1,5 @@
 import enum
-from typing import Awaitable, Callable, Union
+from typing import Awaitable, Callable, Optional, Union
 
 from pydantic import BaseModel
 
@@ -31,7 +31,12 @@ class AckableMessage(BaseModel):
 
     It adds more reliability to brokers and system
     as a whole.
+
+    Brokers that natively support priorities may set
+    the priority of a message, so workers won't need
+    to parse the message to get it.
     """
 
     data: bytes
     ack: Callable[[], Union[None, Awaitable[None]]]
+    priority: Optional[int] = None
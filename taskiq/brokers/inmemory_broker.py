@@ -1,7 +1,7 @@
 import asyncio
 from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, AsyncGenerator, Optional, Set, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional, Set, TypeVar
 
 from taskiq.abc.broker import AsyncBroker
 from taskiq.abc.result_backend import AsyncResultBackend, TaskiqResult
@@ -9,9 +9,11 @@ from taskiq.depends.progress_tracker import TaskProgress
 from taskiq.events import TaskiqEvents
 from taskiq.exceptions import TaskiqError
 from taskiq.message import BrokerMessage
-from taskiq.receiver import Receiver
 from taskiq.utils import maybe_awaitable
 
+if TYPE_CHECKING:  # pragma: no cover
+    from taskiq.receiver import Receiver
+
 _ReturnType = TypeVar("_ReturnType")
 
 
@@ -133,15 +135,43 @@ class InMemoryBroker(AsyncBroker):
             max_stored_results=max_stored_results,
         )
         self.executor = ThreadPoolExecutor(sync_tasks_pool_size)
-        self.receiver = Receiver(
-            broker=self,
-            executor=self.executor,
-            validate_params=cast_types,
-            max_async_tasks=max_async_tasks,
-            propagate_exceptions=propagate_exceptions,
-        )
+        self.cast_types = cast_types
+        self.max_async_tasks = max_async_tasks
+        self.propagate_exceptions = propagate_exceptions
+        self._receiver: "Optional[Receiver]" = None
         self._running_tasks: "Set[asyncio.Task[Any]]" = set()
 
+    @property
+    def receiver(self) -> "Receiver":
+        """
+        Receiver that executes kicked tasks.
+
+        It's created on first use, so the receiver
+        isn't imported with the broker.
+
+        :return: receiver of the broker.
+        """
+        if self._receiver is None:
+            from taskiq.receiver import Receiver  # noqa: PLC0415
+
+            self._receiver = Receiver(
+                broker=self,
+                executor=self.executor,
+                validate_params=self.cast_types,
+                max_async_tasks=self.max_async_tasks,
+                propagate_exceptions=self.propagate_exceptions,
+            )
+        return self._receiver
+
+    @receiver.setter
+    def receiver(self, receiver: "Receiver") -> None:
+        """
+        Replace receiver of the broker.
+
+        :param receiver: new receiver.
+        """
+        self._receiver = receiver
+
     async def kick(self, message: BrokerMessage) -> None:
         """
         Kicking task.
@@ -20,6 +20,20 @@ def receiver_arg_type(string: str) -> Tuple[str, str]:
     return args[0], args[1]
 
 
+def executor_arg_type(string: str) -> Tuple[str, int]:
+    """
+    Parse cli --executor argument value.
+
+    :param string: cli argument value in format name=threads.
+    :raises ValueError: if value not in format.
+    :return: (name, threads) pair.
+    """
+    name, threads = receiver_arg_type(string)
+    if not name or int(threads) < 1:
+        raise ValueError(f"Invalid value: {string}")
+    return name, int(threads)
+
+
 @dataclass
 class WorkerArgs:
     """Taskiq worker CLI arguments."""
@@ -31,8 +45,28 @@ class WorkerArgs:
     configure_logging: bool = True
     log_level: LogLevel = LogLevel.INFO
     workers: int = 2
+    min_workers: int = 1
+    max_workers: Optional[int] = None
+    scale_up_threshold: float = 0.8
+    scale_down_threshold: float = 0.3
+    scale_down_delay: float = 60
+    worker_startup_timeout: float = 60
+    hang_timeout: Optional[float] = None
+    hang_action: str = "restart"
+    slow_callback_threshold: Optional[float] = None
+    profile_dir: Optional[str] = None
+    metrics_port: Optional[int] = None
+    metrics_addr: str = "0.0.0.0"  # noqa: S104
+    preload: bool = False
+    reload_batch_size: int = 1
     max_threadpool_threads: int = 10
+    max_process_pool_workers: Optional[int] = None
+    process_pool_tasks: List[str] = field(default_factory=list)
+    hard_timeout_grace: float = 5
+    executors: List[Tuple[str, int]] = field(default_factory=list)
     no_parse: bool = False
+    strict_parse: bool = False
+    parse_in_executor: bool = False
     shutdown_timeout: float = 5
     reload: bool = False
     no_gitignore: bool = False
@@ -40,14 +74,20 @@ class WorkerArgs:
     receiver: str = "taskiq.receiver:Receiver"
     receiver_arg: List[Tuple[str, str]] = field(default_factory=list)
     max_prefetch: int = 0
+    priority_queue: bool = False
+    priority_starvation_limit: int = 1000
+    adaptive_prefetch: bool = False
+    min_prefetch: int = 0
     no_propagate_errors: bool = False
     max_fails: int = -1
     ack_type: AcknowledgeType = AcknowledgeType.WHEN_SAVED
+    ack_batch_size: int = 0
+    ack_batch_timeout: float = 0.1
     max_tasks_per_child: Optional[int] = None
     wait_tasks_timeout: Optional[float] = None
 
     @classmethod
-    def from_cli(
+    def from_cli(  # noqa: PLR0915
         cls,
         args: Optional[Sequence[str]] = None,
     ) -> "WorkerArgs":
@@ -122,6 +162,115 @@ class WorkerArgs:
             default=2,
             help="Number of worker child processes",
         )
+        parser.add_argument(
+            "--reload-batch-size",
+            type=int,
+            default=1,
+            help="Number of worker processes to reload at a time.",
+        )
+        parser.add_argument(
+            "--preload",
+            action="store_true",
+            help=(
+                "Import broker and tasks in the main process before "
+                "starting workers, so workers share this memory."
+            ),
+        )
+        parser.add_argument(
+            "--worker-startup-timeout",
+            type=float,
+            default=60,
+            help=(
+                "Maximum number of seconds to wait for "
+                "worker processes to become ready."
+            ),
+        )
+        parser.add_argument(
+            "--hang-timeout",
+            type=float,
+            default=None,
+            help=(
+                "Number of seconds without heartbeats from a worker "
+                "after which it's considered hung."
+            ),
+        )
+        parser.add_argument(
+            "--hang-action",
+            choices=["restart", "dump"],
+            default="restart",
+            help=(
+                "What to do with hung workers. Stack traces are always dumped, "
+                "'restart' also kills the worker, so it's restarted."
+            ),
+        )
+        parser.add_argument(
+            "--slow-callback-threshold",
+            type=float,
+            default=None,
+            help=(
+                "Number of seconds the event loop can be blocked before "
+                "the block and the task that caused it are reported. "
+                "Lag of the event loop isn't monitored by default."
+            ),
+        )
+        parser.add_argument(
+            "--profile-dir",
+            default=None,
+            help=(
+                "Directory for profiles of tasks with the `profile` label. "
+                "By default profiles are saved in labels of results."
+            ),
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help=(
+                "Port to serve aggregated metrics of all workers on. "
+                "Metrics aren't served by default."
+            ),
+        )
+        parser.add_argument(
+            "--metrics-addr",
+            default="0.0.0.0",  # noqa: S104
+            help="Address to serve metrics on.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=None,
+            help=(
+                "Maximum number of worker processes. "
+                "If set, number of workers is scaled based on their load."
+            ),
+        )
+        parser.add_argument(
+            "--min-workers",
+            type=int,
+            default=1,
+            help="Minimum number of worker processes for autoscaling.",
+        )
+        parser.add_argument(
+            "--scale-up-threshold",
+            type=float,
+            default=0.8,
+            help=(
+                "Share of busy and prefetched execution slots "
+                "to start a new worker process."
+            ),
+        )
+        parser.add_argument(
+            "--scale-down-threshold",
+            type=float,
+            default=0.3,
+            help="Share of busy and prefetched execution slots to stop a worker.",
+        )
+        parser.add_argument(
+            "--scale-down-delay",
+            type=float,
+            default=60,
+            help="Number of seconds workers must be underloaded to stop one of them.",
+        )
         parser.add_argument(
             "--no-parse",
             action="store_true",
@@ -131,6 +280,24 @@ class WorkerArgs:
                 " with pydantic."
             ),
         )
+        parser.add_argument(
+            "--strict-parse",
+            action="store_true",
+            help=(
+                "If this parameter is on,"
+                " tasks with parameters that cannot be parsed"
+                " fail with a validation error."
+            ),
+        )
+        parser.add_argument(
+            "--parse-in-executor",
+            action="store_true",
+            help=(
+                "If this parameter is on,"
+                " incoming parameters are parsed in the threadpool"
+                " instead of the event loop."
+            ),
+        )
         parser.add_argument(
             "--no-propagate-errors",
             action="store_true",
@@ -146,6 +313,46 @@ class WorkerArgs:
             type=int,
             help="Maximum number of threads for executing sync functions.",
         )
+        parser.add_argument(
+            "--max-process-pool-workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of processes for executing CPU-bound sync functions. "
+                "Defaults to the number of CPUs."
+            ),
+        )
+        parser.add_argument(
+            "--process-pool-task",
+            action="append",
+            dest="process_pool_tasks",
+            default=[],
+            help=(
+                "Name of a sync task to execute in the process pool. "
+                "Can be used multiple times."
+            ),
+        )
+        parser.add_argument(
+            "--executor",
+            action="append",
+            dest="executors",
+            type=executor_arg_type,
+            default=[],
+            help=(
+                "Named thread pool for sync tasks in `name=threads` format. "
+                "Tasks choose the pool with the `executor` label. "
+                "Can be used multiple times."
+            ),
+        )
+        parser.add_argument(
+            "--hard-timeout-grace",
+            type=float,
+            default=5,
+            help=(
+                "Number of seconds after task's timeout before the process "
+                "executing a sync task in the process pool is killed."
+            ),
+        )
         parser.add_argument(
             "--shutdown-timeout",
             type=float,
@@ -179,6 +386,38 @@ class WorkerArgs:
             default=0,
             help="Maximum prefetched tasks per worker process. ",
         )
+        parser.add_argument(
+            "--adaptive-prefetch",
+            action="store_true",
+            help=(
+                "Resize prefetch window at runtime using measured "
+                "execution time and broker's latency. "
+                "`--max-prefetch` is used as the upper bound."
+            ),
+        )
+        parser.add_argument(
+            "--min-prefetch",
+            type=int,
+            default=0,
+            help="Minimal size of the adaptive prefetch window.",
+        )
+        parser.add_argument(
+            "--priority-queue",
+            action="store_true",
+            help=(
+                "Execute prefetched tasks in order of their priority. "
+                "Priority is taken from the `priority` label."
+            ),
+        )
+        parser.add_argument(
+            "--priority-starvation-limit",
+            type=int,
+            default=1000,
+            help=(
+                "Maximum number of newer tasks with higher priority "
+                "that can be executed before a prefetched task."
+            ),
+        )
         parser.add_argument(
             "--no-configure-logging",
             action="store_false",
@@ -199,6 +438,20 @@ class WorkerArgs:
             choices=[ack_type.name.lower() for ack_type in AcknowledgeType],
             help="When to acknowledge message.",
         )
+        parser.add_argument(
+            "--ack-batch-size",
+            type=int,
+            default=0,
+            help="Maximum number of acknowledgements to send in one batch. "
+            "Batching is disabled if this value is less than 2.",
+        )
+        parser.add_argument(
+            "--ack-batch-timeout",
+            type=float,
+            default=0.1,
+            help="Maximum time in seconds an acknowledgement "
+            "can wait for its batch to be sent.",
+        )
         parser.add_argument(
             "--max-tasks-per-child",
             type=int,
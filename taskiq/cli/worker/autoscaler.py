@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from multiprocessing import current_process
+from multiprocessing.sharedctypes import RawArray
+from time import time
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from taskiq.receiver import Receiver
+
+logger = logging.getLogger("taskiq.autoscaler")
+
+# Layout of a worker's slot in shared memory.
+_BUSY, _QUEUED, _CAPACITY, _LOOP_LAG, _UPDATED_AT, _PID = range(6)
+_SLOT_SIZE = 6
+
+
+@dataclass
+class WorkerLoad:
+    """
+    Load signals reported by a worker process.
+
+    Capacity is 0 if the number of running tasks isn't limited.
+    """
+
+    busy: float
+    queued: float
+    capacity: float
+    loop_lag: float
+
+
+class WorkerLoads:
+    """
+    Load signals of all worker processes.
+
+    Every worker writes its own slot in shared memory,
+    and the process manager reads all of them.
+    Slot number is a number of the worker process.
+    Time of the last update is used as a heartbeat of the worker.
+
+    Slots also contain pids of workers, so reports
+    of replaced processes are ignored.
+
+    :param max_workers: maximum number of worker processes.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self.data: Any = RawArray("d", max_workers * _SLOT_SIZE)
+
+    def write(self, worker_num: int, load: WorkerLoad) -> None:
+        """
+        Update load of a worker.
+
+        :param worker_num: number of the worker.
+        :param load: current load.
+        """
+        offset = worker_num * _SLOT_SIZE
+        self.data[offset + _BUSY] = load.busy
+        self.data[offset + _QUEUED] = load.queued
+        self.data[offset + _CAPACITY] = load.capacity
+        self.data[offset + _LOOP_LAG] = load.loop_lag
+        self.data[offset + _UPDATED_AT] = time()
+        self.data[offset + _PID] = os.getpid()
+
+    def clear(self, worker_num: int) -> None:
+        """
+        Forget load of a worker.
+
+        This is used when worker process is replaced.
+
+        :param worker_num: number of the worker.
+        """
+        offset = worker_num * _SLOT_SIZE
+        for field in range(_SLOT_SIZE):
+            self.data[offset + field] = 0
+
+    def read(self, pids: Sequence[Optional[int]], max_age: float) -> List[WorkerLoad]:
+        """
+        Get loads of workers.
+
+        Workers that haven't reported their load
+        in `max_age` seconds are skipped.
+
+        :param pids: pids of running workers in order of their numbers.
+        :param max_age: maximum age of reports in seconds.
+        :return: list of loads.
+        """
+        loads = []
+        for worker_num, pid in enumerate(pids[: self.max_workers]):
+            age = self.heartbeat_age(worker_num, pid)
+            if age is None or age > max_age:
+                continue
+            offset = worker_num * _SLOT_SIZE
+            loads.append(
+                WorkerLoad(
+                    busy=self.data[offset + _BUSY],
+                    queued=self.data[offset + _QUEUED],
+                    capacity=self.data[offset + _CAPACITY],
+                    loop_lag=self.data[offset + _LOOP_LAG],
+                ),
+            )
+        return loads
+
+    def heartbeat_age(self, worker_num: int, pid: Optional[int]) -> Optional[float]:
+        """
+        Get time since the last report of a worker.
+
+        :param worker_num: number of the worker.
+        :param pid: pid of the worker process.
+        :return: age of the last report in seconds,
+            or None if this process hasn't reported yet.
+        """
+        offset = worker_num * _SLOT_SIZE
+        if pid is None or worker_num >= self.max_workers:
+            return None
+        if self.data[offset + _PID] != pid:
+            return None
+        return time() - self.data[offset + _UPDATED_AT]
+
+
+def get_worker_num() -> int:
+    """
+    Get number of current worker process.
+
+    Worker processes are named `worker-{num}`
+    by the process manager.
+
+    :return: number of the worker.
+    """
+    return int(current_process().name.rsplit("-", 1)[-1])
+
+
+class LoadReporter:
+    """
+    Periodically reports load of the worker to the process manager.
+
+    If the receiver has a loop monitor, lag of the event loop
+    is taken from it. Otherwise lag is measured as a delay
+    of the reporter's own wakeups.
+
+    :param loads: shared loads of workers.
+    :param receiver: receiver of the worker.
+    :param capacity: maximum number of simultaneously running tasks,
+        0 or None if it isn't limited.
+    :param interval: time between reports in seconds.
+    """
+
+    def __init__(
+        self,
+        loads: WorkerLoads,
+        receiver: "Receiver",
+        capacity: Optional[int],
+        interval: float = 0.5,
+    ) -> None:
+        self.loads = loads
+        self.receiver = receiver
+        self.capacity = capacity or 0
+        self.interval = interval
+        self.worker_num = get_worker_num()
+        self.task: "Optional[asyncio.Task[None]]" = None
+
+    def start(self) -> None:
+        """Start reporting in the current event loop."""
+        self.task = asyncio.get_event_loop().create_task(self.run())
+
+    def stop(self) -> None:
+        """Stop reporting."""
+        if self.task is not None:
+            self.task.cancel()
+
+    def report(self, loop_lag: float) -> None:
+        """
+        Write current load of the worker.
+
+        :param loop_lag: measured lag of the event loop.
+        """
+        queue = self.receiver.prefetch_queue
+        # Deferred messages of saturated tasks wait, so they aren't busy.
+        deferred = self.receiver.deferred_messages
+        self.loads.write(
+            self.worker_num,
+            WorkerLoad(
+                busy=len(self.receiver.running_tasks) - deferred,
+                queued=(queue.qsize() if queue is not None else 0) + deferred,
+                capacity=self.capacity,
+                loop_lag=loop_lag,
+            ),
+        )
+
+    async def run(self) -> None:
+        """Report load until cancelled."""
+        loop = asyncio.get_running_loop()
+        monitor = self.receiver.loop_monitor
+        loop_lag = 0.0
+        while True:
+            self.report(loop_lag)
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            if monitor is not None:
+                loop_lag = monitor.take_max_lag()
+            else:
+                loop_lag = max(loop.time() - expected, 0)
+
+
+class Autoscaler:
+    """
+    Decides when to change number of worker processes.
+
+    Utilization is the number of running and prefetched tasks
+    divided by the number of execution slots of all workers.
+    Workers without a limit of running tasks don't have slots,
+    so their utilization is the lag of their event loops
+    divided by `max_loop_lag`.
+    Workers are overloaded if utilization is above `scale_up_threshold`,
+    or if lag of some event loop is above `max_loop_lag`.
+    Workers are underloaded if utilization is below `scale_down_threshold`.
+
+    To avoid flapping, the state must last for `scale_up_delay`
+    or `scale_down_delay` seconds, and these delays
+    start over after every change.
+
+    :param min_workers: minimum number of workers.
+    :param max_workers: maximum number of workers.
+    :param scale_up_threshold: utilization to start new workers.
+    :param scale_down_threshold: utilization to stop workers.
+    :param scale_up_delay: time of overload to start a worker.
+    :param scale_down_delay: time of underload to stop a worker.
+    :param max_loop_lag: event loop lag to start new workers.
+    """
+
+    def __init__(
+        self,
+        min_workers: int,
+        max_workers: int,
+        *,
+        scale_up_threshold: float = 0.8,
+        scale_down_threshold: float = 0.3,
+        scale_up_delay: float = 5,
+        scale_down_delay: float = 60,
+        max_loop_lag: float = 0.5,
+    ) -> None:
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.scale_up_threshold = scale_up_threshold
+        self.scale_down_threshold = scale_down_threshold
+        self.scale_up_delay = scale_up_delay
+        self.scale_down_delay = scale_down_delay
+        self.max_loop_lag = max_loop_lag
+        self.overloaded_since: Optional[float] = None
+        self.underloaded_since: Optional[float] = None
+
+    def utilization(self, loads: List[WorkerLoad]) -> float:
+        """
+        Calculate utilization of workers.
+
+        :param loads: loads of workers.
+        :return: utilization, where 1 means that all slots are busy.
+        """
+        bounded = [load for load in loads if load.capacity > 0]
+        if not bounded:
+            if not loads or self.max_loop_lag <= 0:
+                return 0
+            return max(load.loop_lag for load in loads) / self.max_loop_lag
+        capacity = sum(load.capacity for load in bounded)
+        return sum(load.busy + load.queued for load in bounded) / capacity
+
+    def decide(self, workers_num: int, loads: List[WorkerLoad], now: float) -> int:
+        """
+        Calculate the change of workers number.
+
+        :param workers_num: current number of workers.
+        :param loads: loads of workers.
+        :param now: current time.
+        :return: 1 to start a worker, -1 to stop one, 0 otherwise.
+        """
+        if not loads:
+            self.overloaded_since = None
+            self.underloaded_since = None
+            return 0
+        utilization = self.utilization(loads)
+        lagging = max(load.loop_lag for load in loads) >= self.max_loop_lag
+        overloaded = utilization >= self.scale_up_threshold or lagging
+        underloaded = utilization <= self.scale_down_threshold and not lagging
+
+        if not overloaded:
+            self.overloaded_since = None
+        elif self.overloaded_since is None:
+            self.overloaded_since = now
+        if not underloaded:
+            self.underloaded_since = None
+        elif self.underloaded_since is None:
+            self.underloaded_since = now
+
+        if (
+            self.overloaded_since is not None
+            and now - self.overloaded_since >= self.scale_up_delay
+            and workers_num < self.max_workers
+        ):
+            self.overloaded_since = None
+            logger.info(
+                "Workers are overloaded (utilization %.2f). Starting a new worker.",
+                utilization,
+            )
+            return 1
+        if (
+            self.underloaded_since is not None
+            and now - self.underloaded_since >= self.scale_down_delay
+            and workers_num > self.min_workers
+        ):
+            self.underloaded_since = None
+            logger.info(
+                "Workers are underloaded (utilization %.2f). Stopping a worker.",
+                utilization,
+            )
+            return -1
+        return 0
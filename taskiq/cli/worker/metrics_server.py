@@ -0,0 +1,83 @@
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any, Optional, Tuple
+
+from taskiq.metrics import MetricsRegistry, SharedMetrics, add_values, render_metrics
+
+logger = logging.getLogger("taskiq.metrics")
+
+
+class MetricsServer:
+    """
+    HTTP server with metrics of all workers.
+
+    It runs in a thread of the process manager and
+    serves aggregated metrics of worker processes
+    together with metrics of the manager itself.
+
+    :param shared_metrics: shared metrics of workers.
+    :param registry: metrics of the process manager.
+    :param addr: address to listen on.
+    :param port: port to listen on.
+    """
+
+    def __init__(
+        self,
+        shared_metrics: SharedMetrics,
+        registry: MetricsRegistry,
+        addr: str,
+        port: int,
+    ) -> None:
+        self.shared_metrics = shared_metrics
+        self.registry = registry
+        self.addr = addr
+        self.port = port
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def render(self) -> str:
+        """
+        Render current metrics.
+
+        :return: metrics in Prometheus text format.
+        """
+        families = self.shared_metrics.collect()
+        for info, family in self.registry.families().items():
+            for labelvalues, values in family.items():
+                add_values(families, info, labelvalues, values)
+        return render_metrics(families)
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        metrics_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = metrics_server.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format, *args)
+
+        self.server = ThreadingHTTPServer((self.addr, self.port), Handler)
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info("Serving metrics on %s:%d.", *self.address)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address of the running server."""
+        if self.server is None:
+            return self.addr, self.port
+        return self.server.server_address[:2]  # type: ignore
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,77 @@
+import gc
+import logging
+from dataclasses import dataclass
+from multiprocessing import get_start_method
+from typing import Dict, Optional
+
+from taskiq.abc.broker import AsyncBroker
+from taskiq.cli.utils import import_object, import_tasks
+from taskiq.cli.worker.args import WorkerArgs
+from taskiq.receiver.execution_plan import TaskExecutionPlan
+
+logger = logging.getLogger("taskiq.worker")
+
+
+@dataclass
+class PreloadedApp:
+    """Broker and tasks imported in the main process."""
+
+    broker: AsyncBroker
+    execution_plans: Dict[str, TaskExecutionPlan]
+
+
+def import_broker(args: WorkerArgs) -> AsyncBroker:
+    """
+    Import broker and tasks for a worker.
+
+    :param args: CLI arguments.
+    :raises ValueError: if broker is not an AsyncBroker instance.
+    :return: imported broker.
+    """
+    broker = import_object(args.broker)
+    if not isinstance(broker, AsyncBroker):
+        raise ValueError("Unknown broker type. Please use AsyncBroker instance.")
+    # This option signals that current
+    # broker is running as a worker.
+    # We must set this field before importing tasks,
+    # so broker will remember all tasks it's related to.
+    broker.is_worker_process = True
+    import_tasks(args.modules, args.tasks_pattern, args.fs_discover)
+    return broker
+
+
+def preload_app(args: WorkerArgs) -> Optional[PreloadedApp]:
+    """
+    Import broker and tasks before worker processes are forked.
+
+    Forked workers share memory of imported modules
+    with the main process until they modify it.
+    To keep these pages shared, garbage collector is disabled during
+    the import and all objects are frozen afterwards, so
+    collections in workers don't touch them.
+
+    :param args: CLI arguments.
+    :return: preloaded application or None if processes aren't forked.
+    """
+    if get_start_method() != "fork":
+        logger.warning("Preloading works only with 'fork' start method. Skipping.")
+        return None
+    gc.disable()
+    try:
+        broker = import_broker(args)
+        process_pool_tasks = set(args.process_pool_tasks)
+        execution_plans = {
+            task.task_name: TaskExecutionPlan.build(
+                task.original_func,
+                broker.middlewares,
+                labels=task.labels,
+                validate_params=not args.no_parse,
+                process_pool=task.task_name in process_pool_tasks,
+            )
+            for task in broker.get_all_tasks().values()
+        }
+        gc.freeze()
+    finally:
+        gc.enable()
+    logger.info("Preloaded %d tasks.", len(execution_plans))
+    return PreloadedApp(broker=broker, execution_plans=execution_plans)
@@ -2,12 +2,14 @@ import logging
 import os
 import signal
 import sys
-from contextlib import suppress
 from dataclasses import dataclass
+from functools import partial
+from itertools import chain
 from multiprocessing import Event, Process, Queue, current_process
+from multiprocessing.connection import wait
 from multiprocessing.synchronize import Event as EventType
-from time import sleep
-from typing import Any, Callable, List, Optional
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 try:
     from watchdog.observers import Observer
@@ -18,6 +20,8 @@ except ImportError:
     FileWatcher = None  # type: ignore
 
 from taskiq.cli.worker.args import WorkerArgs
+from taskiq.cli.worker.autoscaler import Autoscaler, WorkerLoads
+from taskiq.metrics import MetricsRegistry, SharedMetrics
 
 logger = logging.getLogger("taskiq.process-manager")
 
@@ -46,24 +50,90 @@ class ReloadAllAction(ProcessActionBase):
 
     def handle(
         self,
-        workers: List[Process],
         workers_num: int,
+        batch_size: int,
         action_queue: "Queue[ProcessActionBase]",
     ) -> None:
         """
         Handle reload all action.
 
+        Workers are reloaded in batches, so
+        other workers keep processing messages.
+        Only the first batch is sent, the next one
+        is sent when workers of the previous batch are ready.
+
         :param workers_num: number of currently active workers.
+        :param batch_size: number of workers to reload at a time.
         :param action_queue: queue to send events to.
         """
-        for worker_id in range(workers_num):
-            action_queue.put(ReloadOneAction(worker_num=worker_id, is_reload_all=True))
-            worker = workers[worker_id]
+        action_queue.put(ReloadBatchAction.starting_from(0, batch_size, workers_num))
+
+
+@dataclass
+class ReloadBatchAction(ProcessActionBase):
+    """This action reloads a batch of workers during rolling reload."""
+
+    worker_nums: List[int]
+    is_last: bool
+
+    @classmethod
+    def starting_from(
+        cls,
+        first: int,
+        batch_size: int,
+        workers_num: int,
+    ) -> "ReloadBatchAction":
+        """
+        Create a batch of workers.
+
+        :param first: number of the first worker in the batch.
+        :param batch_size: number of workers to reload at a time.
+        :param workers_num: number of currently active workers.
+        :return: new batch.
+        """
+        last = min(first + max(batch_size, 1), workers_num)
+        return cls(worker_nums=list(range(first, last)), is_last=last >= workers_num)
+
+    def handle(
+        self,
+        workers: List[Process],
+        args: WorkerArgs,
+        worker_func: Callable[..., None],
+        zombie_workers: List[Process],
+    ) -> List[Tuple[int, EventType]]:
+        """
+        Reload workers of the batch.
+
+        Old workers stop receiving new messages and finish
+        their current tasks, while new workers take over.
+        This function doesn't wait for new workers to become ready.
+
+        :param workers: known children processes.
+        :param args: args for new processes.
+        :param worker_func: function that is used to start worker processes.
+        :param zombie_workers: list of stopping processes.
+        :return: numbers of started workers with their readiness events.
+        """
+        started = []
+        for worker_num in self.worker_nums:
+            if worker_num >= len(workers):
+                continue
+            worker = workers[worker_num]
             try:
+                # Workers handle SIGTERM gracefully.
                 worker.terminate()
             except ValueError:
                 logger.debug(f"Process {worker.name} is already terminated.")
-        action_queue.put(WaitZombieWorkersAction())
+            zombie_workers.append(worker)
+            new_process, event = start_worker(worker_func, args, worker_num)
+            logger.info(
+                "Process %s reloaded with pid %s",
+                new_process.name,
+                new_process.pid,
+            )
+            workers[worker_num] = new_process
+            started.append((worker_num, event))
+        return started
 
 
 @dataclass
@@ -77,19 +147,21 @@ class ReloadOneAction(ProcessActionBase):
         self,
         workers: List[Process],
         args: WorkerArgs,
-        worker_func: Callable[[WorkerArgs], None],
+        worker_func: Callable[..., None],
         zombie_workers: List[Process],
-    ) -> None:
+    ) -> Optional[EventType]:
         """
         This action reloads a single process.
 
         :param workers: known children processes.
         :param args: args for new process.
         :param worker_func: function that is used to start worker processes.
+        :param zombie_workers: list of stopping processes.
+        :return: readiness event of started worker.
         """
         if self.worker_num < 0 or self.worker_num >= len(workers):
             logger.warning("Unknown worker id.")
-            return
+            return None
         worker = workers[self.worker_num]
         try:
             worker.terminate()
@@ -97,17 +169,10 @@ class ReloadOneAction(ProcessActionBase):
             logger.debug(f"Process {worker.name} is already terminated.")
         # Waiting worker shutdown.
         zombie_workers.append(worker)
-        event: EventType = Event()
-        new_process = Process(
-            target=worker_func,
-            kwargs={"args": args},
-            name=f"worker-{self.worker_num}",
-            daemon=True,
-        )
-        new_process.start()
+        new_process, event = start_worker(worker_func, args, self.worker_num)
         logger.info(f"Process {new_process.name} restarted with pid {new_process.pid}")
         workers[self.worker_num] = new_process
-        _wait_for_worker_startup(new_process, event)
+        return event
 
 
 @dataclass
@@ -115,11 +180,55 @@ class ShutdownAction(ProcessActionBase):
     """This action shuts down process manager loop."""
 
 
-def _wait_for_worker_startup(process: Process, event: EventType) -> None:
+def start_worker(
+    worker_func: Callable[..., None],
+    args: WorkerArgs,
+    worker_num: int,
+) -> Tuple[Process, EventType]:
+    """
+    Start a worker process.
+
+    The worker sets returned event, when it's ready
+    to receive messages.
+
+    :param worker_func: function that is used to start worker processes.
+    :param args: args for new process.
+    :param worker_num: number of the worker.
+    :return: started process and its readiness event.
+    """
+    event: EventType = Event()
+    process = Process(
+        target=worker_func,
+        kwargs={"args": args, "ready_event": event},
+        name=f"worker-{worker_num}",
+        daemon=True,
+    )
+    process.start()
+    return process, event
+
+
+def _wait_for_worker_startup(
+    process: Process,
+    event: EventType,
+    deadline: float,
+) -> bool:
+    """
+    Wait until worker is ready.
+
+    :param process: worker process.
+    :param event: worker's readiness event.
+    :param deadline: time when waiting stops.
+    :return: True if worker is ready.
+    """
     while process.is_alive():
-        with suppress(TimeoutError):
-            event.wait(0.1)
-            return
+        timeout = deadline - time()
+        if timeout <= 0:
+            logger.warning(f"Process {process.name} is not ready in time.")
+            return False
+        if event.wait(min(timeout, 0.1)):
+            return True
+    logger.warning(f"Process {process.name} exited during startup.")
+    return False
 
 
 def schedule_workers_reload(
@@ -170,18 +279,78 @@ class ProcessManager:
     This class spawns multiple processes,
     and maintains their states. If process
     is down, it tries to restart it.
+
+    If `max_workers` is set, number of processes
+    is changed based on the load reported by workers.
+
+    If `hang_timeout` is set, workers that stop
+    reporting their load are considered hung.
+
+    If `metrics_port` is set, workers write their
+    metrics to shared memory, so they can be served
+    by the main process.
     """
 
     def __init__(
         self,
         args: WorkerArgs,
-        worker_function: Callable[[WorkerArgs], None],
+        worker_function: Callable[..., None],
         observer: Optional[Observer] = None,  # type: ignore[valid-type]
     ) -> None:
         self.worker_function = worker_function
         self.action_queue: "Queue[ProcessActionBase]" = Queue(-1)
         self.zombie_workers: List[Process] = []
+        self.retired_workers: List[Process] = []
+        # Numbers of workers scheduled for restart
+        # with time when restart was scheduled.
+        self.pending_restarts: Dict[int, float] = {}
+        self.last_restart_latency: Optional[float] = None
+        # Workers that aren't ready yet with their
+        # readiness events and startup deadlines.
+        self.starting_workers: Dict[int, Tuple[Process, EventType, float]] = {}
+        # Batch of rolling reload which workers are starting.
+        self.current_batch: Optional[ReloadBatchAction] = None
+        # Whether reload was requested during another reload.
+        self.reload_requested = False
+        self.reload_started_at = 0.0
+        # Metrics of the manager itself.
+        self.metrics = MetricsRegistry()
+        self.reload_in_progress = self.metrics.gauge(
+            "workers_reload_in_progress",
+            "Whether rolling reload of workers is in progress",
+        )
+        self.reloaded_workers = self.metrics.gauge(
+            "workers_reloaded",
+            "Number of workers reloaded during the last reload",
+        )
         self.args = args
+        self.worker_loads: Optional[WorkerLoads] = None
+        self.autoscaler: Optional[Autoscaler] = None
+        self.shared_metrics: Optional[SharedMetrics] = None
+        # Pids of hung workers which stacks were dumped.
+        self.hung_workers: Set[int] = set()
+        worker_kwargs: Dict[str, Any] = {}
+        if args.max_workers is not None or args.hang_timeout is not None:
+            # Reports of workers are also their heartbeats.
+            self.worker_loads = WorkerLoads(args.max_workers or args.workers)
+            worker_kwargs["worker_loads"] = self.worker_loads
+        if args.metrics_port is not None:
+            # Old workers may still finish their tasks
+            # when new ones are started.
+            self.shared_metrics = SharedMetrics(
+                slots=2 * (args.max_workers or args.workers) + 2,
+            )
+            worker_kwargs["shared_metrics"] = self.shared_metrics
+        if worker_kwargs:
+            self.worker_function = partial(worker_function, **worker_kwargs)
+        if args.max_workers is not None:
+            self.autoscaler = Autoscaler(
+                min_workers=args.min_workers,
+                max_workers=args.max_workers,
+                scale_up_threshold=args.scale_up_threshold,
+                scale_down_threshold=args.scale_down_threshold,
+                scale_down_delay=args.scale_down_delay,
+            )
         if args.reload and observer is not None:
             observer.schedule(
                 FileWatcher(
@@ -208,14 +377,7 @@ class ProcessManager:
         """Spawn multiple processes."""
         events: List[EventType] = []
         for process in range(self.args.workers):
-            event = Event()
-            work_proc = Process(
-                target=self.worker_function,
-                kwargs={"args": self.args},
-                name=f"worker-{process}",
-                daemon=True,
-            )
-            work_proc.start()
+            work_proc, event = start_worker(self.worker_function, self.args, process)
             logger.info(
                 "Started process worker-%d with pid %s ",
                 process,
@@ -224,9 +386,309 @@ class ProcessManager:
             self.workers.append(work_proc)
             events.append(event)
 
-        # Wait for workers startup
-        for worker, event in zip(self.workers, events):
-            _wait_for_worker_startup(worker, event)
+        # Workers start in parallel, so they share the deadline.
+        started_at = time()
+        deadline = started_at + self.args.worker_startup_timeout
+        ready = sum(
+            _wait_for_worker_startup(worker, event, deadline)
+            for worker, event in zip(self.workers, events)
+        )
+        logger.info(
+            "%d of %d workers are ready in %.2f seconds.",
+            ready,
+            len(self.workers),
+            time() - started_at,
+        )
+
+    def autoscale(self) -> None:
+        """
+        Start or stop a worker according to reported load.
+
+        Stopped workers finish their current tasks
+        before exit. New workers aren't started
+        until stopped workers exit, so they
+        don't report load at the same time.
+        """
+        if self.autoscaler is None or self.worker_loads is None:
+            return
+        self.retired_workers = [
+            worker for worker in self.retired_workers if worker.is_alive()
+        ]
+        loads = self.worker_loads.read(
+            [worker.pid for worker in self.workers],
+            max_age=5,
+        )
+        change = self.autoscaler.decide(len(self.workers), loads, time())
+        if change > 0 and not self.retired_workers:
+            worker_num = len(self.workers)
+            self.worker_loads.clear(worker_num)
+            work_proc, _ = start_worker(self.worker_function, self.args, worker_num)
+            logger.info(
+                "Started process worker-%d with pid %s ",
+                worker_num,
+                work_proc.pid,
+            )
+            self.workers.append(work_proc)
+        elif change < 0:
+            worker = self.workers.pop()
+            self.starting_workers.pop(len(self.workers), None)
+            self.pending_restarts.pop(len(self.workers), None)
+            logger.info("Stopping process %s.", worker.name)
+            if worker.pid:
+                os.kill(worker.pid, signal.SIGINT)
+            self.retired_workers.append(worker)
+            self.worker_loads.clear(len(self.workers))
+
+    def check_heartbeats(self) -> None:
+        """
+        Find hung workers.
+
+        Workers report their load from the event loop,
+        so if a worker doesn't report for `hang_timeout` seconds,
+        its event loop is blocked. Stack traces of all threads
+        of such worker are dumped to its stderr once.
+
+        If `hang_action` is "restart", the worker is killed
+        on the next check, so it's restarted as a dead one.
+        Workers that haven't reported yet are skipped,
+        because they are still starting.
+        """
+        if self.args.hang_timeout is None or self.worker_loads is None:
+            return
+        for worker_num, worker in enumerate(self.workers):
+            if worker_num in self.pending_restarts or worker.pid is None:
+                continue
+            age = self.worker_loads.heartbeat_age(worker_num, worker.pid)
+            if age is None or age < self.args.hang_timeout:
+                self.hung_workers.discard(worker.pid)
+                continue
+            if worker.pid in self.hung_workers:
+                if self.args.hang_action == "restart" and worker.is_alive():
+                    logger.warning("Killing hung process %s.", worker.name)
+                    worker.kill()
+                continue
+            logger.warning(
+                "%s hasn't reported for %.1f seconds. It seems to be hung.",
+                worker.name,
+                age,
+            )
+            self.hung_workers.add(worker.pid)
+            if sys.platform != "win32":
+                os.kill(worker.pid, signal.SIGUSR1)
+        # Forget replaced workers.
+        self.hung_workers &= {worker.pid for worker in self.workers}
+
+    def release_metrics(self) -> None:
+        """Free slots of shared metrics used by exited workers."""
+        if self.shared_metrics is None:
+            return
+        self.shared_metrics.release(
+            {
+                worker.pid
+                for worker in chain(
+                    self.workers,
+                    self.zombie_workers,
+                    self.retired_workers,
+                )
+                if worker.pid is not None and worker.is_alive()
+            },
+        )
+
+    def wait_for_events(self) -> None:
+        """
+        Wait until something happens.
+
+        This function blocks until an action is put in the queue
+        or one of workers exits. If autoscaling or
+        hang detection is enabled, it also wakes up
+        every second to check reports of workers.
+        While workers are starting, it wakes up often
+        to check whether they are ready.
+        """
+        # Reader of the queue becomes ready when actions are put in it.
+        waitables: List[Any] = [self.action_queue._reader]  # type: ignore  # noqa: SLF001
+        waitables.extend(
+            worker.sentinel
+            for worker_num, worker in enumerate(self.workers)
+            if worker_num not in self.pending_restarts
+        )
+        # Stopping workers are removed when they exit.
+        waitables.extend(worker.sentinel for worker in self.zombie_workers)
+        waitables.extend(worker.sentinel for worker in self.retired_workers)
+        timeout: Optional[float] = None
+        if self.starting_workers:
+            timeout = 0.05
+        elif self.worker_loads is not None:
+            timeout = 1
+        wait(waitables, timeout=timeout)
+        self.zombie_workers[:] = [
+            worker for worker in self.zombie_workers if worker.is_alive()
+        ]
+
+    def _watch_startup(self, worker_num: int, event: EventType) -> None:
+        """
+        Start waiting for a worker to become ready.
+
+        :param worker_num: number of started worker.
+        :param event: worker's readiness event.
+        """
+        self.starting_workers[worker_num] = (
+            self.workers[worker_num],
+            event,
+            time() + self.args.worker_startup_timeout,
+        )
+
+    def check_startups(self) -> None:
+        """
+        Find workers that became ready.
+
+        Workers that exited or didn't become ready
+        in `worker_startup_timeout` seconds aren't waited for anymore.
+        When all workers of the current reload batch
+        are processed, the next batch is reloaded.
+        """
+        now = time()
+        for worker_num, (worker, event, deadline) in list(
+            self.starting_workers.items(),
+        ):
+            if event.is_set():
+                logger.debug("Process %s is ready.", worker.name)
+            elif not worker.is_alive():
+                logger.warning(f"Process {worker.name} exited during startup.")
+            elif now >= deadline:
+                logger.warning(f"Process {worker.name} is not ready in time.")
+            else:
+                continue
+            del self.starting_workers[worker_num]
+        batch = self.current_batch
+        if batch is not None and not any(
+            worker_num in self.starting_workers for worker_num in batch.worker_nums
+        ):
+            self.current_batch = None
+            self._finish_batch(batch)
+
+    def _track_restart(self, worker_num: int) -> None:
+        """
+        Measure time it took to restart a worker.
+
+        :param worker_num: number of restarted worker.
+        """
+        scheduled_at = self.pending_restarts.pop(worker_num, None)
+        if scheduled_at is None:
+            return
+        self.last_restart_latency = time() - scheduled_at
+        logger.info(
+            "Worker %d restarted in %.3f seconds.",
+            worker_num,
+            self.last_restart_latency,
+        )
+
+    def _reload_one(self, action: ReloadOneAction, reloaded_workers: Set[int]) -> None:
+        """
+        Restart a single worker.
+
+        :param action: action to handle.
+        :param reloaded_workers: numbers of workers
+            restarted while handling current events.
+        """
+        # If we just reloaded this worker, skip handling.
+        if action.worker_num in reloaded_workers:
+            return
+        event = action.handle(
+            self.workers,
+            self.args,
+            self.worker_function,
+            self.zombie_workers,
+        )
+        if event is not None:
+            self._watch_startup(action.worker_num, event)
+        reloaded_workers.add(action.worker_num)
+        self._track_restart(action.worker_num)
+
+    def check_workers(self) -> None:
+        """Schedule restart of dead workers."""
+        for worker_num, worker in enumerate(self.workers):
+            if worker_num in self.pending_restarts:
+                continue
+            if not worker.is_alive():
+                logger.info(f"{worker.name} is dead. Scheduling reload.")
+                self.pending_restarts[worker_num] = time()
+                self.action_queue.put(
+                    ReloadOneAction(
+                        worker_num=worker_num,
+                        is_reload_all=False,
+                    ),
+                )
+
+    def _start_reload(self, action: ReloadAllAction) -> None:
+        """
+        Start rolling reload of all workers.
+
+        If another reload is in progress, reload
+        starts over when the current batch is ready.
+
+        :param action: reload action.
+        """
+        if self.current_batch is not None:
+            self.reload_requested = True
+            return
+        logger.info(
+            "Reloading %d workers, %d at a time.",
+            len(self.workers),
+            self.args.reload_batch_size,
+        )
+        self.reload_started_at = time()
+        self.reload_in_progress.set(1)
+        self.reloaded_workers.set(0)
+        action.handle(
+            workers_num=len(self.workers),
+            batch_size=self.args.reload_batch_size,
+            action_queue=self.action_queue,
+        )
+
+    def _reload_batch(self, action: ReloadBatchAction) -> None:
+        """
+        Reload a batch of workers.
+
+        :param action: batch to reload.
+        """
+        self.current_batch = action
+        for worker_num, event in action.handle(
+            self.workers,
+            self.args,
+            self.worker_function,
+            self.zombie_workers,
+        ):
+            self._watch_startup(worker_num, event)
+
+    def _finish_batch(self, action: ReloadBatchAction) -> None:
+        """
+        Finish reload of a batch and schedule the next one.
+
+        The next batch is sent to the action queue,
+        so actions that were sent before, like shutdown,
+        are handled first.
+
+        :param action: reloaded batch.
+        """
+        self.reloaded_workers.set(self.reloaded_workers.value + len(action.worker_nums))
+        if self.reload_requested:
+            self.reload_requested = False
+            self._start_reload(ReloadAllAction())
+        elif not action.is_last:
+            self.action_queue.put(
+                ReloadBatchAction.starting_from(
+                    action.worker_nums[-1] + 1,
+                    self.args.reload_batch_size,
+                    len(self.workers),
+                ),
+            )
+        else:
+            self.reload_in_progress.set(0)
+            logger.info(
+                "All workers reloaded in %.2f seconds.",
+                time() - self.reload_started_at,
+            )
 
     def start(self) -> Optional[int]:  # noqa: C901
         """
@@ -235,42 +697,48 @@ class ProcessManager:
         This function is an endless loop,
         which listens to new events from different sources.
 
-        Every second it checks for new events and
-        current states of child processes.
+        It waits for new events or exits of child processes
+        and reacts to them right away.
 
         If there are new events it handles them.
         Manager can handle 3 types of events:
 
         1. `ReloadAllAction` - when we want to restart all child processes.
-            It checks for running processes and generates RELOAD_ONE event for
-            any process.
+            It splits running processes in batches and generates
+            `ReloadBatchAction` for the first batch.
 
-        2. `ReloadOneAction` - this event restarts one single child process.
+        2. `ReloadBatchAction` - this event restarts a batch of processes.
+            `ReloadBatchAction` for the next batch is generated
+            when new processes are ready.
 
-        3. `ShutdownAction` - exits the loop. Since all child processes are
+        3. `ReloadOneAction` - this event restarts one single child process.
+
+        4. `ShutdownAction` - exits the loop. Since all child processes are
             daemons, they will be automatically terminated using signals.
 
-        After all events are handled, it iterates over all child processes and
+        After all events are handled, it checks whether new processes
+        are ready. Then it iterates over all child processes and
         checks that all processes are healthy. If process was terminated for
         some reason, it schedules a restart for dead process.
 
+        Then it checks heartbeats of workers and,
+        if autoscaling is enabled, it starts or stops a worker.
+
         :returns: status code or None.
         """
         restarts = 0
         self.prepare_workers()
         while True:
-            sleep(1)
-            reloaded_workers = set()
+            self.wait_for_events()
+            reloaded_workers: Set[int] = set()
             # We bulk_process all pending events.
             while not self.action_queue.empty():
                 action = self.action_queue.get()
                 logging.debug(f"Got event: {action}")
                 if isinstance(action, ReloadAllAction):
-                    action.handle(
-                        workers_num=len(self.workers),
-                        workers=self.workers,
-                        action_queue=self.action_queue,
-                    )
+                    self._start_reload(action)
+                elif isinstance(action, ReloadBatchAction):
+                    self._reload_batch(action)
                 elif isinstance(action, ReloadOneAction):
                     # We check if max_fails is set.
                     # If it's true, we check how many times
@@ -281,11 +749,7 @@ class ProcessManager:
                             logger.warning("Max restarts reached. Exiting.")
                             # Returning error status.
                             return -1
-                    # If we just reloaded this worker, skip handling.
-                    if action.worker_num in reloaded_workers:
-                        continue
-                    action.handle(self.workers, self.args, self.worker_function, self.zombie_workers)
-                    reloaded_workers.add(action.worker_num)
+                    self._reload_one(action, reloaded_workers)
                 elif isinstance(action, ShutdownAction):
                     logger.debug("Process manager closed, killing workers.")
                     for worker in self.workers:
@@ -295,12 +759,9 @@ class ProcessManager:
                 elif isinstance(action, WaitZombieWorkersAction):
                     action.handle(self.zombie_workers)
 
-            for worker_num, worker in enumerate(self.workers):
-                if not worker.is_alive():
-                    logger.info(f"{worker.name} is dead. Scheduling reload.")
-                    self.action_queue.put(
-                        ReloadOneAction(
-                            worker_num=worker_num,
-                            is_reload_all=False,
-                        ),
-                    )
+            self.check_startups()
+            self.check_workers()
+
+            self.release_metrics()
+            self.check_heartbeats()
+            self.autoscale()
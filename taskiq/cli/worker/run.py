@@ -1,17 +1,27 @@
 import asyncio
+import faulthandler
 import logging
 import os
 import signal
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 from multiprocessing import set_start_method
+from multiprocessing.synchronize import Event as EventType
 from sys import platform
-from typing import Any, Optional, Type
+from typing import Any, Callable, Dict, Optional, Type
 
 from taskiq.abc.broker import AsyncBroker
-from taskiq.cli.utils import import_object, import_tasks
+from taskiq.cli.utils import import_object
 from taskiq.cli.worker.args import WorkerArgs
+from taskiq.cli.worker.autoscaler import LoadReporter, WorkerLoads
+from taskiq.cli.worker.metrics_server import MetricsServer
+from taskiq.cli.worker.preload import PreloadedApp, import_broker, preload_app
 from taskiq.cli.worker.process_manager import ProcessManager
+from taskiq.metrics import SharedMetrics, metrics
 from taskiq.receiver import Receiver
+from taskiq.receiver.execution_plan import uses_process_pool
+from taskiq.receiver.process_pool import create_process_pool
 
 try:
     import uvloop
@@ -68,7 +78,58 @@ def get_receiver_type(args: WorkerArgs) -> Type[Receiver]:
     return receiver_type
 
 
-def start_listen(args: WorkerArgs) -> None:
+def _notify_ready(
+    ready_event: Optional[EventType],
+) -> Optional[Callable[[Receiver], None]]:
+    """
+    Create callback that notifies process manager about readiness.
+
+    :param ready_event: event to set.
+    :return: callback for receiver or None.
+    """
+    if ready_event is None:
+        return None
+
+    def on_ready(_: Receiver) -> None:
+        ready_event.set()
+
+    return on_ready
+
+
+def _enable_stack_dumps(args: WorkerArgs) -> None:
+    """
+    Dump stack traces on SIGUSR1.
+
+    Process manager sends this signal to hung workers.
+
+    :param args: CLI arguments.
+    """
+    if args.hang_timeout is not None and platform != "win32":
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+
+
+def _attach_metrics(shared_metrics: Optional[SharedMetrics]) -> None:
+    """
+    Write metrics of the worker to shared memory.
+
+    :param shared_metrics: shared metrics of workers.
+    """
+    if shared_metrics is None:
+        return
+    slot = shared_metrics.claim()
+    if slot is None:
+        logger.warning("No free slots for metrics. They won't be exported.")
+        return
+    metrics.attach(slot)
+
+
+def start_listen(
+    args: WorkerArgs,
+    worker_loads: Optional[WorkerLoads] = None,
+    ready_event: Optional[EventType] = None,
+    preloaded: Optional[PreloadedApp] = None,
+    shared_metrics: Optional[SharedMetrics] = None,
+) -> None:
     """
     This function starts actual listening process.
 
@@ -78,7 +139,11 @@ def start_listen(args: WorkerArgs) -> None:
 
 
     :param args: CLI arguments.
-    :param event: Event for notification.
+    :param worker_loads: shared loads of workers for autoscaling
+        and hang detection.
+    :param ready_event: event to set when worker is ready to receive messages.
+    :param preloaded: broker and tasks imported before the fork.
+    :param shared_metrics: shared metrics of workers.
     :raises ValueError: if broker is not an AsyncBroker instance.
     :raises ValueError: if receiver is not a Receiver type.
     """
@@ -108,6 +173,8 @@ def start_listen(args: WorkerArgs) -> None:
 
     signal.signal(signal.SIGINT, interrupt_handler)
     signal.signal(signal.SIGTERM, interrupt_handler)
+    _enable_stack_dumps(args)
+    _attach_metrics(shared_metrics)
 
     if uvloop is not None:
         logger.debug("UVLOOP found. Using it as async runner")
@@ -117,39 +184,128 @@ def start_listen(args: WorkerArgs) -> None:
 
     asyncio.set_event_loop(loop)
 
-    # This option signals that current
-    # broker is running as a worker.
-    # We must set this field before importing tasks,
-    # so broker will remember all tasks it's related to.
-    broker = import_object(args.broker)
-    if not isinstance(broker, AsyncBroker):
-        raise ValueError("Unknown broker type. Please use AsyncBroker instance.")
-    broker.is_worker_process = True
-    import_tasks(args.modules, args.tasks_pattern, args.fs_discover)
+    receiver_kwargs: Dict[str, Any] = dict(args.receiver_arg)
+    if preloaded is not None:
+        broker = preloaded.broker
+        receiver_kwargs["execution_plans"] = preloaded.execution_plans
+    else:
+        broker = import_broker(args)
 
     receiver_type = get_receiver_type(args)
-    receiver_kwargs = dict(args.receiver_arg)
+
+    process_pool = None
+    load_reporter = None
+    if args.process_pool_tasks or any(
+        uses_process_pool(task.labels) for task in broker.get_all_tasks().values()
+    ):
+        logger.debug("Starting process pool.")
+        process_pool = create_process_pool(
+            max_workers=args.max_process_pool_workers,
+            broker_path=args.broker,
+            modules=args.modules,
+            tasks_pattern=args.tasks_pattern,
+            fs_discover=args.fs_discover,
+            hard_timeout_grace=args.hard_timeout_grace,
+        )
 
     try:
         logger.debug("Initialize receiver.")
-        with ThreadPoolExecutor(args.max_threadpool_threads) as pool:
+        with ExitStack() as stack:
+            pool = stack.enter_context(
+                ThreadPoolExecutor(args.max_threadpool_threads),
+            )
+            executors: Dict[str, Executor] = {
+                name: stack.enter_context(
+                    ThreadPoolExecutor(threads, thread_name_prefix=name),
+                )
+                for name, threads in args.executors
+            }
             receiver = receiver_type(
                 broker=broker,
                 executor=pool,
                 validate_params=not args.no_parse,
+                strict_params=args.strict_parse,
+                parse_in_executor=args.parse_in_executor,
                 max_async_tasks=args.max_async_tasks,
                 max_prefetch=args.max_prefetch,
+                priority_queue=args.priority_queue,
+                priority_starvation_limit=args.priority_starvation_limit,
+                adaptive_prefetch=args.adaptive_prefetch,
+                min_prefetch=args.min_prefetch,
                 propagate_exceptions=not args.no_propagate_errors,
                 ack_type=args.ack_type,
+                ack_batch_size=args.ack_batch_size,
+                ack_batch_timeout=args.ack_batch_timeout,
                 max_tasks_to_execute=args.max_tasks_per_child,
                 wait_tasks_timeout=args.wait_tasks_timeout,
-                **receiver_kwargs,  # type: ignore
+                process_pool=process_pool,
+                process_pool_tasks=args.process_pool_tasks,
+                executors=executors,
+                slow_callback_threshold=args.slow_callback_threshold,
+                profile_dir=args.profile_dir,
+                on_ready=_notify_ready(ready_event),
+                **receiver_kwargs,
             )
+            if worker_loads is not None:
+                load_reporter = LoadReporter(
+                    worker_loads,
+                    receiver,
+                    capacity=args.max_async_tasks,
+                )
+                load_reporter.start()
             loop.run_until_complete(receiver.listen())
     except KeyboardInterrupt:
         logger.warning("Worker process interrupted.")
     finally:
+        if load_reporter is not None:
+            load_reporter.stop()
         loop.run_until_complete(shutdown_broker(broker, args.shutdown_timeout))
+        if process_pool is not None:
+            process_pool.shutdown()
+
+
+def get_worker_function(args: WorkerArgs) -> Callable[..., None]:
+    """
+    Get function that starts worker processes.
+
+    If preloading is enabled, broker and tasks
+    are imported here, before workers are forked.
+
+    :param args: CLI arguments.
+    :return: worker function.
+    """
+    if not args.preload:
+        return start_listen
+    if args.reload:
+        logger.warning("Preloading is disabled, because tasks are reloaded.")
+        return start_listen
+    preloaded = preload_app(args)
+    if preloaded is None:
+        return start_listen
+    return partial(start_listen, preloaded=preloaded)
+
+
+def start_metrics_server(
+    args: WorkerArgs,
+    manager: ProcessManager,
+) -> Optional[MetricsServer]:
+    """
+    Start serving metrics of workers.
+
+    :param args: CLI arguments.
+    :param manager: process manager.
+    :return: running server or None if metrics are disabled.
+    """
+    if manager.shared_metrics is None or args.metrics_port is None:
+        return None
+    metrics_server = MetricsServer(
+        manager.shared_metrics,
+        manager.metrics,
+        addr=args.metrics_addr,
+        port=args.metrics_port,
+    )
+    metrics_server.start()
+    return metrics_server
 
 
 def run_worker(args: WorkerArgs) -> Optional[int]:
@@ -162,6 +318,7 @@ def run_worker(args: WorkerArgs) -> Optional[int]:
     :param args: CLI arguments.
 
     :raises ValueError: if reload flag is used, but dependencies are not installed.
+    :raises ValueError: if autoscaling limits are invalid.
     :returns: Optional status code.
     """
     if platform == "darwin":
@@ -175,6 +332,10 @@ def run_worker(args: WorkerArgs) -> Optional[int]:
     logging.getLogger("taskiq").setLevel(level=logging.getLevelName(args.log_level))
     logging.getLogger("watchdog.observers.inotify_buffer").setLevel(level=logging.INFO)
     logger.info("Pid of a main process: %s", str(os.getpid()))
+    if args.max_workers is not None:
+        if not 1 <= args.min_workers <= args.max_workers:
+            raise ValueError("Number of workers must be 1 <= min <= max.")
+        args.workers = args.min_workers
     logger.info("Starting %s worker processes.", args.workers)
 
     observer = None
@@ -186,14 +347,23 @@ def run_worker(args: WorkerArgs) -> Optional[int]:
         observer = Observer()
         observer.start()
         args.workers = 1
+        args.max_workers = None
         logging.warning(
             "Reload on change enabled. Number of worker processes set to 1.",
         )
 
-    manager = ProcessManager(args=args, observer=observer, worker_function=start_listen)
+    manager = ProcessManager(
+        args=args,
+        observer=observer,
+        worker_function=get_worker_function(args),
+    )
 
+    metrics_server = start_metrics_server(args, manager)
     status = manager.start()
 
+    if metrics_server is not None:
+        metrics_server.stop()
+
     if observer is not None and observer.is_alive():
         if args.reload:
             logger.info("Stopping watching files.")
@@ -1,10 +1,11 @@
 # flake8: noqa
 from functools import lru_cache
-from typing import Any, Dict, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union
 
 import pydantic
 from importlib_metadata import version
 from packaging.version import Version, parse
+from typing_extensions import TypedDict
 
 PYDANTIC_VER = parse(version("pydantic"))
 
@@ -21,6 +22,15 @@ if IS_PYDANTIC2:
     def parse_obj_as(annot: T, obj: Any) -> T:
         return create_type_adapter(annot).validate_python(obj)
 
+    def create_params_validator(
+        fields: Dict[str, Any],
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        params_dict = TypedDict("TaskParams", fields, total=False)  # type: ignore
+        adapter: pydantic.TypeAdapter[Dict[str, Any]] = pydantic.TypeAdapter(
+            params_dict,
+        )
+        return adapter.validate_python
+
     def model_validate(
         model_class: Type[Model],
         message: Dict[str, Any],
@@ -51,6 +61,20 @@ if IS_PYDANTIC2:
 else:
     parse_obj_as = pydantic.parse_obj_as  # type: ignore
 
+    def create_params_validator(
+        fields: Dict[str, Any],
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        params_model = pydantic.create_model(  # type: ignore
+            "TaskParams",
+            **{name: (annot, None) for name, annot in fields.items()},
+        )
+
+        def validate(params: Dict[str, Any]) -> Dict[str, Any]:
+            instance = params_model.parse_obj(params)
+            return {name: getattr(instance, name) for name in params}
+
+        return validate
+
     def model_validate(
         model_class: Type[Model],
         message: Dict[str, Any],
@@ -6,6 +6,12 @@ from typing import (
     Coroutine,
     Dict,
     Generic,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
     overload,
@@ -14,8 +20,9 @@ from typing import (
 from typing_extensions import ParamSpec
 
 from taskiq.kicker import AsyncKicker
+from taskiq.labels import prepare_labels
 from taskiq.scheduler.created_schedule import CreatedSchedule
-from taskiq.task import AsyncTaskiqTask
+from taskiq.task import AsyncTaskiqTask, SyncTaskiqTask
 
 if TYPE_CHECKING:  # pragma: no cover
     from taskiq.abc.broker import AsyncBroker
@@ -26,6 +33,9 @@ _T = TypeVar("_T")
 _FuncParams = ParamSpec("_FuncParams")
 _ReturnType = TypeVar("_ReturnType")
 
+# Marks labels that are missing in the task.
+_MISSING = object()
+
 
 class AsyncTaskiqDecoratedTask(Generic[_FuncParams, _ReturnType]):
     """
@@ -54,6 +64,10 @@ class AsyncTaskiqDecoratedTask(Generic[_FuncParams, _ReturnType]):
         self.task_name = task_name
         self.original_func = original_func
         self.labels = labels
+        # Copy of labels and labels prepared from it.
+        self._prepared_labels: Optional[
+            Tuple[Dict[str, Any], Dict[str, str], Dict[str, int]]
+        ] = None
 
     # Docs for this method are omitted in order to help
     # your IDE resolve correct docs for it.
@@ -98,6 +112,55 @@ class AsyncTaskiqDecoratedTask(Generic[_FuncParams, _ReturnType]):
         """
         return await self.kicker().kiq(*args, **kwargs)
 
+    @overload
+    def kiq_sync(
+        self: "AsyncTaskiqDecoratedTask[_FuncParams, Coroutine[Any, Any, _T]]",
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> SyncTaskiqTask[_T]:
+        ...
+
+    @overload
+    def kiq_sync(
+        self: "AsyncTaskiqDecoratedTask[_FuncParams, _ReturnType]",
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> SyncTaskiqTask[_ReturnType]:
+        ...
+
+    def kiq_sync(
+        self,
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> Any:
+        """
+        Send function call from sync code.
+
+        The broker is started in a background event loop
+        on the first call and its connections are reused.
+
+        :param args: function's arguments.
+        :param kwargs: function's key word arguments.
+
+        :returns: sync taskiq task.
+        """
+        return self.kicker().kiq_sync(*args, **kwargs)
+
+    async def kiq_many(
+        self,
+        calls: Iterable[Union[Sequence[Any], Mapping[str, Any]]],
+    ) -> List[AsyncTaskiqTask[Any]]:
+        """
+        Send multiple calls of this function at once.
+
+        Mappings are passed as keyword arguments,
+        any other sequence is passed as positional arguments.
+
+        :param calls: arguments for every call.
+        :returns: list of taskiq tasks.
+        """
+        return await self.kicker().kiq_many(calls)
+
     async def schedule_by_cron(
         self,
         source: "ScheduleSource",
@@ -163,6 +226,46 @@ class AsyncTaskiqDecoratedTask(Generic[_FuncParams, _ReturnType]):
             task_name=self.task_name,
             broker=self.broker,
             labels=self.labels,
+            prepared_labels=self.prepared_labels(),
+        )
+
+    def prepared_labels(self) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Get labels of the task prepared for messages.
+
+        Labels are prepared once and prepared again only if
+        labels were added, removed or replaced with other objects.
+        In-place changes of label values, like removing an item
+        from a list, aren't noticed, so call `reset_prepared_labels`
+        after them.
+
+        :return: tuple of prepared labels and their types.
+        """
+        cached = self._prepared_labels
+        if cached is None or not self._same_labels(cached[0]):
+            cached = (dict(self.labels), *prepare_labels(self.labels))
+            self._prepared_labels = cached
+        return cached[1], cached[2]
+
+    def reset_prepared_labels(self) -> None:
+        """Prepare labels again on the next call, after their values were changed."""
+        self._prepared_labels = None
+
+    def _same_labels(self, snapshot: Dict[str, Any]) -> bool:
+        """
+        Check that labels hold the same objects as the snapshot.
+
+        Objects are compared by identity, so the check is cheap
+        and works for values that cannot be compared or copied.
+
+        :param snapshot: copy of labels.
+        :return: True if labels weren't changed.
+        """
+        labels = self.labels
+        if len(labels) != len(snapshot):
+            return False
+        return all(
+            labels.get(name, _MISSING) is value for name, value in snapshot.items()
         )
 
     def __repr__(self) -> str:
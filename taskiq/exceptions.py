@@ -6,6 +6,10 @@ class TaskiqResultTimeoutError(TaskiqError):
     """Waiting for task results has timed out."""
 
 
+class TaskTimeoutError(TaskiqError):
+    """Task has exceeded its time limit."""
+
+
 class BrokerError(TaskiqError):
     """Base class for all broker errors."""
 
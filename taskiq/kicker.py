@@ -7,7 +7,12 @@ from typing import (
     Coroutine,
     Dict,
     Generic,
+    Iterable,
+    List,
+    Mapping,
     Optional,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
     overload,
@@ -19,11 +24,12 @@ from typing_extensions import ParamSpec
 from taskiq.abc.middleware import TaskiqMiddleware
 from taskiq.compat import model_dump
 from taskiq.exceptions import SendTaskError
-from taskiq.labels import prepare_label
+from taskiq.labels import prepare_label, prepare_labels
 from taskiq.message import TaskiqMessage
 from taskiq.scheduler.created_schedule import CreatedSchedule
 from taskiq.scheduler.scheduled_task import CronSpec, ScheduledTask
-from taskiq.task import AsyncTaskiqTask
+from taskiq.task import AsyncTaskiqTask, SyncTaskiqTask
+from taskiq.tracing import TRACEPARENT_LABEL, Span, get_tracer
 from taskiq.utils import maybe_awaitable
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -34,9 +40,24 @@ _T = TypeVar("_T")
 _FuncParams = ParamSpec("_FuncParams")
 _ReturnType = TypeVar("_ReturnType")
 
+# Types of arguments that are sent as is.
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+
 logger = getLogger("taskiq")
 
 
+def _inject_span(span: Span, message: TaskiqMessage) -> None:
+    """
+    Pass context of the send span to workers in labels.
+
+    :param span: span that sends the message.
+    :param message: message to send.
+    """
+    span.set_attribute("taskiq.task_name", message.task_name)
+    span.set_attribute("taskiq.task_id", message.task_id)
+    message.labels[TRACEPARENT_LABEL] = span.context.traceparent
+
+
 class AsyncKicker(Generic[_FuncParams, _ReturnType]):
     """Class that used to modify data before sending it to broker."""
 
@@ -45,10 +66,15 @@ class AsyncKicker(Generic[_FuncParams, _ReturnType]):
         task_name: str,
         broker: "AsyncBroker",
         labels: Dict[str, Any],
+        prepared_labels: Optional[Tuple[Dict[str, str], Dict[str, int]]] = None,
     ) -> None:
         self.task_name = task_name
         self.broker = broker
         self.labels = labels
+        # Labels prepared for messages and their types.
+        # They are prepared on every call if they aren't set.
+        self.prepared_labels = prepared_labels
+        self.custom_labels: Dict[str, Any] = {}
         self.custom_task_id: Optional[str] = None
         self.custom_schedule_id: Optional[str] = None
 
@@ -62,7 +88,7 @@ class AsyncKicker(Generic[_FuncParams, _ReturnType]):
         :param labels: new labels.
         :return: kicker with new labels.
         """
-        self.labels.update(labels)
+        self.custom_labels.update(labels)
         return self
 
     def with_task_id(self, task_id: str) -> "AsyncKicker[_FuncParams, _ReturnType]":
@@ -144,24 +170,145 @@ class AsyncKicker(Generic[_FuncParams, _ReturnType]):
         logger.debug(
             f"Kicking {self.task_name} with args={args} and kwargs={kwargs}.",
         )
-        message = self._prepare_message(*args, **kwargs)
-        for middleware in self.broker.middlewares:
-            if middleware.__class__.pre_send != TaskiqMiddleware.pre_send:
-                message = await maybe_awaitable(middleware.pre_send(message))
-        try:
-            await self.broker.kick(self.broker.formatter.dumps(message))
-        except Exception as exc:
-            raise SendTaskError from exc
-
-        for middleware in self.broker.middlewares:
-            if middleware.__class__.post_send != TaskiqMiddleware.post_send:
-                await maybe_awaitable(middleware.post_send(message))
+        with get_tracer(self.broker).start_span(f"send {self.task_name}") as span:
+            message = self._prepare_message(*args, **kwargs)
+            if span is not None:
+                _inject_span(span, message)
+            for middleware in self.broker.middlewares:
+                if middleware.__class__.pre_send != TaskiqMiddleware.pre_send:
+                    message = await maybe_awaitable(middleware.pre_send(message))
+            try:
+                await self.broker.kick(self.broker.formatter.dumps(message))
+            except Exception as exc:
+                raise SendTaskError from exc
+
+            for middleware in self.broker.middlewares:
+                if middleware.__class__.post_send != TaskiqMiddleware.post_send:
+                    await maybe_awaitable(middleware.post_send(message))
 
         return AsyncTaskiqTask(
             task_id=message.task_id,
             result_backend=self.broker.result_backend,
         )
 
+    @overload
+    def kiq_sync(
+        self: "AsyncKicker[_FuncParams, Coroutine[Any, Any, _T]]",
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> SyncTaskiqTask[_T]:  # pragma: no cover
+        ...
+
+    @overload
+    def kiq_sync(
+        self: "AsyncKicker[_FuncParams, _ReturnType]",
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> SyncTaskiqTask[_ReturnType]:  # pragma: no cover
+        ...
+
+    def kiq_sync(
+        self,
+        *args: _FuncParams.args,
+        **kwargs: _FuncParams.kwargs,
+    ) -> Any:
+        """
+        Send function call from sync code.
+
+        The message is sent in the event loop of the broker's
+        sync client, which keeps connections of the broker open.
+
+        :param args: function's arguments.
+        :param kwargs: function's key word arguments.
+        :returns: sync taskiq task.
+        """
+        client = self.broker.sync_client
+        return SyncTaskiqTask(client.run(self.kiq(*args, **kwargs)), client)
+
+    async def kiq_many(
+        self,
+        calls: Iterable[Union[Sequence[Any], Mapping[str, Any]]],
+    ) -> List[AsyncTaskiqTask[Any]]:
+        """
+        Send multiple function calls over the network at once.
+
+        Every item of `calls` describes a single call.
+        Mappings are passed as keyword arguments,
+        any other sequence is passed as positional arguments.
+
+        >>> await my_task.kicker().kiq_many([(1, 2), {"a": 3, "b": 4}])
+
+        All messages are formatted first and then
+        sent with a single `kick_batch` call to the broker.
+
+        :param calls: arguments for every call.
+
+        :raises ValueError: if custom task_id was set.
+        :raises TypeError: if a call is a string or bytes.
+        :raises SendTaskError: if we can't send tasks to the broker.
+
+        :returns: list of taskiq tasks in the same order as calls.
+        """
+        if self.custom_task_id is not None:
+            raise ValueError("Custom task_id cannot be used to send multiple tasks.")
+        with get_tracer(self.broker).start_span(f"send {self.task_name}") as span:
+            messages = await self._prepare_batch(calls, span)
+            if span is not None:
+                span.set_attribute("taskiq.task_name", self.task_name)
+                span.set_attribute("taskiq.messages", len(messages))
+            logger.debug(f"Kicking {len(messages)} messages of {self.task_name}.")
+            try:
+                await self.broker.kick_batch(
+                    [self.broker.formatter.dumps(message) for message in messages],
+                )
+            except Exception as exc:
+                raise SendTaskError from exc
+
+            for message in messages:
+                for middleware in self.broker.middlewares:
+                    if middleware.__class__.post_send != TaskiqMiddleware.post_send:
+                        await maybe_awaitable(middleware.post_send(message))
+
+        return [
+            AsyncTaskiqTask(
+                task_id=message.task_id,
+                result_backend=self.broker.result_backend,
+            )
+            for message in messages
+        ]
+
+    async def _prepare_batch(
+        self,
+        calls: Iterable[Union[Sequence[Any], Mapping[str, Any]]],
+        span: Optional[Span],
+    ) -> List[TaskiqMessage]:
+        """
+        Create messages for kiq_many and run pre_send hooks.
+
+        :param calls: arguments for every call.
+        :param span: span that sends the messages.
+        :raises TypeError: if a call is a string or bytes.
+        :return: messages to send.
+        """
+        messages = []
+        for call in calls:
+            if isinstance(call, (str, bytes)):
+                raise TypeError(
+                    "Arguments of a call must be a sequence or a mapping, "
+                    f"not {type(call).__name__}.",
+                )
+            if isinstance(call, Mapping):
+                message = self._prepare_message(**call)
+            else:
+                message = self._prepare_message(*call)
+            if span is not None:
+                message.labels[TRACEPARENT_LABEL] = span.context.traceparent
+            for middleware in self.broker.middlewares:
+                if middleware.__class__.pre_send != TaskiqMiddleware.pre_send:
+                    message = await maybe_awaitable(middleware.pre_send(message))
+            messages.append(message)
+        return messages
+
     async def schedule_by_cron(
         self,
         source: "ScheduleSource",
@@ -265,16 +412,21 @@ class AsyncKicker(Generic[_FuncParams, _ReturnType]):
         :param kwargs: function's kwargs.
         :return: constructed message.
         """
-        formatted_args = []
-        formatted_kwargs = {}
-        labels = {}
-        labels_types = {}
-        for arg in args:
-            formatted_args.append(self._prepare_arg(arg))
-        for kwarg_name, kwarg_val in kwargs.items():
-            formatted_kwargs[kwarg_name] = self._prepare_arg(kwarg_val)
-
-        for label, label_val in self.labels.items():
+        formatted_args = [
+            arg if type(arg) in _PRIMITIVE_TYPES else self._prepare_arg(arg)
+            for arg in args
+        ]
+        formatted_kwargs = {
+            name: value if type(value) in _PRIMITIVE_TYPES else self._prepare_arg(value)
+            for name, value in kwargs.items()
+        }
+
+        if self.prepared_labels is None:
+            labels, labels_types = prepare_labels(self.labels)
+        else:
+            labels = self.prepared_labels[0].copy()
+            labels_types = self.prepared_labels[1].copy()
+        for label, label_val in self.custom_labels.items():
             labels[label], labels_types[label] = prepare_label(label_val)
 
         task_id = self.custom_task_id
@@ -39,6 +39,20 @@ def prepare_label(label_value: Any) -> Tuple[str, int]:
     return str(label_value), LabelType.ANY.value
 
 
+def prepare_labels(labels: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Prepare all labels for serialization.
+
+    :param labels: labels to prepare.
+    :return: tuple of prepared labels and their types.
+    """
+    prepared = {}
+    types = {}
+    for label, label_value in labels.items():
+        prepared[label], types[label] = prepare_label(label_value)
+    return prepared, types
+
+
 def parse_label(label_value: Any, label_type: Optional[int] = None) -> Any:
     """
     Parse label value from serialized format.
@@ -0,0 +1,826 @@
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+from ctypes import c_char, c_double, c_int, sizeof
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = getLogger("taskiq.metrics")
+
+MetricListener = Callable[["Gauge"], None]
+
+# Same buckets as in prometheus_client.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+    math.inf,
+)
+
+# Shared memory for encoded descriptions of metrics and series
+# per series. Long descriptions use the space that short ones don't.
+KEY_SIZE = 256
+
+
+@dataclass(frozen=True)
+class MetricInfo:
+    """Description of a metric."""
+
+    kind: str
+    name: str
+    documentation: str
+    labelnames: Tuple[str, ...] = ()
+    buckets: Tuple[float, ...] = ()
+
+    @property
+    def size(self) -> int:
+        """Number of values in every series of the metric."""
+        if self.kind == "histogram":
+            # Number of observations in every bucket and their sum.
+            return len(self.buckets) + 1
+        return 1
+
+
+# Values of metrics grouped by metric and label values.
+Families = Dict[MetricInfo, Dict[Tuple[str, ...], List[float]]]
+
+
+def add_values(
+    families: Families,
+    info: MetricInfo,
+    labelvalues: Tuple[str, ...],
+    values: Sequence[float],
+) -> None:
+    """
+    Add values of a series to families.
+
+    Values of series with the same labels are summed.
+
+    :param families: families to update.
+    :param info: description of the metric.
+    :param labelvalues: values of labels.
+    :param values: values of the series.
+    """
+    family = families.setdefault(info, {})
+    current = family.get(labelvalues)
+    if current is None:
+        family[labelvalues] = list(values)
+        return
+    for index, value in enumerate(values):
+        current[index] += value
+
+
+class Series:
+    """
+    Values of a metric with specific labels.
+
+    Values are stored in local memory or, if the registry
+    is attached to shared memory, in the slot of the process.
+
+    Counters and histograms can be updated from several threads,
+    so they are updated under the lock of the registry.
+    """
+
+    __slots__ = ("cells", "labelvalues", "lock", "offset", "size")
+
+    def __init__(self, metric: "Metric", labelvalues: Tuple[str, ...]) -> None:
+        self.labelvalues = labelvalues
+        self.size = metric.info.size
+        self.lock = metric.registry.lock
+        self.cells, self.offset = metric.registry.allocate(metric.info, labelvalues)
+
+    def values(self) -> List[float]:
+        """
+        Get current values.
+
+        :return: list of values.
+        """
+        return list(self.cells[self.offset : self.offset + self.size])
+
+    def bind(self, cells: Any, offset: int) -> None:
+        """
+        Move values to another memory.
+
+        :param cells: new memory.
+        :param offset: offset of the series in it.
+        """
+        for index, value in enumerate(self.values()):
+            cells[offset + index] = value
+        self.cells = cells
+        self.offset = offset
+
+
+class CounterSeries(Series):
+    """Values of a counter with specific labels."""
+
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the counter.
+
+        :param amount: value to add.
+        """
+        with self.lock:
+            self.cells[self.offset] += amount
+
+
+class HistogramSeries(Series):
+    """Values of a histogram with specific labels."""
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, metric: "Metric", labelvalues: Tuple[str, ...]) -> None:
+        super().__init__(metric, labelvalues)
+        self.buckets = metric.info.buckets
+
+    def observe(self, value: float) -> None:
+        """
+        Observe a value.
+
+        Only the bucket of the value is incremented,
+        buckets are accumulated when metrics are exported.
+
+        :param value: observed value.
+        """
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            cells = self.cells
+            offset = self.offset
+            cells[offset + index] += 1
+            cells[offset + len(self.buckets)] += value
+
+
+class GaugeSeries(Series):
+    """Value of a gauge with specific labels."""
+
+    __slots__ = ()
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self.cells[self.offset]
+
+    def set(self, value: float) -> None:
+        """
+        Set new value.
+
+        Setting doesn't depend on the current value,
+        so it doesn't need the lock.
+
+        :param value: new value of the gauge.
+        """
+        self.cells[self.offset] = value
+
+
+class Metric:
+    """
+    Base class of metrics.
+
+    Every combination of label values has its own series.
+    """
+
+    kind = ""
+    series_type = Series
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.info = MetricInfo(
+            kind=self.kind,
+            name=name,
+            documentation=documentation,
+            labelnames=tuple(labelnames),
+            buckets=tuple(buckets),
+        )
+        self.series: Dict[Tuple[Any, ...], Any] = {}
+
+    def labels(self, *labelvalues: Any) -> Any:
+        """
+        Get series with specific label values.
+
+        :param labelvalues: values of labels in order of label names.
+        :raises ValueError: if number of values doesn't match label names.
+        :return: series.
+        """
+        series = self.series.get(labelvalues)
+        if series is None:
+            if len(labelvalues) != len(self.info.labelnames):
+                raise ValueError(
+                    f"Metric {self.name} expects labels {self.info.labelnames}.",
+                )
+            with self.registry.lock:
+                series = self.series.get(labelvalues)
+                if series is None:
+                    series = self.series_type(
+                        self,
+                        tuple(str(value) for value in labelvalues),
+                    )
+                    self.series[labelvalues] = series
+        return series
+
+
+class Counter(Metric):
+    """Counter that only goes up."""
+
+    kind = "counter"
+    series_type = CounterSeries
+
+    def labels(self, *labelvalues: Any) -> CounterSeries:
+        """
+        Get series with specific label values.
+
+        :param labelvalues: values of labels in order of label names.
+        :return: series.
+        """
+        return super().labels(*labelvalues)
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the counter without labels.
+
+        :param amount: value to add.
+        """
+        self.labels().inc(amount)
+
+
+class Histogram(Metric):
+    """Histogram of observed values."""
+
+    kind = "histogram"
+    series_type = HistogramSeries
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        buckets = sorted(buckets)
+        if not buckets or buckets[-1] != math.inf:
+            buckets.append(math.inf)
+        super().__init__(registry, name, documentation, labelnames, buckets)
+
+    def labels(self, *labelvalues: Any) -> HistogramSeries:
+        """
+        Get series with specific label values.
+
+        :param labelvalues: values of labels in order of label names.
+        :return: series.
+        """
+        return super().labels(*labelvalues)
+
+    def observe(self, value: float) -> None:
+        """
+        Observe a value without labels.
+
+        :param value: observed value.
+        """
+        self.labels().observe(value)
+
+
+class Gauge(Metric):
+    """
+    Gauge with a value that can go up and down.
+
+    Every time the value of a gauge without labels changes,
+    listeners of the registry are notified.
+    """
+
+    kind = "gauge"
+    series_type = GaugeSeries
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        if not labelnames:
+            self.current = self.labels()
+
+    def labels(self, *labelvalues: Any) -> GaugeSeries:
+        """
+        Get series with specific label values.
+
+        :param labelvalues: values of labels in order of label names.
+        :return: series.
+        """
+        return super().labels(*labelvalues)
+
+    @property
+    def value(self) -> float:
+        """Current value of the gauge."""
+        return self.current.cells[self.current.offset]
+
+    def set(self, value: float) -> None:
+        """
+        Set new value.
+
+        :param value: new value of the gauge.
+        """
+        if value == self.value:
+            return
+        self.current.cells[self.current.offset] = value
+        for listener in self.registry.listeners:
+            try:
+                listener(self)
+            except Exception as exc:
+                logger.warning("Cannot export metric %s: %s", self.name, exc)
+
+
+class MetricsRegistry:
+    """
+    Registry of internal metrics of the process.
+
+    Taskiq components report their state here,
+    and exporters (for example PrometheusMiddleware)
+    subscribe to changes of gauges.
+
+    In worker processes the registry is attached
+    to shared memory, so the process manager can
+    aggregate metrics of all workers.
+    """
+
+    def __init__(self) -> None:
+        self.collectors: Dict[str, Metric] = {}
+        self.gauges: Dict[str, Gauge] = {}
+        self.listeners: List[MetricListener] = []
+        self.slot: Optional["MetricsSlot"] = None
+        # Guards creation of series and updates of their values.
+        self.lock = threading.Lock()
+
+    def _get_or_create(
+        self,
+        metric_type: Any,
+        name: str,
+        *args: Any,
+    ) -> Any:
+        metric = self.collectors.get(name)
+        if metric is None:
+            metric = metric_type(self, name, *args)
+            self.collectors[name] = metric
+        elif type(metric) is not metric_type:
+            raise ValueError(f"Metric {name} is already registered as {metric.kind}.")
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        """
+        Get or create a gauge.
+
+        Only gauges without labels are reported to listeners.
+
+        :param name: name of the metric.
+        :param documentation: description of the metric.
+        :param labelnames: names of labels.
+        :return: gauge.
+        """
+        gauge = self._get_or_create(Gauge, name, documentation, labelnames)
+        if not gauge.info.labelnames:
+            self.gauges[name] = gauge
+        return gauge
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> Counter:
+        """
+        Get or create a counter.
+
+        :param name: name of the metric.
+        :param documentation: description of the metric.
+        :param labelnames: names of labels.
+        :return: counter.
+        """
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Get or create a histogram.
+
+        :param name: name of the metric.
+        :param documentation: description of the metric.
+        :param labelnames: names of labels.
+        :param buckets: upper bounds of buckets.
+        :return: histogram.
+        """
+        return self._get_or_create(
+            Histogram,
+            name,
+            documentation,
+            labelnames,
+            buckets,
+        )
+
+    def add_listener(self, listener: MetricListener) -> None:
+        """
+        Subscribe to changes of gauges.
+
+        The listener is called right away for all
+        existing gauges.
+
+        :param listener: function that is called with changed gauge.
+        """
+        self.listeners.append(listener)
+        for gauge in self.gauges.values():
+            listener(gauge)
+
+    def allocate(
+        self,
+        info: MetricInfo,
+        labelvalues: Tuple[str, ...],
+    ) -> Tuple[Any, int]:
+        """
+        Allocate memory for a new series.
+
+        :param info: description of the metric.
+        :param labelvalues: values of labels.
+        :return: memory and offset of the series in it.
+        """
+        if self.slot is not None:
+            offset = self.slot.register(info, labelvalues)
+            if offset is not None:
+                return self.slot.cells, offset
+        return [0.0] * info.size, 0
+
+    def attach(self, slot: "MetricsSlot") -> None:
+        """
+        Move all metrics to shared memory.
+
+        :param slot: memory of the current process.
+        """
+        with self.lock:
+            self.slot = slot
+            for metric in self.collectors.values():
+                for series in metric.series.values():
+                    series.bind(*self.allocate(metric.info, series.labelvalues))
+
+    def families(self) -> Families:
+        """
+        Get values of all metrics.
+
+        :return: values grouped by metrics and labels.
+        """
+        families: Families = {}
+        for metric in self.collectors.values():
+            for series in metric.series.values():
+                add_values(families, metric.info, series.labelvalues, series.values())
+        return families
+
+    def collect(self) -> Dict[str, float]:
+        """
+        Get current values of gauges without labels.
+
+        :return: dict of metric names and values.
+        """
+        return {name: gauge.value for name, gauge in self.gauges.items()}
+
+
+class MetricsSlot:
+    """
+    Shared memory of one worker process.
+
+    Only the process that owns the slot writes to it.
+    Values are updated without interprocess locks.
+
+    Descriptions of metrics and series are written as records.
+    Every metric is described once, and records of its series
+    contain only the number of this description and label values,
+    so long descriptions and label values don't limit each other.
+    New records are published by incrementing the number
+    of records after they are written.
+
+    :param shared: shared memory of all workers.
+    :param index: number of the slot.
+    """
+
+    def __init__(self, shared: "SharedMetrics", index: int) -> None:
+        self.shared = shared
+        self.index = index
+        keys_size = shared.max_series * KEY_SIZE
+        self.keys: Any = (c_char * keys_size).from_buffer(
+            shared.keys,
+            index * keys_size,
+        )
+        # Start and end of the record in keys and
+        # offset of values, or -1 for descriptions of metrics.
+        self.records: Any = (c_int * (3 * shared.max_series)).from_buffer(
+            shared.records,
+            index * 3 * shared.max_series * sizeof(c_int),
+        )
+        self.cells: Any = (c_double * shared.max_cells).from_buffer(
+            shared.cells,
+            index * shared.max_cells * sizeof(c_double),
+        )
+        self.used_keys = 0
+        self.used_cells = 0
+        # Numbers of records with descriptions of metrics.
+        self.metrics: Dict[MetricInfo, int] = {}
+
+    def register(
+        self,
+        info: MetricInfo,
+        labelvalues: Tuple[str, ...],
+    ) -> Optional[int]:
+        """
+        Add a new series.
+
+        :param info: description of the metric.
+        :param labelvalues: values of labels.
+        :return: offset of the series or None if the slot is full.
+        """
+        number = self.metrics.get(info)
+        if number is None:
+            number = self._publish(
+                json.dumps(
+                    [
+                        info.kind,
+                        info.name,
+                        info.documentation,
+                        info.labelnames,
+                        info.buckets,
+                    ],
+                ).encode(),
+                -1,
+            )
+            if number is not None:
+                self.metrics[info] = number
+        offset = self.used_cells
+        if number is not None and offset + info.size <= self.shared.max_cells:
+            for index in range(info.size):
+                self.cells[offset + index] = 0
+            key = json.dumps([number, labelvalues]).encode()
+            if self._publish(key, offset) is not None:
+                self.used_cells += info.size
+                return offset
+        logger.warning(
+            "Not enough shared memory for metric %s. It won't be exported.",
+            info.name,
+        )
+        return None
+
+    def _publish(self, key: bytes, offset: int) -> Optional[int]:
+        """
+        Write a new record.
+
+        :param key: encoded description.
+        :param offset: offset of values or -1 for a description of a metric.
+        :return: number of the record or None if the slot is full.
+        """
+        count = self.shared.counts[self.index]
+        start = self.used_keys
+        end = start + len(key)
+        if count >= self.shared.max_series or end > len(self.keys):
+            return None
+        self.keys[start:end] = key
+        self.records[3 * count : 3 * count + 3] = (start, end, offset)
+        self.used_keys = end
+        self.shared.counts[self.index] = count + 1
+        return count
+
+    def entries(self) -> Iterable[Tuple[bytes, int]]:
+        """
+        Get published records.
+
+        :yield: encoded description and offset of values
+            or -1 for descriptions of metrics.
+        """
+        for number in range(self.shared.counts[self.index]):
+            start, end, offset = self.records[3 * number : 3 * number + 3]
+            yield self.keys[start:end], offset
+
+
+class SharedMetrics:
+    """
+    Metrics of all worker processes in shared memory.
+
+    Every worker claims a slot at startup and attaches
+    its registry to it. The process manager reads all slots
+    and sums values of series with the same labels.
+    Gauges are reported separately for every process
+    with `pid` label.
+
+    When a worker exits, its counters and histograms are kept,
+    so aggregated values don't go down, and its slot
+    becomes free for new workers.
+
+    :param slots: maximum number of processes with metrics.
+    :param max_series: maximum number of series and metrics in one process.
+    :param max_cells: maximum number of values in one process.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        max_series: int = 512,
+        max_cells: int = 8192,
+    ) -> None:
+        # Shared memory isn't needed until metrics are shared,
+        # so multiprocessing isn't imported with this module.
+        from multiprocessing import Lock  # noqa: PLC0415
+        from multiprocessing.sharedctypes import RawArray  # noqa: PLC0415
+
+        self.slots = slots
+        self.max_series = max_series
+        self.max_cells = max_cells
+        self.owners: Any = RawArray(c_int, slots)
+        self.counts: Any = RawArray(c_int, slots)
+        self.keys: Any = RawArray(c_char, slots * max_series * KEY_SIZE)
+        self.records: Any = RawArray(c_int, slots * 3 * max_series)
+        self.cells: Any = RawArray(c_double, slots * max_cells)
+        self.lock = Lock()
+        self.retired: Families = {}
+        self.decoded_metrics: Dict[bytes, MetricInfo] = {}
+        self.decoded_series: Dict[bytes, Tuple[int, Tuple[str, ...]]] = {}
+
+    def claim(self) -> Optional[MetricsSlot]:
+        """
+        Take a free slot for the current process.
+
+        :return: slot or None if all slots are taken.
+        """
+        with self.lock:
+            for index in range(self.slots):
+                if self.owners[index] == 0:
+                    self.counts[index] = 0
+                    self.owners[index] = os.getpid()
+                    return MetricsSlot(self, index)
+        return None
+
+    def release(self, alive_pids: Set[int]) -> None:
+        """
+        Free slots of exited processes.
+
+        :param alive_pids: pids of running workers.
+        """
+        with self.lock:
+            for index in range(self.slots):
+                owner = self.owners[index]
+                if owner == 0 or owner in alive_pids:
+                    continue
+                self._read_slot(index, self.retired, with_gauges=False)
+                self.counts[index] = 0
+                self.owners[index] = 0
+
+    def _decode_metric(self, key: bytes) -> MetricInfo:
+        info = self.decoded_metrics.get(key)
+        if info is None:
+            kind, name, documentation, labelnames, buckets = json.loads(key)
+            info = MetricInfo(
+                kind=kind,
+                name=name,
+                documentation=documentation,
+                labelnames=tuple(labelnames),
+                buckets=tuple(buckets),
+            )
+            self.decoded_metrics[key] = info
+        return info
+
+    def _decode_series(self, key: bytes) -> Tuple[int, Tuple[str, ...]]:
+        decoded = self.decoded_series.get(key)
+        if decoded is None:
+            number, labelvalues = json.loads(key)
+            decoded = (number, tuple(labelvalues))
+            self.decoded_series[key] = decoded
+        return decoded
+
+    def _read_slot(self, index: int, families: Families, with_gauges: bool) -> None:
+        slot = MetricsSlot(self, index)
+        infos: Dict[int, MetricInfo] = {}
+        for number, (key, offset) in enumerate(slot.entries()):
+            if offset < 0:
+                infos[number] = self._decode_metric(key)
+                continue
+            metric_number, labelvalues = self._decode_series(key)
+            info = infos[metric_number]
+            if info.kind == "gauge":
+                if not with_gauges:
+                    continue
+                info = MetricInfo(
+                    kind=info.kind,
+                    name=info.name,
+                    documentation=info.documentation,
+                    labelnames=(*info.labelnames, "pid"),
+                )
+                labelvalues = (*labelvalues, str(self.owners[index]))
+            add_values(
+                families,
+                info,
+                labelvalues,
+                slot.cells[offset : offset + info.size],
+            )
+
+    def collect(self) -> Families:
+        """
+        Get aggregated metrics of all workers.
+
+        :return: values grouped by metrics and labels.
+        """
+        families: Families = {}
+        with self.lock:
+            for info, family in self.retired.items():
+                for labelvalues, values in family.items():
+                    add_values(families, info, labelvalues, values)
+            for index in range(self.slots):
+                if self.owners[index] != 0:
+                    self._read_slot(index, families, with_gauges=True)
+        return families
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    labels = ",".join(
+        '{0}="{1}"'.format(
+            name,
+            values[index].replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""),
+        )
+        for index, name in enumerate(names)
+    )
+    return f"{{{labels}}}"
+
+
+def render_metrics(families: Families) -> str:
+    """
+    Render metrics in Prometheus text format.
+
+    :param families: values grouped by metrics and labels.
+    :return: text for Prometheus.
+    """
+    lines = []
+    for info in sorted(families, key=lambda info: info.name):
+        lines.append(f"# HELP {info.name} {info.documentation}")
+        lines.append(f"# TYPE {info.name} {info.kind}")
+        for labelvalues, values in sorted(families[info].items()):
+            if info.kind == "counter":
+                labels = _format_labels(info.labelnames, labelvalues)
+                lines.append(f"{info.name}_total{labels} {_format_value(values[0])}")
+            elif info.kind == "histogram":
+                names = (*info.labelnames, "le")
+                total = 0.0
+                for index, bucket in enumerate(info.buckets):
+                    total += values[index]
+                    labels = _format_labels(
+                        names,
+                        (*labelvalues, _format_value(bucket)),
+                    )
+                    lines.append(f"{info.name}_bucket{labels} {_format_value(total)}")
+                labels = _format_labels(info.labelnames, labelvalues)
+                lines.append(f"{info.name}_count{labels} {_format_value(total)}")
+                lines.append(f"{info.name}_sum{labels} {_format_value(values[-1])}")
+            else:
+                labels = _format_labels(info.labelnames, labelvalues)
+                lines.append(f"{info.name}{labels} {_format_value(values[0])}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+# Registry of the current process.
+metrics = MetricsRegistry()
@@ -0,0 +1,110 @@
+from typing import Any, Optional
+
+from taskiq.abc.middleware import TaskiqMiddleware
+from taskiq.message import TaskiqMessage
+from taskiq.metrics import MetricsRegistry, metrics
+from taskiq.result import TaskiqResult
+
+
+class MetricsMiddleware(TaskiqMiddleware):
+    """
+    Middleware that collects metrics of tasks in the built-in registry.
+
+    Worker processes write metrics to shared memory, and
+    the main process serves metrics of all workers in
+    Prometheus format on the port set by `--metrics-port`.
+    Unlike PrometheusMiddleware it doesn't require
+    `prometheus_client` and a directory for metric files.
+
+    :param registry: registry to collect metrics in.
+    """
+
+    def __init__(self, registry: MetricsRegistry = metrics) -> None:
+        super().__init__()
+        self.found_errors = registry.counter(
+            "found_errors",
+            "Number of found errors",
+            ["task_name"],
+        )
+        self.received_tasks = registry.counter(
+            "received_tasks",
+            "Number of received tasks",
+            ["task_name"],
+        )
+        self.success_tasks = registry.counter(
+            "success_tasks",
+            "Number of successfully executed tasks",
+            ["task_name"],
+        )
+        self.saved_results = registry.counter(
+            "saved_results",
+            "Number of saved results in result backend",
+            ["task_name"],
+        )
+        self.execution_time = registry.histogram(
+            "execution_time",
+            "Time of function execution",
+            ["task_name"],
+        )
+        self.slow_callbacks = registry.counter(
+            "slow_callbacks",
+            "Number of times tasks blocked the event loop",
+            ["task_name"],
+        )
+
+    def pre_execute(
+        self,
+        message: "TaskiqMessage",
+    ) -> "TaskiqMessage":
+        """
+        Count received tasks.
+
+        :param message: current message.
+        :return: message
+        """
+        self.received_tasks.labels(message.task_name).inc()
+        return message
+
+    def post_execute(
+        self,
+        message: "TaskiqMessage",
+        result: "TaskiqResult[Any]",
+    ) -> None:
+        """
+        Count errors and successful executions.
+
+        :param message: received message.
+        :param result: result of the execution.
+        """
+        if result.is_err:
+            self.found_errors.labels(message.task_name).inc()
+        else:
+            self.success_tasks.labels(message.task_name).inc()
+        self.execution_time.labels(message.task_name).observe(result.execution_time)
+
+    def post_save(
+        self,
+        message: "TaskiqMessage",
+        result: "TaskiqResult[Any]",
+    ) -> None:
+        """
+        Count saved results.
+
+        :param message: received message.
+        :param result: result of execution.
+        """
+        self.saved_results.labels(message.task_name).inc()
+
+    def on_slow_callback(
+        self,
+        message: "Optional[TaskiqMessage]",
+        duration: float,
+    ) -> None:
+        """
+        Count blocks of the event loop.
+
+        :param message: message of the blocking task, if it's known.
+        :param duration: time the loop was blocked.
+        """
+        task_name = message.task_name if message is not None else ""
+        self.slow_callbacks.labels(task_name).inc()
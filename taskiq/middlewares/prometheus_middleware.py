@@ -2,10 +2,12 @@ import os
 from logging import getLogger
 from pathlib import Path
 from tempfile import gettempdir
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from taskiq.abc.middleware import TaskiqMiddleware
 from taskiq.message import TaskiqMessage
+from taskiq.metrics import Gauge as WorkerGauge
+from taskiq.metrics import metrics
 from taskiq.result import TaskiqResult
 
 logger = getLogger("taskiq.prometheus")
@@ -44,7 +46,7 @@ class PrometheusMiddleware(TaskiqMiddleware):
         logger.debug("Initializing metrics")
 
         try:
-            from prometheus_client import Counter, Histogram
+            from prometheus_client import Counter, Gauge, Histogram
         except ImportError as exc:
             raise ImportError(
                 "Cannot initialize metrics. Please install 'taskiq[metrics]'.",
@@ -75,6 +77,8 @@ class PrometheusMiddleware(TaskiqMiddleware):
             "Time of function execution",
             ["task_name"],
         )
+        self.gauge_type = Gauge
+        self.worker_gauges: Dict[str, Any] = {}
         self.server_port = server_port
         self.server_addr = server_addr
 
@@ -92,6 +96,23 @@ class PrometheusMiddleware(TaskiqMiddleware):
                 start_http_server(port=self.server_port, addr=self.server_addr)
             except OSError as exc:
                 logger.debug("Cannot start prometheus server: %s", exc)
+            metrics.add_listener(self.export_gauge)
+
+    def export_gauge(self, gauge: WorkerGauge) -> None:
+        """
+        Export internal metric of the worker.
+
+        Values are reported separately for every worker process.
+
+        :param gauge: changed metric.
+        """
+        if gauge.name not in self.worker_gauges:
+            self.worker_gauges[gauge.name] = self.gauge_type(
+                gauge.name,
+                gauge.documentation,
+                multiprocess_mode="liveall",
+            )
+        self.worker_gauges[gauge.name].set(gauge.value)
 
     def pre_execute(
         self,
@@ -0,0 +1,133 @@
+import asyncio
+from logging import getLogger
+from typing import Any, Awaitable, Callable, List, Optional, Set
+
+from taskiq.acks import AckableMessage
+
+logger = getLogger(__name__)
+
+
+class AckBatcher:
+    """
+    Collects acknowledgements and sends them in batches.
+
+    Acks are flushed when the number of pending acks
+    reaches `batch_size` or when `flush_interval` seconds
+    have passed since the first pending ack was added.
+
+    If a flush fails, its messages are returned to the batch
+    and retried with the next flush. After `max_retries` failed
+    flushes in a row the messages are dropped and the error is raised.
+
+    :param flush: function that acknowledges a list of messages.
+    :param batch_size: maximum number of pending acks.
+    :param flush_interval: maximum time in seconds an ack can be pending.
+    :param max_retries: number of retries of a failed flush.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[AckableMessage]], Awaitable[None]],
+        batch_size: int,
+        flush_interval: float,
+        max_retries: int = 3,
+    ) -> None:
+        self._flush = flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.pending: List[AckableMessage] = []
+        self.failures = 0
+        self.closed = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: "Set[asyncio.Task[Any]]" = set()
+
+    async def ack(self, message: AckableMessage) -> None:
+        """
+        Add message to the batch.
+
+        If the batch is full, it's flushed immediately.
+        After the batcher is closed, messages are acknowledged
+        without batching.
+
+        :param message: message to acknowledge.
+        """
+        if self.closed:
+            await self._flush([message])
+            return
+        self.pending.append(message)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._start_timer()
+
+    async def flush(self) -> None:
+        """
+        Acknowledge all pending messages.
+
+        :raises Exception: if messages cannot be acknowledged
+            after all retries.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return
+        messages, self.pending = self.pending, []
+        logger.debug("Flushing %d acks.", len(messages))
+        try:
+            await self._flush(messages)
+        except Exception:
+            self.failures += 1
+            if self.closed or self.failures > self.max_retries:
+                self.failures = 0
+                logger.error(
+                    "Cannot acknowledge %d messages. They will be redelivered.",
+                    len(messages),
+                )
+                raise
+            logger.warning(
+                "Cannot acknowledge %d messages. Retrying.",
+                len(messages),
+                exc_info=True,
+            )
+            self.pending[:0] = messages
+            self._start_timer()
+        else:
+            self.failures = 0
+
+    async def close(self) -> None:
+        """
+        Flush all pending acks and wait for scheduled flushes.
+
+        :raises Exception: if pending messages cannot be acknowledged.
+        """
+        if self._flush_tasks:
+            await asyncio.wait(self._flush_tasks)
+        self.closed = True
+        await self.flush()
+
+    def _start_timer(self) -> None:
+        """Flush acks when the time window is over."""
+        self._timer = asyncio.get_running_loop().call_later(
+            self.flush_interval,
+            self._on_timer,
+        )
+
+    def _on_timer(self) -> None:
+        """Start flush of pending acks."""
+        self._timer = None
+        task = asyncio.create_task(self._flush_pending())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_pending(self) -> None:
+        """Flush acks in the background and log errors."""
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.exception(
+                "Cannot acknowledge messages. Cause: %s",
+                exc,
+                exc_info=True,
+            )
@@ -0,0 +1,133 @@
+import asyncio
+import math
+from typing import Optional
+
+from taskiq.metrics import metrics
+
+
+class ResizableSemaphore(asyncio.Semaphore):
+    """
+    Semaphore which size can be changed at runtime.
+
+    When the semaphore grows, new permits are released right away.
+    When it shrinks, extra permits are absorbed
+    as soon as they are released by their holders.
+    """
+
+    def __init__(self, value: int = 1) -> None:
+        super().__init__(value)
+        self.size = value
+        self._absorb = 0
+
+    def resize(self, size: int) -> None:
+        """
+        Change number of permits.
+
+        :param size: new number of permits.
+        """
+        diff = size - self.size
+        self.size = size
+        if diff < 0:
+            self._absorb -= diff
+            return
+        # Cancel pending shrinks first.
+        cancelled = min(diff, self._absorb)
+        self._absorb -= cancelled
+        for _ in range(diff - cancelled):
+            super().release()
+
+    def release(self) -> None:
+        """Release a permit, unless it must be absorbed."""
+        if self._absorb > 0:
+            self._absorb -= 1
+            return
+        super().release()
+
+
+class AdaptivePrefetch:
+    """
+    Controller of the prefetch window.
+
+    The window is sized to cover broker's fetch latency:
+    while the next message is being fetched, busy execution slots
+    complete `fetch_latency * slots / execution_time` tasks,
+    so this many messages should be waiting in the queue.
+    Free execution slots don't need prefetched messages,
+    because they take new messages right away.
+
+    Latencies are smoothed with exponential moving average.
+
+    :param semaphore: semaphore that limits prefetching.
+    :param min_size: minimal size of the window.
+    :param max_size: maximal size of the window.
+    :param max_async_tasks: number of execution slots.
+    :param smoothing: weight of new observations.
+    """
+
+    def __init__(
+        self,
+        semaphore: ResizableSemaphore,
+        min_size: int,
+        max_size: int,
+        max_async_tasks: Optional[int] = None,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.semaphore = semaphore
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.max_async_tasks = max_async_tasks
+        self.smoothing = smoothing
+        self.fetch_latency: Optional[float] = None
+        self.execution_time: Optional[float] = None
+        self.window_gauge = metrics.gauge(
+            "prefetch_window",
+            "Current size of the prefetch window",
+        )
+        self.window_gauge.set(semaphore.size)
+
+    @property
+    def window(self) -> int:
+        """
+        Current size of the window.
+
+        :return: number of messages that can be prefetched.
+        """
+        return self.semaphore.size
+
+    def _smooth(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return current + self.smoothing * (value - current)
+
+    def observe_fetch(self, seconds: float) -> None:
+        """
+        Record time spent to get a message from the broker.
+
+        :param seconds: fetch latency.
+        """
+        self.fetch_latency = self._smooth(self.fetch_latency, seconds)
+
+    def observe_execution(self, seconds: float) -> None:
+        """
+        Record time spent to process a message.
+
+        :param seconds: processing time.
+        """
+        self.execution_time = self._smooth(self.execution_time, seconds)
+
+    def adjust(self, running: int) -> None:
+        """
+        Resize the window using current measurements.
+
+        :param running: number of currently running tasks.
+        """
+        if self.fetch_latency is None or self.execution_time is None:
+            return
+        slots = self.max_async_tasks or max(running, 1)
+        needed = self.fetch_latency * slots / max(self.execution_time, 1e-6)
+        free_slots = max(slots - running, 0)
+        size = math.ceil(needed) - free_slots
+        size = min(max(size, self.min_size), self.max_size)
+        if size != self.semaphore.size:
+            self.semaphore.resize(size)
+            self.window_gauge.set(size)
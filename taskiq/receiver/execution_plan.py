@@ -0,0 +1,123 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
+
+from taskiq_dependencies import DependencyGraph
+
+from taskiq.abc.middleware import TaskiqMiddleware
+from taskiq.receiver.params_parser import ParamsValidator
+
+MiddlewareHook = Callable[..., Any]
+
+
+def uses_process_pool(labels: Dict[str, Any]) -> bool:
+    """
+    Check whether task should be executed in the process pool.
+
+    :param labels: task's labels.
+    :return: True if `process_pool` label is set to true.
+    """
+    return str(labels.get("process_pool", False)).lower() == "true"
+
+
+def _resolve_hooks(
+    middlewares: List[TaskiqMiddleware],
+    hook_name: str,
+) -> Tuple[MiddlewareHook, ...]:
+    """
+    Get bound hooks of middlewares that override the hook.
+
+    :param middlewares: broker's middlewares.
+    :param hook_name: name of a hook.
+    :return: tuple of bound hooks in middlewares order.
+    """
+    base_hook = getattr(TaskiqMiddleware, hook_name)
+    return tuple(
+        getattr(middleware, hook_name)
+        for middleware in middlewares
+        if getattr(middleware.__class__, hook_name) != base_hook
+    )
+
+
+@dataclass(frozen=True)
+class TaskExecutionPlan:
+    """
+    Everything the receiver needs to know to execute a task.
+
+    This object is built once per task, so none of these values
+    are computed again for every incoming message.
+    """
+
+    signature: inspect.Signature
+    type_hints: Dict[str, Any]
+    # None if parameters shouldn't be parsed.
+    params_validator: Optional[ParamsValidator]
+    dependency_graph: DependencyGraph
+    # If it's false, dependency resolution can be skipped.
+    has_dependencies: bool
+    is_coroutine: bool
+    # Sync tasks that are executed in the process pool.
+    use_process_pool: bool
+    # Timeout from task's labels. Message labels take precedence.
+    # For sync tasks in threads it's a soft limit, see `SyncCall`.
+    timeout: Optional[float]
+    # Maximum number of simultaneously running messages of this task.
+    concurrency: Optional[int]
+    # Name of the executor for sync tasks. Message labels take precedence.
+    executor: Optional[str]
+    pre_execute: Tuple[MiddlewareHook, ...]
+    post_execute: Tuple[MiddlewareHook, ...]
+    post_save: Tuple[MiddlewareHook, ...]
+    on_error: Tuple[MiddlewareHook, ...]
+    # Used to find out that middlewares were added after the plan was built.
+    middlewares_count: int
+
+    @classmethod
+    def build(
+        cls,
+        handler: Callable[..., Any],
+        middlewares: List[TaskiqMiddleware],
+        labels: Optional[Dict[str, Any]] = None,
+        validate_params: bool = True,
+        process_pool: bool = False,
+    ) -> "TaskExecutionPlan":
+        """
+        Build execution plan for a task.
+
+        :param handler: task's function.
+        :param middlewares: broker's middlewares.
+        :param labels: task's labels.
+        :param validate_params: whether to build validator for parameters.
+        :param process_pool: execute sync task in the process pool
+            even if it doesn't have the `process_pool` label.
+        :return: new execution plan.
+        """
+        signature = inspect.signature(handler)
+        type_hints = get_type_hints(handler)
+        dependency_graph = DependencyGraph(handler)
+        labels = labels or {}
+        timeout = labels.get("timeout")
+        concurrency = labels.get("concurrency")
+        executor = labels.get("executor")
+        is_coroutine = asyncio.iscoroutinefunction(handler)
+        return cls(
+            signature=signature,
+            type_hints=type_hints,
+            params_validator=(
+                ParamsValidator(signature, type_hints) if validate_params else None
+            ),
+            dependency_graph=dependency_graph,
+            has_dependencies=bool(dependency_graph.dependencies),
+            is_coroutine=is_coroutine,
+            use_process_pool=not is_coroutine
+            and (process_pool or uses_process_pool(labels)),
+            timeout=float(timeout) if timeout is not None else None,
+            concurrency=int(concurrency) if concurrency is not None else None,
+            executor=str(executor) if executor is not None else None,
+            pre_execute=_resolve_hooks(middlewares, "pre_execute"),
+            post_execute=_resolve_hooks(middlewares, "post_execute"),
+            post_save=_resolve_hooks(middlewares, "post_save"),
+            on_error=_resolve_hooks(middlewares, "on_error"),
+            middlewares_count=len(middlewares),
+        )
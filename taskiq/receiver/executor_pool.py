@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Optional
+
+from taskiq.metrics import MetricsRegistry, metrics
+
+
+class ExecutorPool:
+    """
+    Named executor for sync tasks with utilization metrics.
+
+    Tasks choose their pool with the `executor` label,
+    so slow blocking tasks don't take threads of quick ones.
+
+    :param name: name of the pool.
+    :param executor: executor of the pool.
+    :param size: number of threads, if known.
+    :param registry: registry to report metrics to.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        executor: Executor,
+        size: Optional[int] = None,
+        registry: MetricsRegistry = metrics,
+    ) -> None:
+        self.name = name
+        self.executor = executor
+        self.lock = threading.Lock()
+        self.busy = 0
+        self.queued = 0
+        self.busy_gauge = registry.gauge(
+            "executor_busy_threads",
+            "Number of threads of the executor that execute tasks",
+            ["executor"],
+        ).labels(name)
+        self.queued_gauge = registry.gauge(
+            "executor_queued_tasks",
+            "Number of tasks waiting for a thread of the executor",
+            ["executor"],
+        ).labels(name)
+        if size is not None:
+            registry.gauge(
+                "executor_threads",
+                "Number of threads of the executor",
+                ["executor"],
+            ).labels(name).set(size)
+
+    def _update(self, busy: int = 0, queued: int = 0) -> None:
+        with self.lock:
+            self.busy += busy
+            self.queued += queued
+            self.busy_gauge.set(self.busy)
+            self.queued_gauge.set(self.queued)
+
+    def _run(self, func: Callable[[], Any]) -> Any:
+        self._update(busy=1, queued=-1)
+        try:
+            return func()
+        finally:
+            self._update(busy=-1)
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        # Cancelled functions never start.
+        if future.cancelled():
+            self._update(queued=-1)
+
+    def submit(self, func: Callable[[], Any]) -> "Future[Any]":
+        """
+        Execute function in the pool.
+
+        :param func: function without arguments.
+        :return: future of the result.
+        """
+        self._update(queued=1)
+        future = self.executor.submit(self._run, func)
+        future.add_done_callback(self._on_done)
+        return future
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from taskiq.message import TaskiqMessage
+from taskiq.metrics import MetricsRegistry, metrics
+from taskiq.utils import maybe_awaitable
+
+logger = getLogger(__name__)
+
+BlockCallback = Callable[
+    [Optional[TaskiqMessage], float],
+    Optional[Awaitable[None]],
+]
+
+
+class LoopMonitor:
+    """
+    Measures lag of the event loop and finds tasks that block it.
+
+    The monitor wakes up every `interval` seconds, and delays
+    of its wakeups are recorded in the `event_loop_lag` histogram.
+    A watchdog thread remembers the message of the task running while
+    the loop is blocked longer than `threshold`. When the loop
+    is unblocked, the block is logged and passed to `on_block`.
+
+    :param threshold: lag in seconds that is reported.
+    :param on_block: callback that receives the message of the blocking task
+        and the lag.
+    :param interval: time between wakeups in seconds.
+    :param registry: registry to report metrics to.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        on_block: Optional[BlockCallback] = None,
+        interval: float = 0.1,
+        registry: MetricsRegistry = metrics,
+    ) -> None:
+        self.threshold = threshold
+        self.on_block = on_block
+        self.interval = interval
+        self.lag = registry.histogram(
+            "event_loop_lag",
+            "Delay of callbacks scheduled in the event loop",
+        ).labels()
+        self.messages: "Dict[asyncio.Task[Any], TaskiqMessage]" = {}
+        self.deadline = time.monotonic()
+        # Maximum lag since it was taken by `take_max_lag`.
+        self.max_lag = 0.0
+        # Set by the watchdog while the loop is blocked.
+        self.culprit: Optional[TaskiqMessage] = None
+        self.stopped = threading.Event()
+
+    def track(self, message: TaskiqMessage) -> None:
+        """
+        Remember the message of the current task.
+
+        :param message: message that is executed by the task.
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            self.messages[task] = message
+            task.add_done_callback(self._untrack)
+
+    def _untrack(self, task: "asyncio.Task[Any]") -> None:
+        self.messages.pop(task, None)
+
+    def take_max_lag(self) -> float:
+        """
+        Get maximum lag since the previous call.
+
+        This is used by other components that report the lag,
+        so the loop isn't sampled twice.
+
+        :return: maximum lag in seconds.
+        """
+        lag, self.max_lag = self.max_lag, 0.0
+        return lag
+
+    def _watch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Find the task that blocks the loop.
+
+        The loop is checked twice per threshold, so every block
+        longer than the threshold is seen at least once. The message
+        is taken right away, because the task can finish before
+        the loop is unblocked.
+
+        :param loop: monitored event loop.
+        """
+        while not self.stopped.wait(self.threshold / 2):
+            if time.monotonic() - self.deadline >= self.threshold / 2:
+                task = asyncio.current_task(loop)
+                self.culprit = self.messages.get(task) if task is not None else None
+
+    async def report(self, lag: float) -> None:
+        """
+        Report the block of the loop.
+
+        :param lag: delay of the monitor's wakeup.
+        """
+        message, self.culprit = self.culprit, None
+        if message is not None:
+            logger.warning(
+                "Event loop was blocked for %.3f seconds by task %s with ID: %s",
+                lag,
+                message.task_name,
+                message.task_id,
+            )
+        else:
+            logger.warning("Event loop was blocked for %.3f seconds", lag)
+        if self.on_block is not None:
+            try:
+                await maybe_awaitable(self.on_block(message, lag))
+            except Exception:
+                logger.exception("Cannot report blocked event loop.")
+
+    async def run(self) -> None:
+        """Measure lag until cancelled."""
+        watchdog = threading.Thread(
+            target=self._watch,
+            args=(asyncio.get_running_loop(),),
+            name="taskiq-loop-monitor",
+            daemon=True,
+        )
+        self.stopped.clear()
+        watchdog.start()
+        try:
+            while True:
+                self.deadline = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                lag = max(time.monotonic() - self.deadline, 0)
+                self.lag.observe(lag)
+                self.max_lag = max(self.max_lag, lag)
+                if lag >= self.threshold:
+                    await self.report(lag)
+                else:
+                    self.culprit = None
+        finally:
+            self.stopped.set()
@@ -1,12 +1,137 @@
 import inspect
 from logging import getLogger
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from taskiq.compat import parse_obj_as
+from taskiq.compat import create_params_validator, parse_obj_as
 from taskiq.message import TaskiqMessage
 
 logger = getLogger(__name__)
 
+_POSITIONAL_KINDS = (
+    inspect.Parameter.POSITIONAL_ONLY,
+    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+)
+_VARIADIC_KINDS = (
+    inspect.Parameter.VAR_POSITIONAL,
+    inspect.Parameter.VAR_KEYWORD,
+)
+
+
+def _compile_validator(
+    fields: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Build a single validator for all fields.
+
+    If some of the annotations are not supported by pydantic,
+    (for example classes used in dependencies),
+    these fields are excluded from the validator.
+
+    :param fields: mapping of parameter names to their annotations.
+    :return: supported fields and a validator for them.
+    """
+    try:
+        return fields, create_params_validator(fields)
+    except Exception:
+        logger.debug("Cannot build validator for all parameters.", exc_info=True)
+    supported = {}
+    for name, annot in fields.items():
+        try:
+            create_params_validator({name: annot})
+        except Exception as exc:
+            logger.debug("Parameter %s won't be parsed. Cause: %s", name, exc)
+            continue
+        supported[name] = annot
+    return supported, create_params_validator(supported)
+
+
+class ParamsValidator:
+    """
+    Validator of task's parameters.
+
+    It's built once per task and validates all
+    parameters of an incoming message with a single call.
+
+    By default it's lenient, like `parse_params`. If some
+    parameters cannot be parsed, the values of these parameters
+    are left as is. In strict mode validation errors are raised.
+
+    :param signature: original function's signature.
+    :param type_hints: function's type hints.
+    """
+
+    def __init__(
+        self,
+        signature: inspect.Signature,
+        type_hints: Dict[str, Any],
+    ) -> None:
+        fields = {}
+        positional = []
+        for index, param in enumerate(signature.parameters.values()):
+            if param.kind in _VARIADIC_KINDS:
+                continue
+            annot = type_hints.get(param.name)
+            if annot is None:
+                continue
+            fields[param.name] = annot
+            if param.kind in _POSITIONAL_KINDS:
+                positional.append((index, param.name))
+        self.fields, self._validate_all = _compile_validator(fields)
+        self.positional: List[Tuple[int, str]] = [
+            (index, name) for index, name in positional if name in self.fields
+        ]
+
+    def validate(self, message: TaskiqMessage, strict: bool = False) -> None:
+        """
+        Parse parameters of the message in place.
+
+        None values are never parsed.
+
+        :param message: incoming message.
+        :param strict: raise an error if parameters are invalid.
+        """
+        params: Dict[str, Any] = {}
+        from_args: List[Tuple[int, str]] = []
+        for index, name in self.positional:
+            if index >= len(message.args):
+                break
+            value = message.args[index]
+            if value is not None:
+                params[name] = value
+                from_args.append((index, name))
+        for name, value in message.kwargs.items():
+            if value is not None and name in self.fields:
+                params[name] = value
+        if not params:
+            return
+        try:
+            validated = self._validate_all(params)
+        except ValueError:
+            if strict:
+                raise
+            validated = self._validate_each(params)
+        for index, name in from_args:
+            message.args[index] = validated.pop(name)
+        message.kwargs.update(validated)
+
+    def _validate_each(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse parameters one by one.
+
+        Values that cannot be parsed are returned as is.
+
+        :param params: parameters to parse.
+        :return: parsed parameters.
+        """
+        validated = {}
+        for name, value in params.items():
+            try:
+                validated[name] = parse_obj_as(self.fields[name], value)
+            except (ValueError, RuntimeError) as exc:
+                logger.debug(exc, exc_info=True)
+                validated[name] = value
+        return validated
+
 
 def parse_params(
     signature: Optional[inspect.Signature],
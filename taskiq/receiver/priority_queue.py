@@ -0,0 +1,75 @@
+import asyncio
+import heapq
+import math
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from taskiq.acks import AckableMessage
+from taskiq.message import TaskiqMessage
+
+
+@dataclass
+class PrioritizedMessage:
+    """
+    Prefetched message with its priority.
+
+    Message is decoded once to get its priority,
+    and the decoded message is passed to the callback.
+    """
+
+    message: Union[bytes, AckableMessage]
+    priority: float
+    taskiq_msg: Optional[TaskiqMessage] = None
+
+
+class PriorityPrefetchQueue(asyncio.Queue):  # type: ignore[type-arg]
+    """
+    Queue of prefetched messages ordered by priority.
+
+    Messages with higher priority are returned first.
+    Messages with equal priorities are returned in FIFO order.
+    Messages with negative priority are returned
+    after messages with priority 0.
+
+    To prevent starvation of low-priority messages, every message
+    can be overtaken by at most `starvation_limit` newer messages,
+    no matter how high their priorities are.
+
+    Messages with priority of negative infinity are
+    returned after all other messages. Other priorities
+    that aren't finite numbers are treated as 0.
+
+    :param get_priority: function that returns priority of a message.
+    :param starvation_limit: maximum number of newer messages
+        that can be returned before a message.
+    """
+
+    def __init__(
+        self,
+        get_priority: Callable[[Any], float],
+        starvation_limit: int = 1000,
+    ) -> None:
+        self.get_priority = get_priority
+        self.starvation_limit = starvation_limit
+        self._counter = count()
+        super().__init__()
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: List[Tuple[float, int, Any]] = []
+
+    def _put(self, item: Any) -> None:
+        seq = next(self._counter)
+        priority = self.get_priority(item)
+        key: float = seq
+        if priority == -math.inf:
+            key = math.inf
+        elif priority and math.isfinite(priority):
+            # The shift grows with priority, but never exceeds
+            # the starvation limit, so every message is
+            # eventually returned.
+            key -= self.starvation_limit * priority / (abs(priority) + 1)
+        heapq.heappush(self._queue, (key, seq, item))
+
+    def _get(self) -> Any:
+        return heapq.heappop(self._queue)[2]
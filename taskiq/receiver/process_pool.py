@@ -0,0 +1,543 @@
+import multiprocessing
+import os
+import pickle
+import signal
+import struct
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from multiprocessing.connection import Connection, wait
+from threading import Lock, Thread
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from taskiq.abc.broker import AsyncBroker
+from taskiq.cli.utils import import_object, import_tasks
+from taskiq.exceptions import TaskiqError, TaskTimeoutError
+
+logger = getLogger(__name__)
+
+# Protocol 5 supports out-of-band buffers. Buffers of objects
+# that support them, like numpy arrays, are sent to processes
+# of the pool as separate messages, without copying them into
+# the pickle. Bytes and other objects are pickled in-band.
+PICKLE_PROTOCOL = 5
+
+# Serializes changes of the daemon flag of the current process.
+_daemon_lock = Lock()
+
+# Broker that was imported in the current process pool worker.
+_process_broker: Optional[AsyncBroker] = None
+
+
+def init_process_worker(
+    broker_path: str,
+    modules: List[str],
+    tasks_pattern: Union[str, Sequence[str]],
+    fs_discover: bool,
+) -> None:
+    """
+    Initialize process pool worker.
+
+    This function is called once in every child process.
+    It imports broker and all tasks, so they are ready
+    before the first task is sent to the process.
+
+    :param broker_path: path to the broker in `module:variable` format.
+    :param modules: list of modules with tasks.
+    :param tasks_pattern: pattern of task files if fs_discover is True.
+    :param fs_discover: whether to search for task files in filesystem.
+    """
+    global _process_broker  # noqa: PLW0603
+    broker = import_object(broker_path)
+    broker.is_worker_process = True
+    import_tasks(list(modules), tasks_pattern, fs_discover)
+    _process_broker = broker
+
+
+def run_in_process(
+    task_name: str,
+    args: List[Any],
+    kwargs: Dict[str, Any],
+) -> Any:
+    """
+    Execute task in the process pool worker.
+
+    :param task_name: name of a task to execute.
+    :param args: task's args.
+    :param kwargs: task's kwargs.
+    :raises TaskiqError: if the task cannot be found.
+    :return: returned value.
+    """
+    task = None
+    if _process_broker is not None:
+        task = _process_broker.find_task(task_name)
+    if task is None:
+        raise TaskiqError(f"Task {task_name} is not found in the process pool.")
+    return task.original_func(*args, **kwargs)
+
+
+def send_object(conn: Connection, obj: Any) -> None:
+    """
+    Send object with out-of-band buffers.
+
+    The object is pickled with protocol 5 and its out-of-band
+    buffers are sent after it without copying.
+
+    :param conn: connection to send the object to.
+    :param obj: object to send.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append)
+    conn.send_bytes(struct.pack("!I", len(buffers)))
+    conn.send_bytes(data)
+    for buffer in buffers:
+        conn.send_bytes(buffer.raw())
+
+
+def recv_object(conn: Connection) -> Any:
+    """
+    Receive object sent by `send_object`.
+
+    :param conn: connection to receive the object from.
+    :return: received object.
+    """
+    (count,) = struct.unpack("!I", conn.recv_bytes())
+    data = conn.recv_bytes()
+    buffers = [conn.recv_bytes() for _ in range(count)]
+    return pickle.loads(data, buffers=buffers)  # noqa: S301
+
+
+@contextmanager
+def _allow_children() -> Iterator[None]:
+    """
+    Allow the current process to start child processes.
+
+    Workers are started as daemons, and daemonic processes
+    cannot have children. The flag is changed only while
+    processes of the pool are started and restored after that.
+    Processes of the pool are daemons themselves, so they
+    are still terminated with the worker.
+    """
+    with _daemon_lock:
+        current = multiprocessing.current_process()
+        daemon = current.daemon
+        current.daemon = False
+        try:
+            yield
+        finally:
+            current.daemon = daemon
+
+
+def _worker_ready() -> int:
+    """
+    Function used to start child processes in advance.
+
+    :return: pid of the child process.
+    """
+    return os.getpid()
+
+
+def _raise_soft_timeout(signum: int, _frame: Any) -> None:
+    """
+    Signal handler for soft time limits.
+
+    :param signum: received signal number.
+    :param _frame: current execution frame.
+    :raises TaskTimeoutError: always.
+    """
+    raise TaskTimeoutError("Task has exceeded its soft time limit.")
+
+
+def _pool_process_main(
+    conn: Connection,
+    initializer: Optional[Callable[..., None]],
+    initargs: Tuple[Any, ...],
+) -> None:
+    """
+    Main function of a process in KillableProcessPool.
+
+    It executes functions received from the pool one by one,
+    until it receives None. Soft time limit is implemented
+    with a timer that raises TaskTimeoutError in the function.
+
+    :param conn: connection to the pool.
+    :param initializer: function to call at startup.
+    :param initargs: arguments of the initializer.
+    """
+    # Process is stopped by the pool, not by signals from the terminal.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    use_timer = hasattr(signal, "setitimer")
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_soft_timeout)
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            job = recv_object(conn)
+        except EOFError:
+            return
+        if job is None:
+            return
+        func, args, kwargs, timeout = job
+        try:
+            if timeout is not None and use_timer:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                result = (True, func(*args, **kwargs))
+            finally:
+                if timeout is not None and use_timer:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except BaseException as exc:
+            result = (False, exc)
+        try:
+            send_object(conn, result)
+        except Exception as exc:
+            send_object(
+                conn,
+                (False, TaskiqError(f"Cannot send result to the pool: {exc}")),
+            )
+
+
+@dataclass
+class _Job:
+    """Function submitted to the pool."""
+
+    future: "Future[Any]"
+    func: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    timeout: Optional[float]
+
+
+class _PoolProcess:
+    """Process of KillableProcessPool with its current job."""
+
+    def __init__(
+        self,
+        initializer: Optional[Callable[..., None]],
+        initargs: Tuple[Any, ...],
+    ) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_pool_process_main,
+            args=(child_conn, initializer, initargs),
+            daemon=True,
+        )
+        with _allow_children():
+            self.process.start()
+        child_conn.close()
+        self.job: Optional[_Job] = None
+        self.deadline: Optional[float] = None
+
+    def stop(self) -> None:
+        """Ask the process to exit and wait for it."""
+        try:
+            send_object(self.conn, None)
+        except OSError:
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class KillableProcessPool(Executor):
+    """
+    Process pool that can kill processes with stuck tasks.
+
+    Every process executes one function at a time.
+    Functions submitted with a timeout have two limits.
+    At the soft limit TaskTimeoutError is raised in the function,
+    so it can clean up. If the function is still running
+    `hard_timeout_grace` seconds later, its process is killed
+    and replaced with a new one. Other processes aren't affected,
+    unlike in ProcessPoolExecutor, which breaks
+    if one of its processes dies.
+
+    :param max_workers: number of processes.
+    :param initializer: function to call in every new process.
+    :param initargs: arguments of the initializer.
+    :param hard_timeout_grace: time between soft and hard limits.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        hard_timeout_grace: float = 5,
+    ) -> None:
+        self.initializer = initializer
+        self.initargs = initargs
+        self.hard_timeout_grace = hard_timeout_grace
+        self.pending: Deque[_Job] = deque()
+        self.lock = Lock()
+        self.shutting_down = False
+        # The pool thread is woken up by writes to this pipe.
+        self.wakeup_reader, self.wakeup_writer = multiprocessing.Pipe(duplex=False)
+        self.woken_up = False
+        self.processes = [
+            _PoolProcess(initializer, initargs) for _ in range(max_workers)
+        ]
+        self.thread = Thread(target=self._manage, daemon=True)
+        self.thread.start()
+
+    def submit(  # type: ignore[override]
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> "Future[Any]":
+        """
+        Submit a function without time limits.
+
+        :param fn: function to execute.
+        :param args: function's args.
+        :param kwargs: function's kwargs.
+        :return: future of the result.
+        """
+        return self.submit_with_timeout(None, fn, *args, **kwargs)
+
+    def submit_with_timeout(
+        self,
+        timeout: Optional[float],
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> "Future[Any]":
+        """
+        Submit a function with time limits.
+
+        :param timeout: soft time limit in seconds.
+        :param fn: function to execute.
+        :param args: function's args.
+        :param kwargs: function's kwargs.
+        :raises RuntimeError: if the pool is shut down.
+        :return: future of the result.
+        """
+        future: "Future[Any]" = Future()
+        with self.lock:
+            if self.shutting_down:
+                raise RuntimeError("Cannot schedule new futures after shutdown.")
+            self.pending.append(_Job(future, fn, args, kwargs, timeout))
+        self._wakeup()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop all processes after pending functions are executed.
+
+        :param wait: wait until processes exit.
+        :param cancel_futures: cancel functions that haven't started.
+        """
+        with self.lock:
+            self.shutting_down = True
+            if cancel_futures:
+                while self.pending:
+                    self.pending.popleft().future.cancel()
+        self._wakeup()
+        if wait:
+            self.thread.join()
+
+    def _wakeup(self) -> None:
+        with self.lock:
+            if self.woken_up:
+                return
+            self.woken_up = True
+            self.wakeup_writer.send_bytes(b"")
+
+    def _assign_jobs(self) -> None:
+        """Send pending functions to idle processes."""
+        idle = [
+            proc
+            for proc in self.processes
+            if proc.job is None and proc.process.is_alive()
+        ]
+        while idle:
+            with self.lock:
+                if not self.pending:
+                    return
+                job = self.pending.popleft()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            proc = idle.pop()
+            try:
+                send_object(proc.conn, (job.func, job.args, job.kwargs, job.timeout))
+            except Exception as exc:
+                job.future.set_exception(exc)
+                idle.append(proc)
+                continue
+            proc.job = job
+            proc.deadline = None
+            if job.timeout is not None:
+                proc.deadline = monotonic() + job.timeout + self.hard_timeout_grace
+
+    def _check_process(self, index: int, ready: List[Any]) -> None:
+        """
+        Handle result or death of a process.
+
+        :param index: index of the process.
+        :param ready: connections and sentinels that are ready.
+        """
+        proc = self.processes[index]
+        job = proc.job
+        if job is not None and proc.conn in ready:
+            try:
+                is_ok, value = recv_object(proc.conn)
+            except (EOFError, OSError):
+                pass
+            except Exception as exc:
+                # Whole message was read, but the result or the error
+                # of the function cannot be unpickled in this process.
+                proc.job = None
+                decode_error = TaskiqError(
+                    f"Cannot receive result from the pool: {exc}",
+                )
+                decode_error.__cause__ = exc
+                job.future.set_exception(decode_error)
+                return
+            else:
+                proc.job = None
+                if is_ok:
+                    job.future.set_result(value)
+                else:
+                    job.future.set_exception(value)
+                return
+        if proc.process.is_alive():
+            if proc.deadline is None or monotonic() < proc.deadline:
+                return
+            logger.warning(
+                "Killing process %s of the pool, because its task "
+                "has exceeded the hard time limit.",
+                proc.process.pid,
+            )
+            proc.process.kill()
+            error: Exception = TaskTimeoutError(
+                "Task has exceeded its hard time limit.",
+            )
+        else:
+            error = TaskiqError("Process of the pool has exited unexpectedly.")
+        proc.process.join()
+        proc.conn.close()
+        if job is not None:
+            job.future.set_exception(error)
+        self.processes[index] = _PoolProcess(self.initializer, self.initargs)
+
+    def _wait(self) -> List[Any]:
+        """
+        Wait for results, exits of processes, deadlines or new functions.
+
+        :return: connections and sentinels that are ready.
+        """
+        waitables: List[Any] = [self.wakeup_reader]
+        deadlines = []
+        for proc in self.processes:
+            waitables.append(proc.process.sentinel)
+            if proc.job is not None:
+                waitables.append(proc.conn)
+                if proc.deadline is not None:
+                    deadlines.append(proc.deadline)
+        timeout = None
+        if deadlines:
+            timeout = max(min(deadlines) - monotonic(), 0)
+        ready = wait(waitables, timeout)
+        if self.wakeup_reader in ready:
+            with self.lock:
+                while self.wakeup_reader.poll():
+                    self.wakeup_reader.recv_bytes()
+                self.woken_up = False
+        return ready
+
+    def _fail_all(self, exc: Exception) -> None:
+        """
+        Fail all functions after an error of the pool thread.
+
+        The pool doesn't accept new functions after that,
+        and processes with running functions are killed.
+
+        :param exc: error of the pool thread.
+        """
+        error = TaskiqError(f"Process pool has failed: {exc}")
+        error.__cause__ = exc
+        with self.lock:
+            self.shutting_down = True
+            jobs = list(self.pending)
+            self.pending.clear()
+        for proc in self.processes:
+            if proc.job is not None:
+                jobs.append(proc.job)
+                proc.job = None
+                proc.process.kill()
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(error)
+
+    def _manage(self) -> None:
+        """Main loop of the pool thread."""
+        try:
+            while True:
+                self._assign_jobs()
+                with self.lock:
+                    finished = self.shutting_down and not self.pending
+                if finished and all(proc.job is None for proc in self.processes):
+                    break
+                ready = self._wait()
+                for index in range(len(self.processes)):
+                    self._check_process(index, ready)
+        except Exception as exc:
+            logger.exception("Process pool has failed.")
+            self._fail_all(exc)
+        for proc in self.processes:
+            proc.stop()
+
+
+def create_process_pool(
+    max_workers: Optional[int],
+    broker_path: str,
+    modules: List[str],
+    tasks_pattern: Union[str, Sequence[str]],
+    fs_discover: bool,
+    *,
+    hard_timeout_grace: float = 5,
+) -> KillableProcessPool:
+    """
+    Create process pool for CPU-bound sync tasks.
+
+    All child processes are started right away and
+    import tasks once, so the first tasks won't wait for it.
+
+    :param max_workers: number of child processes, defaults to number of CPUs.
+    :param broker_path: path to the broker in `module:variable` format.
+    :param modules: list of modules with tasks.
+    :param tasks_pattern: pattern of task files if fs_discover is True.
+    :param fs_discover: whether to search for task files in filesystem.
+    :param hard_timeout_grace: time between soft and hard limits of tasks.
+    :return: process pool executor.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = KillableProcessPool(
+        max_workers=max_workers,
+        initializer=init_process_worker,
+        initargs=(broker_path, modules, tasks_pattern, fs_discover),
+        hard_timeout_grace=hard_timeout_grace,
+    )
+    pids = {
+        future.result()
+        for future in [pool.submit(_worker_ready) for _ in range(max_workers)]
+    }
+    logger.info("Started process pool with %d processes.", len(pids))
+    return pool
@@ -0,0 +1,244 @@
+import cProfile
+import io
+import pstats
+import random
+import re
+import threading
+import types
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, Generator, Optional, TypeVar
+
+from taskiq.message import TaskiqMessage
+
+logger = getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Label that enables profiling of a task.
+PROFILE_LABEL = "profile"
+# Label of results with text stats.
+PROFILE_STATS_LABEL = "profile_stats"
+# Characters that aren't allowed in names of profile files.
+_UNSAFE_CHARS = re.compile(r"[^\w.-]")
+# Maximum length of a name part of a profile file.
+_MAX_NAME_LENGTH = 100
+
+
+def should_profile(value: Any) -> bool:
+    """
+    Check if an execution should be profiled.
+
+    :param value: value of the `profile` label, a boolean
+        or a sampling rate between 0 and 1.
+    :return: True if the execution should be profiled.
+    """
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in {"true", "yes"}:
+            return True
+        if value in {"false", "no", ""}:
+            return False
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        logger.warning("Invalid value of the profile label: %s", value)
+        return False
+    return rate >= 1 or random.random() < rate  # noqa: S311
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    """
+    Enable the profiler.
+
+    Since Python 3.12 it fails if another profiling tool,
+    like a debugger or another profiler, is active.
+
+    :param profile: profiler.
+    :return: True if the profiler is enabled.
+    """
+    try:
+        profile.enable()
+    except ValueError:
+        logger.debug("Cannot enable profiler, because another one is active.")
+        return False
+    return True
+
+
+def _file_name_part(value: str) -> str:
+    """
+    Make a part of a profile file name from a message field.
+
+    Fields of messages are received from the network,
+    so path separators and characters that aren't allowed
+    in file names on some systems are replaced.
+
+    :param value: task name or task ID.
+    :return: safe part of a file name.
+    """
+    return _UNSAFE_CHARS.sub("_", value)[:_MAX_NAME_LENGTH]
+
+
+def run_profiled(
+    profile: cProfile.Profile,
+    func: Callable[..., _T],
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+    """
+    Profile a call of a function.
+
+    If the profiler cannot be enabled,
+    the function is called without it.
+
+    :param profile: profiler.
+    :param func: function to call.
+    :param args: positional arguments of the function.
+    :param kwargs: keyword arguments of the function.
+    :return: value returned by the function.
+    """
+    enabled = _enable(profile)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if enabled:
+            profile.disable()
+
+
+@types.coroutine
+def _profile_steps(
+    coro: Coroutine[Any, Any, Any],
+    profile: cProfile.Profile,
+) -> Generator[Any, Any, Any]:
+    """
+    Drive the coroutine with the profiler enabled only during its steps.
+
+    :param coro: coroutine to profile.
+    :param profile: profiler.
+    :return: value returned by the coroutine.
+    """
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        enabled = _enable(profile)
+        try:
+            yielded = coro.send(value) if error is None else coro.throw(error)
+        except StopIteration as exc:
+            return exc.value
+        finally:
+            if enabled:
+                profile.disable()
+        try:
+            value, error = (yield yielded), None
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as exc:
+            value, error = None, exc
+
+
+async def profile_coroutine(
+    coro: Coroutine[Any, Any, Any],
+    profile: cProfile.Profile,
+) -> Any:
+    """
+    Profile a coroutine.
+
+    Other tasks of the event loop run while the coroutine
+    waits, so the profiler is disabled between its steps.
+
+    Since Python 3.12 the profiler records calls in all threads,
+    so functions that run in other threads during the steps,
+    like sync tasks, get into the profile too.
+
+    :param coro: coroutine to profile.
+    :param profile: profiler.
+    :return: value returned by the coroutine.
+    """
+    return await _profile_steps(coro, profile)
+
+
+class TaskProfiler:
+    """
+    Profiles executions of tasks with the `profile` label.
+
+    Python allows only one active profiler in a process,
+    so executions that start while another one is profiled
+    aren't profiled. Since Python 3.12 executions aren't
+    profiled either if another profiling tool, like a debugger,
+    is active.
+
+    Before Python 3.12 the profiler records only the thread
+    where it's enabled. Since Python 3.12 it records all threads,
+    so profiles may contain functions of other tasks
+    that run in threads at the same time.
+
+    :param directory: directory for files with stats. If it's not set,
+        text stats are added to labels of the result.
+    :param limit: number of functions in text stats.
+    """
+
+    def __init__(self, directory: Optional[str] = None, limit: int = 30) -> None:
+        self.directory = directory
+        self.limit = limit
+        self.lock = threading.Lock()
+
+    def start(self, message: TaskiqMessage) -> Optional[cProfile.Profile]:
+        """
+        Create profiler for the execution if it's requested.
+
+        :param message: received message.
+        :return: profiler or None if the execution isn't profiled.
+        """
+        if not should_profile(message.labels.get(PROFILE_LABEL)):
+            return None
+        if not self.lock.acquire(blocking=False):
+            logger.debug(
+                "Task %s with ID: %s isn't profiled, because another task is.",
+                message.task_name,
+                message.task_id,
+            )
+            return None
+        profile = cProfile.Profile()
+        # Check that no other profiling tool is active.
+        if not _enable(profile):
+            self.lock.release()
+            logger.warning(
+                "Task %s with ID: %s isn't profiled, "
+                "because another profiling tool is active.",
+                message.task_name,
+                message.task_id,
+            )
+            return None
+        profile.disable()
+        return profile
+
+    def finish(
+        self,
+        profile: cProfile.Profile,
+        message: TaskiqMessage,
+    ) -> Dict[str, Any]:
+        """
+        Save stats of the profiled execution.
+
+        :param profile: profiler of the execution.
+        :param message: received message.
+        :return: labels for the result of the execution.
+        """
+        try:
+            if self.directory is not None:
+                directory = Path(self.directory)
+                directory.mkdir(parents=True, exist_ok=True)
+                name = _file_name_part(message.task_name)
+                task_id = _file_name_part(message.task_id)
+                profile.dump_stats(directory / f"{name}-{task_id}.prof")
+                return message.labels
+            stream = io.StringIO()
+            stats = pstats.Stats(profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+            return {**message.labels, PROFILE_STATS_LABEL: stream.getvalue()}
+        except Exception:
+            logger.exception("Cannot save profile of task %s.", message.task_id)
+            return message.labels
+        finally:
+            self.lock.release()
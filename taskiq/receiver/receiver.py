@@ -1,46 +1,48 @@
 import asyncio
+import cProfile
 import inspect
+import math
 import signal
 from concurrent.futures import Executor
+from functools import partial
 from logging import getLogger
 from time import time
-from typing import Any, Callable, Dict, List, Optional, Set, Union, get_type_hints
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
 
 import anyio
 from taskiq_dependencies import DependencyGraph
 
-from taskiq.abc.broker import AckableMessage, AsyncBroker
-from taskiq.abc.middleware import TaskiqMiddleware
+from taskiq.abc.broker import AckableMessage, AsyncBroker, AsyncTaskiqDecoratedTask
 from taskiq.acks import AcknowledgeType
 from taskiq.context import Context
 from taskiq.exceptions import NoResultError
 from taskiq.message import TaskiqMessage
-from taskiq.receiver.params_parser import parse_params
+from taskiq.receiver.ack_batcher import AckBatcher
+from taskiq.receiver.adaptive_prefetch import AdaptivePrefetch, ResizableSemaphore
+from taskiq.receiver.execution_plan import TaskExecutionPlan
+from taskiq.receiver.executor_pool import ExecutorPool
+from taskiq.receiver.loop_monitor import LoopMonitor
+from taskiq.receiver.params_parser import ParamsValidator
+from taskiq.receiver.priority_queue import PrioritizedMessage, PriorityPrefetchQueue
+from taskiq.receiver.profiler import (
+    PROFILE_LABEL,
+    TaskProfiler,
+    profile_coroutine,
+    run_profiled,
+)
+from taskiq.receiver.sync_call import SyncCall
 from taskiq.result import TaskiqResult
 from taskiq.state import TaskiqState
+from taskiq.tracing import TRACEPARENT_LABEL, SpanContext, get_tracer
 from taskiq.utils import maybe_awaitable
 
 logger = getLogger(__name__)
 QUEUE_DONE = b"-1"
-
-
-def _run_sync(
-    target: Callable[..., Any],
-    args: List[Any],
-    kwargs: Dict[str, Any],
-) -> Any:
-    """
-    Runs function synchronously.
-
-    We use this function, because
-    we cannot pass kwargs in loop.run_with_executor().
-
-    :param target: function to execute.
-    :param args: list of function's args.
-    :param kwargs: dict of function's kwargs.
-    :return: result of function's execution.
-    """
-    return target(*args, **kwargs)
+# Upper bound of adaptive prefetch window,
+# if neither max_prefetch nor max_async_tasks is set.
+DEFAULT_MAX_PREFETCH = 100
+# Name of the executor that is passed as `executor`.
+DEFAULT_EXECUTOR = "default"
 
 
 class Receiver:
@@ -59,23 +61,71 @@ class Receiver:
         on_exit: Optional[Callable[["Receiver"], None]] = None,
         max_tasks_to_execute: Optional[int] = None,
         wait_tasks_timeout: Optional[float] = None,
+        *,
+        on_ready: Optional[Callable[["Receiver"], None]] = None,
+        execution_plans: Optional[Dict[str, TaskExecutionPlan]] = None,
+        ack_batch_size: int = 0,
+        ack_batch_timeout: float = 0.1,
+        strict_params: bool = False,
+        parse_in_executor: bool = False,
+        process_pool: Optional[Executor] = None,
+        process_pool_tasks: Optional[Iterable[str]] = None,
+        priority_queue: bool = False,
+        priority_starvation_limit: int = 1000,
+        adaptive_prefetch: bool = False,
+        min_prefetch: int = 0,
+        executors: Optional[Dict[str, Executor]] = None,
+        slow_callback_threshold: Optional[float] = None,
+        profile_dir: Optional[str] = None,
     ) -> None:
         self.broker = broker
         self.executor = executor
+        named_executors = dict(executors or {})
+        if executor is not None:
+            named_executors.setdefault(DEFAULT_EXECUTOR, executor)
+        self.executor_pools = {
+            name: ExecutorPool(
+                name,
+                pool,
+                # Standard executors keep their size here.
+                size=getattr(pool, "_max_workers", None),
+            )
+            for name, pool in named_executors.items()
+        }
+        self.unknown_executors: Set[str] = set()
+        self.process_pool = process_pool
+        self.process_pool_tasks = set(process_pool_tasks or ())
+        self.profiler = TaskProfiler(profile_dir)
         self.run_startup = run_startup
         self.validate_params = validate_params
+        self.strict_params = strict_params
+        self.parse_in_executor = parse_in_executor
         self.task_signatures: Dict[str, inspect.Signature] = {}
         self.task_hints: Dict[str, Dict[str, Any]] = {}
         self.dependency_graphs: Dict[str, DependencyGraph] = {}
+        self.execution_plans: Dict[str, TaskExecutionPlan] = {}
+        self.task_semaphores: Dict[str, asyncio.Semaphore] = {}
         self.propagate_exceptions = propagate_exceptions
         self.on_exit = on_exit
+        self.on_ready = on_ready
         self.ack_time = ack_type or AcknowledgeType.WHEN_SAVED
         self.known_tasks: Set[str] = set()
+        self.running_tasks: "Set[asyncio.Task[Any]]" = set()
+        self.prefetch_queue: "Optional[asyncio.Queue[Any]]" = None
         self.max_tasks_to_execute = max_tasks_to_execute
         self.wait_tasks_timeout = wait_tasks_timeout
+        self.priority_queue = priority_queue
+        self.priority_starvation_limit = priority_starvation_limit
+        # Plans can be built in advance, for example before workers are forked.
+        prebuilt_plans = execution_plans or {}
         for task in self.broker.get_all_tasks().values():
-            self._prepare_task(task.task_name, task.original_func)
+            self._prepare_task(
+                task.task_name,
+                task.original_func,
+                plan=prebuilt_plans.get(task.task_name),
+            )
         self.sem: "Optional[asyncio.Semaphore]" = None
+        self._init_deferred(max_async_tasks or 0)
         if max_async_tasks is not None and max_async_tasks > 0:
             self.sem = asyncio.Semaphore(max_async_tasks)
         else:
@@ -83,12 +133,56 @@ class Receiver:
                 "Setting unlimited number of async tasks "
                 "can result in undefined behavior",
             )
-        self.sem_prefetch = asyncio.Semaphore(max_prefetch)
+        self.adaptive_prefetch: "Optional[AdaptivePrefetch]" = None
+        self.sem_prefetch: asyncio.Semaphore
+        if adaptive_prefetch:
+            prefetch_window = ResizableSemaphore(min_prefetch)
+            self.sem_prefetch = prefetch_window
+            self.adaptive_prefetch = AdaptivePrefetch(
+                prefetch_window,
+                min_size=min_prefetch,
+                max_size=max_prefetch or max_async_tasks or DEFAULT_MAX_PREFETCH,
+                max_async_tasks=max_async_tasks,
+            )
+        else:
+            self.sem_prefetch = asyncio.Semaphore(max_prefetch)
+        self.loop_monitor = (
+            LoopMonitor(slow_callback_threshold, on_block=self._on_slow_callback)
+            if slow_callback_threshold is not None
+            else None
+        )
+        self.ack_batcher = (
+            AckBatcher(
+                flush=self.broker.ack_batch,
+                batch_size=ack_batch_size,
+                flush_interval=ack_batch_timeout,
+            )
+            if ack_batch_size > 1
+            else None
+        )
+
+    def _init_deferred(self, max_deferred_messages: int) -> None:
+        """
+        Initialize state of messages that wait without execution slots.
 
-    async def callback(  # noqa: C901, PLR0912
+        Messages of saturated tasks give their slots to other tasks.
+        Their number is limited by max_async_tasks. When the limit
+        is exceeded, the runner stops taking new messages until
+        one of them starts, so the broker isn't drained while they wait.
+
+        :param max_deferred_messages: maximum number of waiting messages.
+        """
+        self.deferred_messages = 0
+        self.max_deferred_messages = max_deferred_messages
+        self.deferred_space = asyncio.Event()
+        self.deferred_space.set()
+        self.slotless_tasks: "Set[Optional[asyncio.Task[Any]]]" = set()
+
+    async def callback(
         self,
         message: Union[bytes, AckableMessage],
         raise_err: bool = False,
+        taskiq_msg: Optional[TaskiqMessage] = None,
     ) -> None:
         """
         Receive new message and execute tasks.
@@ -101,6 +195,51 @@ class Receiver:
         :param message: received message.
         :param raise_err: raise an error if cannot save result in
             result_backend.
+        :param taskiq_msg: message decoded in advance.
+        """
+        tracer = get_tracer(self.broker)
+        decode_start = time() if tracer.enabled else 0
+        if taskiq_msg is None:
+            taskiq_msg = self._decode(message)
+            if taskiq_msg is None:
+                return
+        logger.debug(f"Received message: {taskiq_msg}")
+        if self.loop_monitor is not None:
+            self.loop_monitor.track(taskiq_msg)
+        task = self.broker.find_task(taskiq_msg.task_name)
+        if task is None:
+            logger.warning(
+                'task "%s" is not found. Maybe you forgot to import it?',
+                taskiq_msg.task_name,
+            )
+            return
+        logger.debug(
+            "Function for task %s is resolved. Executing...",
+            taskiq_msg.task_name,
+        )
+        plan = self._get_execution_plan(taskiq_msg.task_name, task.original_func)
+        with tracer.start_span(
+            f"process {taskiq_msg.task_name}",
+            parent=SpanContext.from_traceparent(
+                taskiq_msg.labels.get(TRACEPARENT_LABEL),
+            ),
+            start_time=decode_start,
+        ) as span:
+            if span is not None:
+                span.set_attribute("taskiq.task_name", taskiq_msg.task_name)
+                span.set_attribute("taskiq.task_id", taskiq_msg.task_id)
+                tracer.record_span("decode", decode_start, time())
+            await self._acquire_and_execute(message, taskiq_msg, task, plan, raise_err)
+
+    def _decode(
+        self,
+        message: Union[bytes, AckableMessage],
+    ) -> Optional[TaskiqMessage]:
+        """
+        Decode received message.
+
+        :param message: received message.
+        :return: decoded message or None if it's invalid.
         """
         message_data = message.data if isinstance(message, AckableMessage) else message
         try:
@@ -113,26 +252,119 @@ class Receiver:
                 exc,
                 exc_info=True,
             )
-            return
-        logger.debug(f"Received message: {taskiq_msg}")
-        task = self.broker.find_task(taskiq_msg.task_name)
-        if task is None:
-            logger.warning(
-                'task "%s" is not found. Maybe you forgot to import it?',
-                taskiq_msg.task_name,
+            return None
+        return taskiq_msg
+
+    async def _acquire_and_execute(
+        self,
+        message: Union[bytes, AckableMessage],
+        taskiq_msg: TaskiqMessage,
+        task: AsyncTaskiqDecoratedTask[Any, Any],
+        plan: TaskExecutionPlan,
+        raise_err: bool,
+    ) -> None:
+        """
+        Execute the message within the concurrency limit of its task.
+
+        If the task is saturated, the message waits for its turn
+        without an execution slot, so it doesn't block other tasks.
+
+        :param message: received message.
+        :param taskiq_msg: parsed message.
+        :param task: task of the message.
+        :param plan: task's execution plan.
+        :param raise_err: raise an error if cannot save result in
+            result_backend.
+        """
+        task_sem = self.task_semaphores.get(taskiq_msg.task_name)
+        if task_sem is None:
+            await self._execute_message(
+                message=message,
+                taskiq_msg=taskiq_msg,
+                target=task.original_func,
+                plan=plan,
+                raise_err=raise_err,
             )
             return
-        logger.debug(
-            "Function for task %s is resolved. Executing...",
-            taskiq_msg.task_name,
-        )
-        for middleware in self.broker.middlewares:
-            if middleware.__class__.pre_execute != TaskiqMiddleware.pre_execute:
-                taskiq_msg = await maybe_awaitable(
-                    middleware.pre_execute(
-                        taskiq_msg,
-                    ),
-                )
+        if task_sem.locked() and self.sem is not None:
+            logger.debug("Task %s is saturated. Waiting.", taskiq_msg.task_name)
+            await self._wait_deferred(task_sem, self.sem)
+        else:
+            await task_sem.acquire()
+        try:
+            await self._execute_message(
+                message=message,
+                taskiq_msg=taskiq_msg,
+                target=task.original_func,
+                plan=plan,
+                raise_err=raise_err,
+            )
+        finally:
+            task_sem.release()
+
+    async def _wait_deferred(
+        self,
+        task_sem: asyncio.Semaphore,
+        sem: asyncio.Semaphore,
+    ) -> None:
+        """
+        Wait for the task's semaphore without taking an execution slot.
+
+        The execution slot is given to other tasks while the message
+        waits and is taken back after that. If waiting is cancelled,
+        the slot isn't taken back, so the runner doesn't release it.
+        While more than `max_deferred_messages` messages wait,
+        the runner doesn't take new messages.
+
+        :param task_sem: semaphore of the saturated task.
+        :param sem: semaphore of execution slots.
+        """
+        current = asyncio.current_task()
+        self.slotless_tasks.add(current)
+        self.deferred_messages += 1
+        if self.deferred_messages > self.max_deferred_messages:
+            self.deferred_space.clear()
+        sem.release()
+        try:
+            await task_sem.acquire()
+        finally:
+            self.deferred_messages -= 1
+            if self.deferred_messages <= self.max_deferred_messages:
+                self.deferred_space.set()
+        try:
+            await sem.acquire()
+        except BaseException:
+            task_sem.release()
+            raise
+        self.slotless_tasks.discard(current)
+
+    async def _execute_message(
+        self,
+        message: Union[bytes, AckableMessage],
+        taskiq_msg: TaskiqMessage,
+        target: Callable[..., Any],
+        plan: TaskExecutionPlan,
+        raise_err: bool,
+    ) -> None:
+        """
+        Execute parsed message.
+
+        It runs middlewares, executes the task, saves
+        its result and acknowledges the message.
+
+        :raises Exception: if raise_err is true,
+            and exception were found while saving result.
+        :param message: received message.
+        :param taskiq_msg: parsed message.
+        :param target: function to execute.
+        :param plan: task's execution plan.
+        :param raise_err: raise an error if cannot save result in
+            result_backend.
+        """
+        tracer = get_tracer(self.broker)
+        with tracer.start_span("pre_execute"):
+            for pre_execute in plan.pre_execute:
+                taskiq_msg = await maybe_awaitable(pre_execute(taskiq_msg))
 
         logger.info(
             "Executing task %s with ID: %s",
@@ -144,10 +376,10 @@ class Receiver:
             message,
             AckableMessage,
         ):
-            await maybe_awaitable(message.ack())
+            await self.ack(message)
 
         result = await self.run_task(
-            target=task.original_func,
+            target=target,
             message=taskiq_msg,
         )
 
@@ -155,19 +387,21 @@ class Receiver:
             message,
             AckableMessage,
         ):
-            await maybe_awaitable(message.ack())
+            await self.ack(message)
 
-        for middleware in self.broker.middlewares:
-            if middleware.__class__.post_execute != TaskiqMiddleware.post_execute:
-                await maybe_awaitable(middleware.post_execute(taskiq_msg, result))
+        for post_execute in plan.post_execute:
+            await maybe_awaitable(post_execute(taskiq_msg, result))
 
         try:
             if not isinstance(result.error, NoResultError):
-                await self.broker.result_backend.set_result(taskiq_msg.task_id, result)
+                with tracer.start_span("set_result"):
+                    await self.broker.result_backend.set_result(
+                        taskiq_msg.task_id,
+                        result,
+                    )
 
-                for middleware in self.broker.middlewares:
-                    if middleware.__class__.post_save != TaskiqMiddleware.post_save:
-                        await maybe_awaitable(middleware.post_save(taskiq_msg, result))
+                for post_save in plan.post_save:
+                    await maybe_awaitable(post_save(taskiq_msg, result))
 
         except Exception as exc:
             logger.exception(
@@ -182,9 +416,43 @@ class Receiver:
             message,
             AckableMessage,
         ):
-            await maybe_awaitable(message.ack())
+            await self.ack(message)
+
+    async def _on_slow_callback(
+        self,
+        message: Optional[TaskiqMessage],
+        duration: float,
+    ) -> None:
+        """
+        Pass the block of the event loop to middlewares.
+
+        :param message: message of the task that blocked the loop.
+        :param duration: time the loop was blocked in seconds.
+        """
+        for middleware in self.broker.middlewares:
+            await maybe_awaitable(middleware.on_slow_callback(message, duration))
+
+    async def ack(self, message: AckableMessage) -> None:
+        """
+        Acknowledge the message.
+
+        If batched acks are enabled, the message
+        is acknowledged with the next batch. Messages
+        acknowledged when received aren't batched,
+        because they must be acknowledged before execution.
+
+        :param message: message to acknowledge.
+        """
+        with get_tracer(self.broker).start_span("ack"):
+            if (
+                self.ack_batcher is not None
+                and self.ack_time != AcknowledgeType.WHEN_RECEIVED
+            ):
+                await self.ack_batcher.ack(message)
+            else:
+                await maybe_awaitable(message.ack())
 
-    async def run_task(  # noqa: C901, PLR0912, PLR0915
+    async def run_task(
         self,
         target: Callable[..., Any],
         message: TaskiqMessage,
@@ -207,23 +475,14 @@ class Receiver:
         :param message: received message.
         :return: result of execution.
         """
-        loop = asyncio.get_running_loop()
         returned = None
         found_exception: "Optional[BaseException]" = None
-        signature = None
-        if message.task_name not in self.known_tasks:
-            self._prepare_task(message.task_name, target)
-        if self.validate_params:
-            signature = self.task_signatures.get(message.task_name)
-        dependency_graph = self.dependency_graphs.get(message.task_name)
-        parse_params(signature, self.task_hints.get(message.task_name) or {}, message)
+        plan = self._get_execution_plan(message.task_name, target)
+        tracer = get_tracer(self.broker)
 
         dep_ctx = None
-        # Kwargs are defined in another variable,
-        # because we want to update them with
-        # kwargs resolved by dependency injector.
-        kwargs = {}
-        if dependency_graph:
+        kwargs = message.kwargs
+        if plan.has_dependencies:
             # Create a context for dependency resolving.
             broker_ctx = self.broker.custom_dependency_context
             broker_ctx.update(
@@ -232,44 +491,37 @@ class Receiver:
                     TaskiqState: self.broker.state,
                 },
             )
-            dep_ctx = dependency_graph.async_ctx(
+            dep_ctx = plan.dependency_graph.async_ctx(
                 broker_ctx,
                 self.broker.dependency_overrides or None,
             )
             # Resolve all function's dependencies.
 
+        profile = (
+            self._start_profile(plan, message)
+            if PROFILE_LABEL in message.labels
+            else None
+        )
+
         # Start a timer.
         start_time = time()
 
         try:
+            if plan.params_validator is not None:
+                await self._parse_params(plan.params_validator, message)
             # We put kwargs resolving here,
             # to be able to catch any exception (for example ),
             # that happen while resolving dependencies.
             if dep_ctx:
-                kwargs = await dep_ctx.resolve_kwargs()
-            # We udpate kwargs with kwargs from network.
-            kwargs.update(message.kwargs)
-            is_coroutine = True
-            # If the function is a coroutine, we await it.
-            if asyncio.iscoroutinefunction(target):
-                target_future = target(*message.args, **kwargs)
-            else:
-                is_coroutine = False
-                # If this is a synchronous function, we
-                # run it in executor.
-                target_future = loop.run_in_executor(
-                    self.executor,
-                    _run_sync,
-                    target,
-                    message.args,
-                    kwargs,
-                )
-            timeout = message.labels.get("timeout")
-            if timeout is not None:
-                if not is_coroutine:
-                    logger.warning("Timeouts for sync tasks don't work in python well.")
-                target_future = asyncio.wait_for(target_future, float(timeout))
-            returned = await target_future
+                # Kwargs are defined in another variable,
+                # because we want to update them with
+                # kwargs resolved by dependency injector.
+                with tracer.start_span("resolve_dependencies"):
+                    kwargs = await dep_ctx.resolve_kwargs()
+                # We udpate kwargs with kwargs from network.
+                kwargs.update(message.kwargs)
+            with tracer.start_span("execute"):
+                returned = await self._execute(target, plan, message, kwargs, profile)
         except NoResultError as no_res_exc:
             found_exception = no_res_exc
             logger.warning(
@@ -284,8 +536,16 @@ class Receiver:
                 exc,
                 exc_info=True,
             )
-        # Stop the timer.
-        execution_time = time() - start_time
+        finally:
+            # Stop the timer.
+            execution_time = time() - start_time
+            # The profiler is released even if
+            # the execution is interrupted.
+            labels = (
+                message.labels
+                if profile is None
+                else self.profiler.finish(profile, message)
+            )
         if dep_ctx:
             args = (None, None, None)
             if found_exception and self.propagate_exceptions:
@@ -303,22 +563,221 @@ class Receiver:
             return_value=returned,
             execution_time=round(execution_time, 2),
             error=found_exception,
-            labels=message.labels,
+            labels=labels,
         )
         # If exception is found we execute middlewares.
         if found_exception is not None:
-            for middleware in self.broker.middlewares:
-                if middleware.__class__.on_error != TaskiqMiddleware.on_error:
-                    await maybe_awaitable(
-                        middleware.on_error(
-                            message,
-                            result,
-                            found_exception,
-                        ),
-                    )
+            for on_error in plan.on_error:
+                await maybe_awaitable(on_error(message, result, found_exception))
 
         return result
 
+    def _start_profile(
+        self,
+        plan: TaskExecutionPlan,
+        message: TaskiqMessage,
+    ) -> Optional[cProfile.Profile]:
+        """
+        Start profiling of the execution if it's requested.
+
+        Tasks in the process pool aren't profiled.
+
+        :param plan: task's execution plan.
+        :param message: message with the `profile` label.
+        :return: profiler or None if the execution isn't profiled.
+        """
+        if plan.use_process_pool and self.process_pool is not None:
+            return None
+        return self.profiler.start(message)
+
+    async def _execute(
+        self,
+        target: Callable[..., Any],
+        plan: TaskExecutionPlan,
+        message: TaskiqMessage,
+        kwargs: Dict[str, Any],
+        profile: Optional[cProfile.Profile] = None,
+    ) -> Any:
+        """
+        Execute function of a task within its time limit.
+
+        Coroutines are cancelled when the time is out.
+        Sync functions in threads are interrupted, and
+        processes of the process pool are killed
+        if tasks don't stop by themselves.
+
+        :param target: function to execute.
+        :param plan: task's execution plan.
+        :param message: received message.
+        :param kwargs: resolved kwargs.
+        :param profile: profiler of the execution.
+        :return: returned value.
+        """
+        timeout = message.labels.get("timeout", plan.timeout)
+        if timeout is not None:
+            timeout = float(timeout)
+        if plan.is_coroutine:
+            coro = target(*message.args, **kwargs)
+            if profile is not None:
+                coro = profile_coroutine(coro, profile)
+            if timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout)
+        if plan.use_process_pool and self.process_pool is not None:
+            return await self._run_in_process_pool(
+                message.task_name,
+                message.args,
+                kwargs,
+                timeout,
+            )
+        if profile is not None:
+            target = partial(run_profiled, profile, target)
+        return await self._run_in_thread(
+            target,
+            message.args,
+            kwargs,
+            timeout,
+            message.labels.get("executor", plan.executor),
+        )
+
+    def _get_executor_pool(self, name: Optional[str]) -> Optional[ExecutorPool]:
+        """
+        Find executor for a sync task.
+
+        Tasks with unknown executors use the default one.
+
+        :param name: name of the executor from task's labels.
+        :return: executor pool or None to use the loop's executor.
+        """
+        if name is not None and name != DEFAULT_EXECUTOR:
+            pool = self.executor_pools.get(name)
+            if pool is not None:
+                return pool
+            if name not in self.unknown_executors:
+                self.unknown_executors.add(name)
+                logger.warning(
+                    "Executor %s is not found. Using the default one.",
+                    name,
+                )
+        return self.executor_pools.get(DEFAULT_EXECUTOR)
+
+    async def _run_in_thread(
+        self,
+        target: Callable[..., Any],
+        args: List[Any],
+        kwargs: Dict[str, Any],
+        timeout: Optional[float],
+        executor: Optional[str] = None,
+    ) -> Any:
+        """
+        Execute sync function in the executor.
+
+        If the function exceeds the timeout,
+        TaskTimeoutError is raised in its thread.
+        It's a soft limit: functions blocked in C code,
+        like waiting for a socket or a lock, keep their threads
+        until the call returns. Tasks that need hard limits
+        should be executed in the process pool.
+
+        :param target: function to execute.
+        :param args: function's args.
+        :param kwargs: function's kwargs.
+        :param timeout: time limit in seconds.
+        :param executor: name of the executor.
+        :return: returned value.
+        """
+        call = SyncCall(target, args, kwargs)
+        pool = self._get_executor_pool(executor)
+        if pool is None:
+            future = asyncio.get_running_loop().run_in_executor(None, call)
+        else:
+            future = asyncio.wrap_future(pool.submit(call))
+        if timeout is None:
+            return await future
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if call.interrupt():
+                logger.warning(
+                    "Sync task has exceeded its timeout. Interrupting it. "
+                    "If it's blocked in C code, it stops only when the call returns.",
+                )
+            raise
+
+    async def _parse_params(
+        self,
+        validator: ParamsValidator,
+        message: TaskiqMessage,
+    ) -> None:
+        """
+        Parse incoming parameters in place.
+
+        If `parse_in_executor` is set, parsing is done
+        in executor, so heavy validation won't block the event loop.
+
+        :param validator: task's params validator.
+        :param message: incoming message.
+        """
+        if self.parse_in_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                validator.validate,
+                message,
+                self.strict_params,
+            )
+        else:
+            validator.validate(message, strict=self.strict_params)
+
+    async def _run_in_process_pool(
+        self,
+        task_name: str,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Execute sync task in the process pool.
+
+        Arguments and returned value are pickled,
+        so they must be picklable. This includes values
+        of resolved dependencies.
+
+        If the pool supports time limits, they are enforced
+        by the pool. Otherwise only the result isn't awaited
+        when the time is out.
+
+        :param task_name: name of a task.
+        :param args: task's args.
+        :param kwargs: task's kwargs.
+        :param timeout: time limit in seconds.
+        :return: returned value.
+        """
+        # The process pool isn't imported until it's used,
+        # because it imports multiprocessing and the CLI.
+        from taskiq.receiver.process_pool import (  # noqa: PLC0415
+            KillableProcessPool,
+            run_in_process,
+        )
+
+        if isinstance(self.process_pool, KillableProcessPool):
+            return await asyncio.wrap_future(
+                self.process_pool.submit_with_timeout(
+                    timeout,
+                    run_in_process,
+                    task_name,
+                    args,
+                    kwargs,
+                ),
+            )
+        future = asyncio.get_running_loop().run_in_executor(
+            self.process_pool,
+            run_in_process,
+            task_name,
+            args,
+            kwargs,
+        )
+        return await asyncio.wait_for(future, timeout)
+
     async def listen(self) -> None:  # pragma: no cover
         """
         This function iterates over tasks asynchronously.
@@ -329,10 +788,16 @@ class Receiver:
         if self.run_startup:
             await self.broker.startup()
         logger.info("Listening started.")
-        queue: "asyncio.Queue[Union[bytes, AckableMessage]]" = asyncio.Queue()
+        queue = self._create_queue()
+        self.prefetch_queue = queue
+        if self.on_ready is not None:
+            self.on_ready(self)
 
         prefetcher = asyncio.create_task(self.prefetcher(queue))
         runner = asyncio.create_task(self.runner(queue))
+        monitor = None
+        if self.loop_monitor is not None:
+            monitor = asyncio.create_task(self.loop_monitor.run())
 
         # Propagate cancellation to the prefetcher & runner
         def _cancel(*_: Any) -> None:
@@ -346,12 +811,70 @@ class Receiver:
         except asyncio.CancelledError:
             pass
 
+        if monitor is not None:
+            monitor.cancel()
+
+        if self.ack_batcher is not None:
+            await self.ack_batcher.close()
+
         if self.on_exit is not None:
             self.on_exit(self)
 
+    def _create_queue(self) -> "asyncio.Queue[Any]":
+        """
+        Create queue for prefetched messages.
+
+        :return: FIFO queue or priority queue if it's enabled.
+        """
+        if self.priority_queue:
+            return PriorityPrefetchQueue(
+                get_priority=self._get_priority,
+                starvation_limit=self.priority_starvation_limit,
+            )
+        return asyncio.Queue()
+
+    def _get_priority(self, item: Any) -> float:
+        """
+        Get priority of a queued item.
+
+        :param item: prioritized message or QUEUE_DONE.
+        :return: item's priority.
+        """
+        if item is QUEUE_DONE:
+            return -math.inf
+        return item.priority
+
+    def _prioritize(self, message: Union[bytes, AckableMessage]) -> PrioritizedMessage:
+        """
+        Get priority of a prefetched message.
+
+        If broker didn't set the priority, it's
+        taken from the `priority` label of the message.
+        Decoded message is kept to pass it to the callback.
+        Priorities that aren't finite numbers are replaced with 0.
+
+        :param message: prefetched message.
+        :return: message with its priority.
+        """
+        priority: float = 0
+        taskiq_msg = None
+        if isinstance(message, AckableMessage) and message.priority is not None:
+            priority = message.priority
+        else:
+            # Invalid messages are reported by callback.
+            taskiq_msg = self._decode(message)
+            if taskiq_msg is not None:
+                try:
+                    priority = float(taskiq_msg.labels.get("priority", 0))
+                except (TypeError, ValueError):
+                    priority = 0
+        if not math.isfinite(priority):
+            priority = 0
+        return PrioritizedMessage(message, priority, taskiq_msg)
+
     async def prefetcher(
         self,
-        queue: "asyncio.Queue[Union[bytes, AckableMessage]]",
+        queue: "asyncio.Queue[Any]",
     ) -> None:
         """
         Prefetch tasks data.
@@ -370,9 +893,15 @@ class Receiver:
                 ):
                     logger.info("Max number of tasks executed.")
                     break
+                fetch_start = time()
                 message = await iterator.__anext__()
+                if self.adaptive_prefetch is not None:
+                    self.adaptive_prefetch.observe_fetch(time() - fetch_start)
                 fetched_tasks += 1
-                await queue.put(message)
+                if self.priority_queue:
+                    await queue.put(self._prioritize(message))
+                else:
+                    await queue.put(message)
             except (asyncio.CancelledError, StopAsyncIteration):
                 break
 
@@ -380,14 +909,14 @@ class Receiver:
 
     async def runner(
         self,
-        queue: "asyncio.Queue[Union[bytes, AckableMessage]]",
+        queue: "asyncio.Queue[Any]",
     ) -> None:
         """
         Run tasks.
 
         :param queue: queue with prefetched data.
         """
-        tasks: Set[asyncio.Task[Any]] = set()
+        tasks = self.running_tasks
 
         def task_cb(task: "asyncio.Task[Any]") -> None:
             """
@@ -400,11 +929,15 @@ class Receiver:
             :param task: finished task
             """
             tasks.discard(task)
-            if self.sem is not None:
+            if self.sem is not None and task not in self.slotless_tasks:
                 self.sem.release()
+            self.slotless_tasks.discard(task)
 
         while True:
             try:
+                # Stops taking messages while too many messages
+                # of saturated tasks wait for their turn.
+                await self.deferred_space.wait()
                 # Waits for semaphore to be released.
                 if self.sem is not None:
                     await self.sem.acquire()
@@ -418,8 +951,16 @@ class Receiver:
                         await asyncio.wait(tasks, timeout=self.wait_tasks_timeout)
                     break
 
+                taskiq_msg = None
+                if isinstance(message, PrioritizedMessage):
+                    taskiq_msg = message.taskiq_msg
+                    message = message.message
                 task = asyncio.create_task(
-                    self.callback(message=message, raise_err=False),
+                    self.callback(
+                        message=message,
+                        raise_err=False,
+                        taskiq_msg=taskiq_msg,
+                    ),
                 )
                 tasks.add(task)
 
@@ -430,16 +971,63 @@ class Receiver:
                 # and this behaviour considered to be a Hisenbug.
                 # https://textual.textualize.io/blog/2023/02/11/the-heisenbug-lurking-in-your-async-code/
                 task.add_done_callback(task_cb)
+                if self.adaptive_prefetch is not None:
+                    task.add_done_callback(
+                        partial(self._adapt_prefetch, tasks, time()),
+                    )
 
             except asyncio.CancelledError:
                 break
 
-    def _prepare_task(self, name: str, handler: Callable[..., Any]) -> None:
+    def _adapt_prefetch(
+        self,
+        tasks: "Set[asyncio.Task[Any]]",
+        start_time: float,
+        _: "asyncio.Task[Any]",
+    ) -> None:
+        """
+        Resize the prefetch window after task is done.
+
+        :param tasks: currently running tasks.
+        :param start_time: time when the task was started.
+        """
+        if self.adaptive_prefetch is not None:
+            self.adaptive_prefetch.observe_execution(time() - start_time)
+            self.adaptive_prefetch.adjust(running=len(tasks))
+
+    def _get_execution_plan(
+        self,
+        name: str,
+        handler: Callable[..., Any],
+    ) -> TaskExecutionPlan:
+        """
+        Get execution plan for a task.
+
+        The plan is built again if task is unknown,
+        or if new middlewares were added to the broker.
+
+        :param name: task name.
+        :param handler: task handler.
+        :return: execution plan.
+        """
+        plan = self.execution_plans.get(name)
+        if plan is None or plan.middlewares_count != len(self.broker.middlewares):
+            self._prepare_task(name, handler)
+            plan = self.execution_plans[name]
+        return plan
+
+    def _prepare_task(
+        self,
+        name: str,
+        handler: Callable[..., Any],
+        plan: Optional[TaskExecutionPlan] = None,
+    ) -> None:
         """
         Prepare task for execution.
 
         This function gets function's signature,
-        type hints and builds dependency graph.
+        type hints, builds dependency graph
+        and resolves middleware hooks.
 
         It's useful for dynamic dependency resolution,
         because sometimes the receiver can get
@@ -448,8 +1036,21 @@ class Receiver:
 
         :param name: task name.
         :param handler: task handler.
+        :param plan: prebuilt execution plan.
         """
+        if plan is None or plan.middlewares_count != len(self.broker.middlewares):
+            task = self.broker.find_task(name)
+            plan = TaskExecutionPlan.build(
+                handler,
+                self.broker.middlewares,
+                labels=task.labels if task is not None else None,
+                validate_params=self.validate_params,
+                process_pool=name in self.process_pool_tasks,
+            )
         self.known_tasks.add(name)
-        self.task_signatures[name] = inspect.signature(handler)
-        self.task_hints[name] = get_type_hints(handler)
-        self.dependency_graphs[name] = DependencyGraph(handler)
+        self.execution_plans[name] = plan
+        self.task_signatures[name] = plan.signature
+        self.task_hints[name] = plan.type_hints
+        self.dependency_graphs[name] = plan.dependency_graph
+        if plan.concurrency is not None and name not in self.task_semaphores:
+            self.task_semaphores[name] = asyncio.Semaphore(plan.concurrency)
@@ -0,0 +1,81 @@
+import ctypes
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from taskiq.exceptions import TaskTimeoutError
+
+
+def _set_async_exc(thread_id: int, exc_type: Optional[type]) -> None:
+    """
+    Raise an exception in another thread.
+
+    :param thread_id: identifier of the thread.
+    :param exc_type: type of the exception or None to cancel it.
+    """
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id),
+        None if exc_type is None else ctypes.py_object(exc_type),
+    )
+
+
+class SyncCall:
+    """
+    Call of a sync function in a thread.
+
+    Threads cannot be killed, so when the call exceeds
+    its time limit, TaskTimeoutError is raised in its thread
+    asynchronously. It interrupts the function as soon as
+    the function executes python code again, and the thread
+    returns to the executor. Functions blocked in C code
+    are interrupted only after they return to python.
+
+    :param target: function to call.
+    :param args: function's args.
+    :param kwargs: function's kwargs.
+    """
+
+    def __init__(
+        self,
+        target: Callable[..., Any],
+        args: List[Any],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.lock = threading.Lock()
+        self.thread_id: Optional[int] = None
+        self.finished = False
+        self.interrupted = False
+
+    def __call__(self) -> Any:
+        """
+        Call the function in the current thread.
+
+        :return: returned value.
+        """
+        with self.lock:
+            self.thread_id = threading.get_ident()
+        try:
+            return self.target(*self.args, **self.kwargs)
+        finally:
+            with self.lock:
+                self.finished = True
+                if self.interrupted:
+                    # The exception must not escape to the executor.
+                    _set_async_exc(self.thread_id, None)
+
+    def interrupt(self) -> bool:
+        """
+        Interrupt the function if it's running.
+
+        :return: True if the function is interrupted.
+        """
+        if not hasattr(ctypes, "pythonapi"):
+            return False
+        with self.lock:
+            if self.thread_id is None or self.finished:
+                return False
+            self.interrupted = True
+            _set_async_exc(self.thread_id, TaskTimeoutError)
+        return True
@@ -68,4 +68,5 @@ class LabelScheduleSource(ScheduleSource):
             for idx, schedule in enumerate(schedule_list):
                 if schedule.get("time") == scheduled_task.time:
                     task.labels.get("schedule", []).pop(idx)
+                    task.reset_prepared_labels()
                     return
@@ -1,9 +1,27 @@
-"""Taskiq serializers."""
-from .cbor_serializer import CBORSerializer
-from .json_serializer import JSONSerializer
-from .msgpack_serializer import MSGPackSerializer
-from .orjson_serializer import ORJSONSerializer
-from .pickle import PickleSerializer
+"""
+Taskiq serializers.
+
+Serializers are imported on first access, so libraries
+of unused serializers aren't imported.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cbor_serializer import CBORSerializer
+    from .json_serializer import JSONSerializer
+    from .msgpack_serializer import MSGPackSerializer
+    from .orjson_serializer import ORJSONSerializer
+    from .pickle import PickleSerializer
+
+# Serializers and modules with them.
+_LAZY_IMPORTS: Dict[str, str] = {
+    "CBORSerializer": ".cbor_serializer",
+    "JSONSerializer": ".json_serializer",
+    "MSGPackSerializer": ".msgpack_serializer",
+    "ORJSONSerializer": ".orjson_serializer",
+    "PickleSerializer": ".pickle",
+}
 
 __all__ = [
     "JSONSerializer",
@@ -12,3 +30,18 @@ __all__ = [
     "CBORSerializer",
     "PickleSerializer",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import serializers on first access.
+
+    :param name: name of the attribute.
+    :raises AttributeError: if there's no such attribute.
+    :return: value of the attribute.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
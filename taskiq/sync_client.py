@@ -0,0 +1,95 @@
+import asyncio
+import atexit
+import os
+import threading
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Coroutine, Optional, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from taskiq.abc.broker import AsyncBroker
+
+_T = TypeVar("_T")
+
+logger = getLogger(__name__)
+
+
+class SyncClient:
+    """
+    Runs coroutines of a broker from sync code.
+
+    The client starts an event loop in a background thread
+    on the first call and starts the broker in it, so connections
+    of the broker are reused by all following calls.
+    The loop is restarted in forked processes.
+
+    :param broker: broker to use.
+    """
+
+    def __init__(self, broker: "AsyncBroker") -> None:
+        self.broker = broker
+        self.lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the event loop and the broker in it.
+
+        :return: running event loop.
+        """
+        with self.lock:
+            if self.loop is not None and self.pid == os.getpid():
+                return self.loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="taskiq-sync-client",
+                daemon=True,
+            )
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self.broker.startup(), loop).result()
+            except BaseException:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            if self.pid is None:
+                atexit.register(self.shutdown)
+            self.loop = loop
+            self.thread = thread
+            self.pid = os.getpid()
+            return loop
+
+    def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """
+        Run coroutine in the event loop of the client.
+
+        :param coro: coroutine to run.
+        :raises RuntimeError: if it's called from the loop of the client.
+        :return: result of the coroutine.
+        """
+        if threading.current_thread() is self.thread and self.pid == os.getpid():
+            coro.close()
+            raise RuntimeError("Sync client can't be used in its own event loop.")
+        loop = self.loop
+        if loop is None or self.pid != os.getpid():
+            loop = self._start()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def shutdown(self) -> None:
+        """Shut down the broker and stop the event loop."""
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            if loop is None or thread is None or self.pid != os.getpid():
+                return
+            self.loop = None
+            self.thread = None
+            try:
+                asyncio.run_coroutine_threadsafe(self.broker.shutdown(), loop).result()
+            except Exception:
+                logger.exception("Cannot shut down the broker.")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -15,6 +15,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from taskiq.abc.result_backend import AsyncResultBackend
     from taskiq.depends.progress_tracker import TaskProgress
     from taskiq.result import TaskiqResult
+    from taskiq.sync_client import SyncClient
 
 _ReturnType = TypeVar("_ReturnType")
 
@@ -161,3 +162,68 @@ class AsyncTaskiqTask(_Task[_ReturnType]):
         :return: task's progress.
         """
         return await self.result_backend.get_progress(self.task_id)
+
+
+class SyncTaskiqTask(_Task[_ReturnType]):
+    """
+    Task for sync code.
+
+    Methods of the async task are executed
+    in the event loop of the sync client.
+    """
+
+    def __init__(
+        self,
+        task: AsyncTaskiqTask[_ReturnType],
+        client: "SyncClient",
+    ) -> None:
+        self.task = task
+        self.task_id = task.task_id
+        self.client = client
+
+    def is_ready(self) -> bool:
+        """
+        Checks if task is completed.
+
+        :return: True if task is completed.
+        """
+        return self.client.run(self.task.is_ready())
+
+    def get_result(self, with_logs: bool = False) -> "TaskiqResult[_ReturnType]":
+        """
+        Get result of a task from result backend.
+
+        :param with_logs: whether you want to fetch logs from worker.
+        :return: task's return value.
+        """
+        return self.client.run(self.task.get_result(with_logs=with_logs))
+
+    def wait_result(
+        self,
+        check_interval: float = 0.2,
+        timeout: float = -1.0,
+        with_logs: bool = False,
+    ) -> "TaskiqResult[_ReturnType]":
+        """
+        Waits until result is ready.
+
+        :param check_interval: How often checks are performed.
+        :param timeout: timeout for the result.
+        :param with_logs: whether you want to fetch logs from worker.
+        :return: task's return value.
+        """
+        return self.client.run(
+            self.task.wait_result(
+                check_interval=check_interval,
+                timeout=timeout,
+                with_logs=with_logs,
+            ),
+        )
+
+    def get_progress(self) -> "Optional[TaskProgress[Any]]":
+        """
+        Get task progress.
+
+        :return: task's progress.
+        """
+        return self.client.run(self.task.get_progress())
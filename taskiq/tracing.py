@@ -0,0 +1,269 @@
+import random
+import re
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from logging import getLogger
+from time import time
+from types import TracebackType
+from typing import Any, ContextManager, Dict, List, Optional, Type
+
+from taskiq.abc.span_exporter import TaskiqSpanExporter
+
+logger = getLogger("taskiq.tracing")
+
+# Label with W3C trace context of the span that sent the message.
+TRACEPARENT_LABEL = "traceparent"
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_current_span: "ContextVar[Optional[Span]]" = ContextVar(
+    "taskiq_current_span",
+    default=None,
+)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers of a span that are passed between processes."""
+
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        """
+        Context in W3C Trace Context format.
+
+        :return: value of the traceparent header.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: Any) -> "Optional[SpanContext]":
+        """
+        Parse context in W3C Trace Context format.
+
+        :param value: value of the traceparent header.
+        :return: span context or None if value is invalid.
+        """
+        if not isinstance(value, str):
+            return None
+        match = _TRACEPARENT_RE.match(value)
+        if match is None:
+            return None
+        return cls(trace_id=match.group(1), span_id=match.group(2))
+
+
+@dataclass
+class Span:
+    """Operation of a trace."""
+
+    name: str
+    context: SpanContext
+    parent_id: Optional[str]
+    start_time: float
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[BaseException] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Set attribute of the span.
+
+        :param key: name of the attribute.
+        :param value: value of the attribute.
+        """
+        self.attributes[key] = value
+
+
+class _SpanScope:
+    """Makes the span current until it's finished."""
+
+    __slots__ = ("exporter", "span", "token")
+
+    def __init__(self, span: Span, exporter: TaskiqSpanExporter) -> None:
+        self.span = span
+        self.exporter = exporter
+        self.token: "Optional[Token[Optional[Span]]]" = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self.token is not None:
+            _current_span.reset(self.token)
+        self.span.end_time = time()
+        self.span.error = exc
+        _export(self.exporter, self.span)
+
+
+class _NoopScope:
+    """Scope of disabled tracer."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+def _export(exporter: TaskiqSpanExporter, span: Span) -> None:
+    """
+    Pass finished span to the exporter.
+
+    Errors of the exporter are logged, so they don't
+    break sending and execution of tasks.
+
+    :param exporter: exporter of spans.
+    :param span: finished span.
+    """
+    try:
+        exporter.export(span)
+    except Exception as exc:
+        logger.warning("Cannot export span %s: %s", span.name, exc)
+
+
+def _random_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def current_span() -> Optional[Span]:
+    """
+    Get the span of the current operation.
+
+    :return: current span or None if tracing is disabled.
+    """
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    Creates tracing spans and passes finished ones to the exporter.
+
+    Without an exporter the tracer is disabled,
+    and spans aren't created at all.
+
+    :param exporter: exporter of finished spans.
+    """
+
+    def __init__(self, exporter: Optional[TaskiqSpanExporter] = None) -> None:
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Check if spans are recorded.
+
+        :return: True if the tracer has an exporter.
+        """
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        start_time: Optional[float] = None,
+    ) -> ContextManager[Optional[Span]]:
+        """
+        Start a span.
+
+        The span is finished when the returned context manager exits.
+        Inside of it the span is current, so new spans are its children.
+
+        >>> with tracer.start_span("load") as span:
+        ...     if span is not None:
+        ...         span.set_attribute("rows", 10)
+
+        :param name: name of the span.
+        :param parent: context of a remote parent span.
+            By default, the parent is the current span.
+        :param start_time: start time of the span.
+        :return: context manager that returns the span
+            or None if tracing is disabled.
+        """
+        if self.exporter is None:
+            return _NOOP_SCOPE
+        return _SpanScope(self._create_span(name, parent, start_time), self.exporter)
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+    ) -> None:
+        """
+        Record an already finished child of the current span.
+
+        :param name: name of the span.
+        :param start_time: start time of the span.
+        :param end_time: end time of the span.
+        """
+        if self.exporter is None:
+            return
+        span = self._create_span(name, None, start_time)
+        span.end_time = end_time
+        _export(self.exporter, span)
+
+    def _create_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext],
+        start_time: Optional[float],
+    ) -> Span:
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        return Span(
+            name=name,
+            context=SpanContext(
+                trace_id=parent.trace_id if parent is not None else _random_id(128),
+                span_id=_random_id(64),
+            ),
+            parent_id=parent.span_id if parent is not None else None,
+            start_time=start_time if start_time is not None else time(),
+        )
+
+
+# Tracer of brokers that don't have their own one.
+NOOP_TRACER = Tracer()
+
+
+def get_tracer(broker: Any) -> Tracer:
+    """
+    Get tracer of a broker.
+
+    Brokers that don't call `AsyncBroker.__init__`
+    and mocks don't have a tracer, so tracing is disabled for them.
+
+    :param broker: broker.
+    :return: broker's tracer or a disabled one.
+    """
+    tracer = getattr(broker, "tracer", None)
+    if isinstance(tracer, Tracer):
+        return tracer
+    return NOOP_TRACER
+
+
+class InMemorySpanExporter(TaskiqSpanExporter):
+    """Exporter that keeps finished spans in a list."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        """
+        Save the span.
+
+        :param span: finished span.
+        """
+        self.spans.append(span)
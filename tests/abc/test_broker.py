@@ -1,21 +1,32 @@
-from typing import AsyncGenerator
+import asyncio
+import math
+import threading
+from typing import AsyncGenerator, List
+
+import pytest
 
 from taskiq.abc.broker import AsyncBroker
 from taskiq.decor import AsyncTaskiqDecoratedTask
+from taskiq.labels import prepare_labels
 from taskiq.message import BrokerMessage
 
 
 class _TestBroker(AsyncBroker):
     """Broker for testing purpose."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.kicked: List[BrokerMessage] = []
+
     async def kick(self, message: BrokerMessage) -> None:
         """
         This method is used to send messages.
 
-        But in this case it just throws messages away.
+        But in this case it just stores messages in a list.
 
-        :param message: message to lost.
+        :param message: message to store.
         """
+        self.kicked.append(message)
 
     async def listen(self) -> AsyncGenerator[BrokerMessage, None]:  # type: ignore
         """
@@ -61,3 +72,143 @@ def test_decorator_with_labels_success() -> None:
         "label1": 1,
         "label2": 2,
     }
+
+
+@pytest.mark.anyio
+async def test_kiq_many_single_batch() -> None:
+    """Tests that kiq_many sends all messages with one kick_batch call."""
+    tbrok = _TestBroker()
+    batches: List[List[BrokerMessage]] = []
+    default_kick_batch = tbrok.kick_batch
+
+    async def kick_batch(messages: List[BrokerMessage]) -> None:
+        batches.append(messages)
+        await default_kick_batch(messages)
+
+    tbrok.kick_batch = kick_batch  # type: ignore
+
+    @tbrok.task
+    async def test_func(a: int) -> None:
+        """Some test function."""
+
+    tasks = await test_func.kiq_many([(1,), {"a": 2}])
+
+    assert len(batches) == 1
+    assert [task.task_id for task in tasks] == [msg.task_id for msg in batches[0]]
+    assert tbrok.kicked == batches[0]
+
+
+@pytest.mark.anyio
+async def test_kiq_many_custom_task_id() -> None:
+    """Tests that custom task_id cannot be reused for a batch."""
+    tbrok = _TestBroker()
+
+    @tbrok.task
+    async def test_func() -> None:
+        """Some test function."""
+
+    with pytest.raises(ValueError):
+        await test_func.kicker().with_task_id("id").kiq_many([(), ()])
+
+
+@pytest.mark.anyio
+async def test_kiq_many_string_call() -> None:
+    """Tests that strings aren't splatted into arguments."""
+    tbrok = _TestBroker()
+
+    @tbrok.task
+    async def test_func(value: str) -> None:
+        """Some test function."""
+
+    with pytest.raises(TypeError):
+        await test_func.kiq_many(["abc"])  # type: ignore[list-item]
+    assert tbrok.kicked == []
+
+
+@pytest.mark.anyio
+async def test_kick_batch_concurrency() -> None:
+    """Tests that the default kick_batch limits concurrent sends."""
+    tbrok = _TestBroker()
+    tbrok.max_concurrent_kicks = 3
+    sending = 0
+    max_sending = 0
+
+    async def kick(message: BrokerMessage) -> None:
+        nonlocal sending, max_sending
+        sending += 1
+        max_sending = max(max_sending, sending)
+        await asyncio.sleep(0)
+        tbrok.kicked.append(message)
+        sending -= 1
+
+    tbrok.kick = kick  # type: ignore
+
+    @tbrok.task
+    async def test_func() -> None:
+        """Some test function."""
+
+    await test_func.kiq_many([() for _ in range(10)])
+
+    assert len(tbrok.kicked) == 10
+    assert max_sending == 3
+
+
+def test_kicker_labels() -> None:
+    """Tests that labels of a call don't change labels of the task."""
+    tbrok = _TestBroker()
+
+    @tbrok.task(retry=3, key=b"key")
+    async def test_func() -> None:
+        """Some test function."""
+
+    message = test_func.kicker().with_labels(retry="no")._prepare_message()
+    assert message.labels == {"retry": "no", "key": "a2V5"}
+    assert test_func.labels == {"retry": 3, "key": b"key"}
+
+    message = test_func.kicker()._prepare_message()
+    assert message.labels == {"retry": "3", "key": "a2V5"}
+
+
+def test_kicker_changed_labels() -> None:
+    """Tests that prepared labels are updated when labels of the task change."""
+    tbrok = _TestBroker()
+
+    @tbrok.task(retry=3)
+    async def test_func() -> None:
+        """Some test function."""
+
+    test_func.kicker()._prepare_message().labels["retry"] = "5"
+    assert test_func.kicker()._prepare_message().labels == {"retry": "3"}
+
+    test_func.labels["retry"] = 4
+    assert test_func.kicker()._prepare_message().labels == {"retry": "4"}
+
+
+def test_kicker_changed_nested_labels() -> None:
+    """Tests that prepared labels are updated when nested labels change."""
+    tbrok = _TestBroker()
+
+    @tbrok.task(schedule=[{"time": 1}, {"time": 2}])
+    async def test_func() -> None:
+        """Some test function."""
+
+    before = test_func.kicker()._prepare_message().labels["schedule"]
+    test_func.labels["schedule"].pop(0)
+    test_func.reset_prepared_labels()
+    after = test_func.kicker()._prepare_message().labels["schedule"]
+
+    assert before != after
+    assert test_func.prepared_labels() == prepare_labels(test_func.labels)
+
+
+def test_kicker_uncopyable_labels() -> None:
+    """Tests that labels that cannot be copied or compared are prepared once."""
+    tbrok = _TestBroker()
+
+    @tbrok.task(lock=threading.Lock(), ratio=math.nan)
+    async def test_func() -> None:
+        """Some test function."""
+
+    message = test_func.kicker()._prepare_message()
+    assert set(message.labels) == {"lock", "ratio"}
+    assert test_func.prepared_labels()[0] is test_func.prepared_labels()[0]
@@ -1,10 +1,12 @@
 import asyncio
 import uuid
+from typing import Any
 
 import pytest
 
 from taskiq import InMemoryBroker
 from taskiq.events import TaskiqEvents
+from taskiq.receiver import Receiver
 from taskiq.state import TaskiqState
 
 
@@ -85,3 +87,38 @@ async def test_execution() -> None:
 
     result = await task.wait_result()
     assert result.return_value == test_value
+
+
+@pytest.mark.anyio
+async def test_kiq_many() -> None:
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def task(a: int, b: int = 0) -> int:
+        return a + b
+
+    kicked = await task.kiq_many([(1, 2), {"a": 3, "b": 4}, [5]])
+    results = [await kicked_task.wait_result() for kicked_task in kicked]
+    assert [result.return_value for result in results] == [3, 7, 5]
+    assert len({kicked_task.task_id for kicked_task in kicked}) == 3
+
+
+@pytest.mark.anyio
+async def test_custom_receiver() -> None:
+    broker = InMemoryBroker()
+    received = []
+
+    class MyReceiver(Receiver):
+        async def callback(self, *args: Any, **kwargs: Any) -> None:
+            received.append(kwargs["message"])
+            await super().callback(*args, **kwargs)
+
+    broker.receiver = MyReceiver(broker)
+
+    @broker.task
+    async def task() -> int:
+        return 1
+
+    result = await (await task.kiq()).wait_result()
+    assert result.return_value == 1
+    assert len(received) == 1
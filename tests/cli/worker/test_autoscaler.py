@@ -0,0 +1,149 @@
+import asyncio
+import os
+from multiprocessing import current_process
+from typing import List
+
+import pytest
+
+from taskiq.brokers.inmemory_broker import InMemoryBroker
+from taskiq.cli.worker.autoscaler import (
+    Autoscaler,
+    LoadReporter,
+    WorkerLoad,
+    WorkerLoads,
+)
+from taskiq.receiver import Receiver
+
+
+def _load(busy: float, capacity: float = 10, loop_lag: float = 0) -> WorkerLoad:
+    return WorkerLoad(busy=busy, queued=0, capacity=capacity, loop_lag=loop_lag)
+
+
+def test_scale_up_after_delay() -> None:
+    """Tests that workers are added only if overload lasts."""
+    autoscaler = Autoscaler(min_workers=1, max_workers=3, scale_up_delay=5)
+
+    assert autoscaler.decide(1, [_load(9)], now=0) == 0
+    assert autoscaler.decide(1, [_load(9)], now=4) == 0
+    assert autoscaler.decide(1, [_load(9)], now=5) == 1
+    # Delay starts over after scaling.
+    assert autoscaler.decide(2, [_load(9), _load(9)], now=6) == 0
+
+
+def test_scale_up_interrupted() -> None:
+    """Tests that short peaks don't start workers."""
+    autoscaler = Autoscaler(min_workers=1, max_workers=3, scale_up_delay=5)
+
+    assert autoscaler.decide(1, [_load(9)], now=0) == 0
+    assert autoscaler.decide(1, [_load(5)], now=3) == 0
+    assert autoscaler.decide(1, [_load(9)], now=6) == 0
+    assert autoscaler.decide(1, [_load(9)], now=11) == 1
+
+
+def test_scale_up_on_loop_lag() -> None:
+    """Tests that lagging event loop is considered as overload."""
+    autoscaler = Autoscaler(
+        min_workers=1,
+        max_workers=3,
+        scale_up_delay=0,
+        max_loop_lag=0.5,
+    )
+
+    assert autoscaler.decide(1, [_load(1, loop_lag=1)], now=0) == 1
+
+
+def test_scale_down() -> None:
+    """Tests that idle workers are stopped, but not below minimum."""
+    autoscaler = Autoscaler(min_workers=1, max_workers=3, scale_down_delay=60)
+
+    assert autoscaler.decide(2, [_load(1), _load(0)], now=0) == 0
+    assert autoscaler.decide(2, [_load(1), _load(0)], now=59) == 0
+    assert autoscaler.decide(2, [_load(1), _load(0)], now=60) == -1
+    assert autoscaler.decide(1, [_load(0)], now=200) == 0
+
+
+def test_unbounded_workers() -> None:
+    """Tests that utilization of workers without slots is their loop lag."""
+    autoscaler = Autoscaler(
+        min_workers=1,
+        max_workers=3,
+        scale_up_delay=0,
+        scale_down_delay=0,
+        max_loop_lag=0.5,
+    )
+
+    assert autoscaler.utilization([_load(5, capacity=0, loop_lag=0.2)]) == 0.4
+    assert autoscaler.decide(1, [_load(5, capacity=0, loop_lag=0.45)], now=0) == 1
+    assert autoscaler.decide(2, [_load(5, capacity=0), _load(0, capacity=0)], 1) == -1
+
+
+def test_limits() -> None:
+    """Tests that number of workers stays between limits."""
+    autoscaler = Autoscaler(min_workers=1, max_workers=2, scale_up_delay=0)
+
+    assert autoscaler.decide(2, [_load(10), _load(10)], now=0) == 0
+
+
+def test_worker_loads() -> None:
+    """Tests that only fresh loads are returned."""
+    loads = WorkerLoads(max_workers=3)
+    loads.write(0, _load(3))
+    loads.write(2, _load(5))
+    pid = os.getpid()
+
+    assert loads.read([pid, pid, pid], max_age=5) == [_load(3), _load(5)]
+    assert loads.read([pid, pid], max_age=5) == [_load(3)]
+    # Reports of replaced processes are ignored.
+    assert loads.read([pid, pid, pid + 1], max_age=5) == [_load(3)]
+
+    loads.clear(0)
+    assert loads.read([pid, pid, pid], max_age=5) == [_load(5)]
+
+
+@pytest.mark.anyio
+async def test_load_reporter() -> None:
+    """Tests that receiver's load is reported to its slot."""
+    loads = WorkerLoads(max_workers=2)
+    receiver = Receiver(InMemoryBroker(), max_async_tasks=10)
+    receiver.running_tasks.add(asyncio.current_task())  # type: ignore
+
+    process = current_process()
+    name = process.name
+    process.name = "worker-1"
+    try:
+        reporter = LoadReporter(loads, receiver, capacity=10, interval=0.01)
+    finally:
+        process.name = name
+    reporter.start()
+    await asyncio.sleep(0.05)
+    reporter.stop()
+
+    [load] = loads.read([None, os.getpid()], max_age=5)
+    assert load.busy == 1
+    assert load.capacity == 10
+
+
+@pytest.mark.anyio
+async def test_load_reporter_loop_monitor() -> None:
+    """Tests that loop lag is taken from the loop monitor of the receiver."""
+    loads = WorkerLoads(max_workers=1)
+    receiver = Receiver(InMemoryBroker(), slow_callback_threshold=10)
+    assert receiver.loop_monitor is not None
+    receiver.loop_monitor.max_lag = 3
+
+    process = current_process()
+    name = process.name
+    process.name = "worker-0"
+    try:
+        reporter = LoadReporter(loads, receiver, capacity=None, interval=0.01)
+    finally:
+        process.name = name
+    lags: List[float] = []
+    reporter.report = lags.append  # type: ignore[method-assign,assignment]
+    reporter.start()
+    await asyncio.sleep(0.05)
+    reporter.stop()
+
+    # The lag is taken from the monitor once.
+    assert lags[:3] == [0, 3, 0]
+    assert receiver.loop_monitor.max_lag == 0
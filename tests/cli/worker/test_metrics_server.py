@@ -0,0 +1,28 @@
+from urllib.request import urlopen
+
+from taskiq.cli.worker.metrics_server import MetricsServer
+from taskiq.metrics import MetricsRegistry, SharedMetrics
+
+
+def test_metrics_server() -> None:
+    """Tests that metrics of workers and the manager are served."""
+    shared = SharedMetrics(slots=1)
+    worker_registry = MetricsRegistry()
+    slot = shared.claim()
+    assert slot is not None
+    worker_registry.attach(slot)
+    worker_registry.counter("tasks", "Tasks", ["task_name"]).labels("a").inc()
+    registry = MetricsRegistry()
+    registry.gauge("workers_reloaded", "Reloaded workers").set(2)
+
+    server = MetricsServer(shared, registry, addr="127.0.0.1", port=0)
+    server.start()
+    try:
+        host, port = server.address
+        with urlopen(f"http://{host}:{port}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.stop()
+
+    assert 'tasks_total{task_name="a"} 1.0' in body
+    assert "workers_reloaded 2.0" in body
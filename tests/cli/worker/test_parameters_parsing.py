@@ -7,7 +7,7 @@ from pydantic import BaseModel
 
 from taskiq.compat import model_copy
 from taskiq.message import TaskiqMessage
-from taskiq.receiver.params_parser import parse_params
+from taskiq.receiver.params_parser import ParamsValidator, parse_params
 
 
 class _TestPydanticClass(BaseModel):
@@ -154,3 +154,102 @@ def test_parse_params_nones(test_class: Type[Any]) -> None:
     )
 
     assert msg_with_kwargs.kwargs["param"] is None
+
+
+@pytest.mark.parametrize("test_class", [_TestPydanticClass, _TestDataclass])
+def test_params_validator_classes(test_class: Type[Any]) -> None:
+    """Tests that compiled validator parses args and kwargs."""
+
+    def test_func(param: test_class, kw_param: test_class) -> None:  # type: ignore
+        """Test function."""
+
+    validator = ParamsValidator(
+        inspect.signature(test_func),
+        get_type_hints(test_func),
+    )
+    msg = TaskiqMessage(
+        task_id="",
+        task_name="",
+        labels={},
+        args=[{"field": "arg"}],
+        kwargs={"kw_param": {"field": "kwarg"}},
+    )
+
+    validator.validate(msg)
+
+    assert isinstance(msg.args[0], test_class)
+    assert msg.args[0].field == "arg"
+    assert isinstance(msg.kwargs["kw_param"], test_class)
+    assert msg.kwargs["kw_param"].field == "kwarg"
+
+
+def test_params_validator_lenient() -> None:
+    """Tests that only invalid values are left as is in lenient mode."""
+
+    def test_func(a: int, b: _TestPydanticClass, c: int) -> None:
+        """Test function."""
+
+    validator = ParamsValidator(
+        inspect.signature(test_func),
+        get_type_hints(test_func),
+    )
+    msg = TaskiqMessage(
+        task_id="",
+        task_name="",
+        labels={},
+        args=["1", {"unknown": "unknown"}, None],
+        kwargs={},
+    )
+
+    validator.validate(msg)
+
+    assert msg.args == [1, {"unknown": "unknown"}, None]
+
+
+def test_params_validator_strict() -> None:
+    """Tests that invalid values raise errors in strict mode."""
+
+    def test_func(a: int) -> None:
+        """Test function."""
+
+    validator = ParamsValidator(
+        inspect.signature(test_func),
+        get_type_hints(test_func),
+    )
+    msg = TaskiqMessage(
+        task_id="",
+        task_name="",
+        labels={},
+        args=["not a number"],
+        kwargs={},
+    )
+
+    with pytest.raises(ValueError):
+        validator.validate(msg, strict=True)
+
+
+def test_params_validator_positions() -> None:
+    """Tests that unannotated and unsupported params are skipped."""
+
+    class _Unsupported:
+        """Class that pydantic doesn't know how to parse."""
+
+    def test_func(a, b: int, c: _Unsupported) -> None:  # type: ignore # noqa: ANN001
+        """Test function."""
+
+    validator = ParamsValidator(
+        inspect.signature(test_func),
+        get_type_hints(test_func),
+    )
+    unsupported = _Unsupported()
+    msg = TaskiqMessage(
+        task_id="",
+        task_name="",
+        labels={},
+        args=["1", "2", unsupported],
+        kwargs={},
+    )
+
+    validator.validate(msg)
+
+    assert msg.args == ["1", 2, unsupported]
@@ -0,0 +1,45 @@
+import gc
+from multiprocessing import get_start_method
+from typing import Generator
+
+import pytest
+
+from taskiq.cli.worker.args import WorkerArgs
+from taskiq.cli.worker.preload import preload_app
+from taskiq.receiver import Receiver
+from tests.utils import AsyncQueueBroker
+
+broker = AsyncQueueBroker()
+
+
+@broker.task(task_name="preloaded_task")
+async def preloaded_task(a: int) -> int:
+    return a
+
+
+@pytest.fixture
+def unfreeze() -> Generator[None, None, None]:
+    """Move objects frozen by preloading back to GC."""
+    yield
+    gc.unfreeze()
+
+
+@pytest.mark.skipif(get_start_method() != "fork", reason="Requires fork.")
+@pytest.mark.usefixtures("unfreeze")
+def test_preload_app() -> None:
+    """Tests that tasks are imported and plans are built before fork."""
+    preloaded = preload_app(
+        WorkerArgs(broker="tests.cli.worker.test_preload:broker", modules=[]),
+    )
+
+    assert preloaded is not None
+    assert preloaded.broker.is_worker_process
+    assert gc.get_freeze_count() > 0
+    assert gc.isenabled()
+    plan = preloaded.execution_plans["preloaded_task"]
+
+    receiver = Receiver(
+        preloaded.broker,
+        execution_plans=preloaded.execution_plans,
+    )
+    assert receiver.execution_plans["preloaded_task"] is plan
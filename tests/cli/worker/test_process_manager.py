@@ -0,0 +1,267 @@
+import faulthandler
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager, suppress
+from functools import partial
+from multiprocessing.synchronize import Event as EventType
+from pathlib import Path
+from typing import Any, Generator, Optional
+
+import pytest
+
+from taskiq.cli.worker.args import WorkerArgs
+from taskiq.cli.worker.autoscaler import WorkerLoad, WorkerLoads, get_worker_num
+from taskiq.cli.worker.process_manager import (
+    ProcessManager,
+    ReloadAllAction,
+    ShutdownAction,
+)
+
+
+def sleeping_worker(args: WorkerArgs, ready_event: EventType) -> None:
+    """Worker that does nothing until interrupted."""
+    ready_event.set()
+    with suppress(KeyboardInterrupt):
+        time.sleep(60)
+
+
+def slow_worker(args: WorkerArgs, ready_event: EventType) -> None:
+    """Worker that becomes ready after a delay."""
+    with suppress(KeyboardInterrupt):
+        time.sleep(0.3)
+        ready_event.set()
+        time.sleep(60)
+
+
+def stuck_worker(args: WorkerArgs, ready_event: EventType) -> None:
+    """Worker that never becomes ready."""
+    with suppress(KeyboardInterrupt):
+        time.sleep(60)
+
+
+def stuck_on_reload_worker(
+    args: WorkerArgs,
+    ready_event: EventType,
+    marker: Path,
+) -> None:
+    """Worker that becomes ready only the first time it's started."""
+    if not marker.exists():
+        marker.touch()
+        ready_event.set()
+    with suppress(KeyboardInterrupt):
+        time.sleep(60)
+
+
+def hanging_worker(
+    args: WorkerArgs,
+    ready_event: EventType,
+    worker_loads: WorkerLoads,
+) -> None:
+    """Worker that reports once and then blocks."""
+    faulthandler.register(signal.SIGUSR1)
+    worker_loads.write(
+        get_worker_num(),
+        WorkerLoad(busy=0, queued=0, capacity=0, loop_lag=0),
+    )
+    ready_event.set()
+    with suppress(KeyboardInterrupt):
+        time.sleep(60)
+
+
+@pytest.fixture(autouse=True)
+def restore_signals() -> Generator[None, None, None]:
+    """Restore signal handlers set by process manager."""
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+    }
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+@contextmanager
+def run_manager(
+    worker_function: Any,
+    **kwargs: Any,
+) -> Generator[ProcessManager, None, None]:
+    """
+    Run process manager in a separate thread.
+
+    :param worker_function: function of worker processes.
+    :param kwargs: worker arguments.
+    :yield: running process manager.
+    """
+    manager = ProcessManager(
+        args=WorkerArgs(broker="", modules=[], **kwargs),
+        worker_function=worker_function,
+    )
+    status: Optional[Any] = None
+
+    def run() -> None:
+        nonlocal status
+        status = manager.start()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        yield manager
+    finally:
+        manager.action_queue.put(ShutdownAction())
+        thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert status is None
+
+
+@pytest.fixture
+def manager() -> Generator[ProcessManager, None, None]:
+    """Process manager running in a separate thread."""
+    with run_manager(sleeping_worker, workers=2) as manager:
+        yield manager
+
+
+def _wait_for(condition: Any, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def test_restart_latency(manager: ProcessManager) -> None:
+    """Tests that dead workers are restarted right away."""
+    _wait_for(lambda: len(manager.workers) == 2)
+    old_worker = manager.workers[0]
+
+    assert old_worker.pid is not None
+    os.kill(old_worker.pid, signal.SIGKILL)
+    _wait_for(lambda: manager.last_restart_latency is not None)
+
+    assert manager.workers[0] is not old_worker
+    assert manager.workers[0].is_alive()
+    assert manager.last_restart_latency is not None
+    assert manager.last_restart_latency < 0.5
+
+
+@pytest.mark.parametrize(
+    ("worker_function", "timeout", "min_time", "max_time"),
+    [
+        # Workers start in parallel.
+        (slow_worker, 60, 0.3, 0.55),
+        (stuck_worker, 0.2, 0.2, 0.5),
+    ],
+)
+def test_startup_readiness(
+    worker_function: Any,
+    timeout: float,
+    min_time: float,
+    max_time: float,
+) -> None:
+    """Tests that manager waits for all workers to become ready."""
+    manager = ProcessManager(
+        args=WorkerArgs(
+            broker="",
+            modules=[],
+            workers=2,
+            worker_startup_timeout=timeout,
+        ),
+        worker_function=worker_function,
+    )
+    start = time.monotonic()
+    try:
+        manager.prepare_workers()
+        elapsed = time.monotonic() - start
+    finally:
+        for worker in manager.workers:
+            worker.kill()
+            worker.join()
+
+    assert min_time <= elapsed < max_time
+
+
+@pytest.mark.parametrize(
+    ("batch_size", "min_time", "max_time"),
+    [
+        (1, 0.9, 1.5),
+        (3, 0.3, 0.7),
+    ],
+)
+def test_rolling_reload(batch_size: int, min_time: float, max_time: float) -> None:
+    """Tests that workers are reloaded in batches."""
+    with run_manager(
+        slow_worker,
+        workers=3,
+        reload_batch_size=batch_size,
+    ) as manager:
+        _wait_for(lambda: len(manager.workers) == 3)
+        old_workers = list(manager.workers)
+
+        start = time.monotonic()
+        manager.action_queue.put(ReloadAllAction())
+        _wait_for(lambda: not set(manager.workers) & set(old_workers))
+        _wait_for(lambda: manager.metrics.collect()["workers_reload_in_progress"] == 0)
+        elapsed = time.monotonic() - start
+
+        assert manager.metrics.collect()["workers_reloaded"] == 3
+        # Old workers exit and are removed.
+        _wait_for(lambda: not manager.zombie_workers)
+
+    assert min_time <= elapsed < max_time
+
+
+def test_reload_doesnt_block(tmp_path: Path) -> None:
+    """Tests that manager handles events while new workers are starting."""
+    with run_manager(
+        partial(stuck_on_reload_worker, marker=tmp_path / "started"),
+        workers=1,
+        worker_startup_timeout=60,
+    ) as manager:
+        _wait_for(lambda: len(manager.workers) == 1)
+        old_worker = manager.workers[0]
+        manager.action_queue.put(ReloadAllAction())
+        _wait_for(lambda: manager.workers[0] is not old_worker)
+        _wait_for(lambda: not manager.zombie_workers)
+
+        assert 0 in manager.starting_workers
+        assert manager.metrics.collect()["workers_reload_in_progress"] == 1
+        start = time.monotonic()
+    # Shutdown isn't delayed by the worker that isn't ready.
+    assert time.monotonic() - start < 1
+
+
+def test_shutdown_during_reload() -> None:
+    """Tests that shutdown doesn't wait for the rest of reload batches."""
+    with run_manager(slow_worker, workers=3, reload_batch_size=1) as manager:
+        _wait_for(lambda: len(manager.workers) == 3)
+        old_workers = list(manager.workers)
+        manager.action_queue.put(ReloadAllAction())
+        _wait_for(lambda: manager.workers[0] is not old_workers[0])
+        start = time.monotonic()
+    # Shutdown is handled before the next batch.
+    assert time.monotonic() - start < 0.5
+    assert manager.workers[1:] == old_workers[1:]
+    assert manager.metrics.collect()["workers_reload_in_progress"] == 1
+
+
+@pytest.mark.parametrize("hang_action", ["restart", "dump"])
+def test_hung_worker(hang_action: str) -> None:
+    """Tests that workers without heartbeats are detected."""
+    with run_manager(
+        hanging_worker,
+        workers=1,
+        hang_timeout=0.3,
+        hang_action=hang_action,
+    ) as manager:
+        _wait_for(lambda: len(manager.workers) == 1)
+        old_worker = manager.workers[0]
+        _wait_for(lambda: old_worker.pid in manager.hung_workers)
+
+        if hang_action == "restart":
+            _wait_for(lambda: manager.workers[0] is not old_worker)
+            assert not old_worker.is_alive()
+        else:
+            time.sleep(1.5)
+            assert manager.workers[0] is old_worker
+            assert old_worker.is_alive()
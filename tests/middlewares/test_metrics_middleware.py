@@ -0,0 +1,42 @@
+from taskiq.message import TaskiqMessage
+from taskiq.metrics import MetricsRegistry
+from taskiq.middlewares.metrics_middleware import MetricsMiddleware
+from taskiq.result import TaskiqResult
+
+
+def test_metrics_middleware() -> None:
+    registry = MetricsRegistry()
+    middleware = MetricsMiddleware(registry)
+    message = TaskiqMessage(
+        task_id="test_id",
+        task_name="meme",
+        labels={},
+        args=[],
+        kwargs={},
+    )
+
+    middleware.pre_execute(message)
+    middleware.post_execute(
+        message,
+        TaskiqResult(is_err=False, return_value=None, execution_time=0.2),
+    )
+    middleware.post_execute(
+        message,
+        TaskiqResult(is_err=True, return_value=None, execution_time=0.3),
+    )
+    middleware.post_save(
+        message,
+        TaskiqResult(is_err=False, return_value=None, execution_time=0.2),
+    )
+
+    assert middleware.received_tasks.labels("meme").values() == [1]
+    assert middleware.success_tasks.labels("meme").values() == [1]
+    assert middleware.found_errors.labels("meme").values() == [1]
+    assert middleware.saved_results.labels("meme").values() == [1]
+    *buckets, total = middleware.execution_time.labels("meme").values()
+    assert sum(buckets) == 2
+    assert total == 0.5
+    middleware.on_slow_callback(message, 0.5)
+    middleware.on_slow_callback(None, 0.5)
+    assert middleware.slow_callbacks.labels("meme").values() == [1]
+    assert middleware.slow_callbacks.labels("").values() == [1]
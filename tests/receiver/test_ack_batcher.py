@@ -0,0 +1,63 @@
+from typing import List
+
+import pytest
+
+from taskiq.acks import AckableMessage
+from taskiq.receiver.ack_batcher import AckBatcher
+
+
+def _message() -> AckableMessage:
+    return AckableMessage(data=b"", ack=lambda: None)
+
+
+class _FailingFlush:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.acked: List[AckableMessage] = []
+
+    async def __call__(self, messages: List[AckableMessage]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker is down")
+        self.acked.extend(messages)
+
+
+@pytest.mark.anyio
+async def test_failed_flush_retried() -> None:
+    """Tests that messages of a failed flush are sent with the next one."""
+    flush = _FailingFlush(failures=1)
+    batcher = AckBatcher(flush, batch_size=2, flush_interval=100)
+    messages = [_message() for _ in range(3)]
+
+    await batcher.ack(messages[0])
+    await batcher.ack(messages[1])
+    assert flush.acked == []
+
+    await batcher.ack(messages[2])
+    assert flush.acked == messages
+
+
+@pytest.mark.anyio
+async def test_failed_flush_raised() -> None:
+    """Tests that the error is raised after all retries."""
+    flush = _FailingFlush(failures=2)
+    batcher = AckBatcher(flush, batch_size=1, flush_interval=100, max_retries=1)
+
+    await batcher.ack(_message())
+    with pytest.raises(ConnectionError):
+        await batcher.ack(_message())
+    assert batcher.pending == []
+
+
+@pytest.mark.anyio
+async def test_ack_after_close() -> None:
+    """Tests that acks after closing are sent immediately."""
+    flush = _FailingFlush(failures=0)
+    batcher = AckBatcher(flush, batch_size=10, flush_interval=100)
+    await batcher.close()
+
+    message = _message()
+    await batcher.ack(message)
+
+    assert flush.acked == [message]
+    assert batcher._timer is None
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from taskiq.metrics import metrics
+from taskiq.receiver import Receiver
+from taskiq.receiver.adaptive_prefetch import AdaptivePrefetch, ResizableSemaphore
+from tests.utils import AsyncQueueBroker
+
+
+@pytest.mark.anyio
+async def test_semaphore_grow() -> None:
+    """Tests that new permits are available right after growing."""
+    sem = ResizableSemaphore(0)
+    assert sem.locked()
+
+    sem.resize(2)
+
+    await asyncio.wait_for(sem.acquire(), timeout=0.1)
+    await asyncio.wait_for(sem.acquire(), timeout=0.1)
+    assert sem.locked()
+
+
+@pytest.mark.anyio
+async def test_semaphore_shrink() -> None:
+    """Tests that extra permits are absorbed on release."""
+    sem = ResizableSemaphore(2)
+    await sem.acquire()
+    await sem.acquire()
+
+    sem.resize(1)
+    sem.release()
+    assert sem.locked()
+    sem.release()
+    assert not sem.locked()
+
+
+def test_semaphore_shrink_cancelled() -> None:
+    """Tests that growing cancels pending shrinks."""
+    sem = ResizableSemaphore(0)
+    sem.resize(-2)
+    sem.resize(1)
+    assert not sem.locked()
+    assert sem.size == 1
+
+
+def test_window_covers_fetch_latency() -> None:
+    """Tests that the window grows when broker is slow comparing to tasks."""
+    controller = AdaptivePrefetch(
+        ResizableSemaphore(0),
+        min_size=0,
+        max_size=50,
+        max_async_tasks=10,
+    )
+    controller.observe_fetch(0.01)
+    controller.observe_execution(0.02)
+
+    controller.adjust(running=10)
+    assert controller.window == 5
+    assert metrics.collect()["prefetch_window"] == 5
+
+    # Free slots take new messages right away.
+    controller.adjust(running=7)
+    assert controller.window == 2
+
+
+def test_window_bounds() -> None:
+    """Tests that the window stays between its bounds."""
+    controller = AdaptivePrefetch(
+        ResizableSemaphore(1),
+        min_size=1,
+        max_size=3,
+        max_async_tasks=10,
+    )
+    controller.observe_fetch(1)
+    controller.observe_execution(0.001)
+    controller.adjust(running=10)
+    assert controller.window == 3
+
+    for _ in range(100):
+        controller.observe_fetch(0)
+    controller.adjust(running=0)
+    assert controller.window == 1
+
+
+@pytest.mark.anyio
+async def test_receiver_adaptive_prefetch() -> None:
+    """Tests that worker with adaptive prefetch executes all tasks."""
+    broker = AsyncQueueBroker()
+    executed = 0
+
+    @broker.task
+    async def my_task() -> None:
+        nonlocal executed
+        await asyncio.sleep(0.01)
+        executed += 1
+
+    for _ in range(20):
+        await my_task.kiq()
+
+    receiver = Receiver(
+        broker,
+        max_async_tasks=2,
+        max_prefetch=10,
+        max_tasks_to_execute=20,
+        adaptive_prefetch=True,
+    )
+    assert receiver.adaptive_prefetch is not None
+    await asyncio.wait_for(receiver.listen(), timeout=5)
+
+    assert executed == 20
+    assert receiver.adaptive_prefetch.execution_time is not None
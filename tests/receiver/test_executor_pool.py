@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator
+
+import pytest
+
+from taskiq.message import TaskiqMessage
+from taskiq.metrics import metrics
+from taskiq.receiver import Receiver
+from taskiq.receiver.executor_pool import ExecutorPool
+from tests.utils import AsyncQueueBroker
+
+broker = AsyncQueueBroker()
+
+
+@broker.task("db_task", executor="db")
+def db_task() -> str:
+    return threading.current_thread().name
+
+
+@broker.task("default_task")
+def default_task() -> str:
+    return threading.current_thread().name
+
+
+def _message(task_name: str, **labels: str) -> TaskiqMessage:
+    return TaskiqMessage(
+        task_id="",
+        task_name=task_name,
+        labels=labels,
+        args=[],
+        kwargs={},
+    )
+
+
+@pytest.fixture
+def receiver() -> Generator[Receiver, None, None]:
+    default = ThreadPoolExecutor(2, thread_name_prefix="default")
+    db = ThreadPoolExecutor(1, thread_name_prefix="db")
+    yield Receiver(broker, executor=default, executors={"db": db})
+    default.shutdown()
+    db.shutdown()
+
+
+@pytest.mark.anyio
+async def test_executor_label(receiver: Receiver) -> None:
+    """Tests that sync tasks are executed in pools from their labels."""
+    result = await receiver.run_task(db_task.original_func, _message("db_task"))
+    assert result.return_value.startswith("db")
+
+    result = await receiver.run_task(
+        default_task.original_func,
+        _message("default_task"),
+    )
+    assert result.return_value.startswith("default")
+
+    # Labels of the message override labels of the task.
+    result = await receiver.run_task(
+        default_task.original_func,
+        _message("default_task", executor="db"),
+    )
+    assert result.return_value.startswith("db")
+
+
+@pytest.mark.anyio
+async def test_unknown_executor(receiver: Receiver) -> None:
+    """Tests that tasks with unknown executors use the default one."""
+    result = await receiver.run_task(
+        default_task.original_func,
+        _message("default_task", executor="unknown"),
+    )
+    assert result.return_value.startswith("default")
+    assert receiver.unknown_executors == {"unknown"}
+
+
+def test_pool_metrics() -> None:
+    """Tests that pools report their utilization."""
+    started = threading.Event()
+    finished = threading.Event()
+
+    def blocking_func() -> None:
+        started.set()
+        finished.wait(5)
+
+    with ThreadPoolExecutor(1) as executor:
+        pool = ExecutorPool("metrics_test", executor, size=1)
+        first = pool.submit(blocking_func)
+        second = pool.submit(blocking_func)
+        started.wait(5)
+
+        families = metrics.families()
+        values = {
+            info.name: series[("metrics_test",)][0]
+            for info, series in families.items()
+            if info.name.startswith("executor_")
+        }
+        assert values == {
+            "executor_busy_threads": 1,
+            "executor_queued_tasks": 1,
+            "executor_threads": 1,
+        }
+
+        assert second.cancel()
+        finished.set()
+        first.result(timeout=5)
+
+    assert pool.busy == 0
+    assert pool.queued == 0
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+import pytest
+
+from taskiq.message import TaskiqMessage
+from taskiq.metrics import MetricsRegistry
+from taskiq.receiver.loop_monitor import LoopMonitor
+
+
+@pytest.mark.anyio
+async def test_blocking_task() -> None:
+    """Tests that blocks of the loop are attributed to tasks."""
+    blocks: List[Tuple[Optional[TaskiqMessage], float]] = []
+    registry = MetricsRegistry()
+    monitor = LoopMonitor(
+        threshold=0.1,
+        on_block=lambda message, lag: blocks.append((message, lag)),
+        interval=0.01,
+        registry=registry,
+    )
+    message = TaskiqMessage(
+        task_id="blocking_id",
+        task_name="blocking",
+        labels={},
+        args=[],
+        kwargs={},
+    )
+
+    async def blocking_task() -> None:
+        monitor.track(message)
+        time.sleep(0.3)
+
+    monitor_task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    await asyncio.create_task(blocking_task())
+    await asyncio.sleep(0.05)
+    monitor_task.cancel()
+
+    [(blocking_message, lag)] = blocks
+    assert blocking_message == message
+    assert lag >= 0.2
+    assert not monitor.messages
+    *buckets, total = monitor.lag.values()
+    assert sum(buckets) > 1
+    assert total >= 0.2
+
+
+@pytest.mark.anyio
+async def test_unknown_culprit() -> None:
+    """Tests that blocks outside of tracked tasks are reported too."""
+    blocks: List[Tuple[Optional[TaskiqMessage], float]] = []
+    monitor = LoopMonitor(
+        threshold=0.1,
+        on_block=lambda message, lag: blocks.append((message, lag)),
+        interval=0.01,
+        registry=MetricsRegistry(),
+    )
+
+    monitor_task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    time.sleep(0.3)
+    await asyncio.sleep(0.05)
+    monitor_task.cancel()
+
+    assert [message for message, _ in blocks] == [None]
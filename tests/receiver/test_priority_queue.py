@@ -0,0 +1,170 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from taskiq.acks import AckableMessage
+from taskiq.brokers.inmemory_broker import InMemoryBroker
+from taskiq.message import TaskiqMessage
+from taskiq.receiver import Receiver
+from taskiq.receiver.priority_queue import PrioritizedMessage, PriorityPrefetchQueue
+from taskiq.receiver.receiver import QUEUE_DONE
+
+
+def _drain(queue: "asyncio.Queue[Tuple[str, float]]") -> List[str]:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait()[0])
+    return items
+
+
+@pytest.mark.anyio
+async def test_priority_order() -> None:
+    """Tests that items with higher priority are returned first."""
+    queue = PriorityPrefetchQueue(get_priority=lambda item: item[1])
+    for item in [("low", 0), ("high", 5), ("mid", 1), ("low2", 0), ("high2", 5)]:
+        queue.put_nowait(item)
+
+    assert _drain(queue) == ["high", "high2", "mid", "low", "low2"]
+
+
+@pytest.mark.anyio
+async def test_priority_starvation_limit() -> None:
+    """Tests that every item can be overtaken by a limited number of items."""
+    queue = PriorityPrefetchQueue(
+        get_priority=lambda item: item[1],
+        starvation_limit=3,
+    )
+    queue.put_nowait(("low", 0))
+    for idx in range(10):
+        queue.put_nowait((f"high{idx}", 1000))
+
+    assert 0 < _drain(queue).index("low") <= 3
+
+
+@pytest.mark.anyio
+async def test_priority_done_is_last() -> None:
+    """Tests that items with negative infinite priority are returned last."""
+    queue = PriorityPrefetchQueue(get_priority=lambda item: item[1])
+    queue.put_nowait(("done", float("-inf")))
+    queue.put_nowait(("low", 0))
+
+    assert _drain(queue) == ["low", "done"]
+
+
+@pytest.mark.anyio
+async def test_priority_negative() -> None:
+    """Tests that items with negative priority are returned after others."""
+    queue = PriorityPrefetchQueue(get_priority=lambda item: item[1])
+    queue.put_nowait(("negative", -5))
+    queue.put_nowait(("low", 0))
+    queue.put_nowait(("less_negative", -1))
+    queue.put_nowait(("done", float("-inf")))
+
+    assert _drain(queue) == ["low", "less_negative", "negative", "done"]
+
+
+@pytest.mark.anyio
+async def test_priority_not_finite() -> None:
+    """Tests that items with infinite or NaN priority don't break the order."""
+    queue = PriorityPrefetchQueue(get_priority=lambda item: item[1])
+    queue.put_nowait(("low", 0))
+    queue.put_nowait(("nan", float("nan")))
+    queue.put_nowait(("high", 5))
+    queue.put_nowait(("inf", float("inf")))
+    queue.put_nowait(("low2", 0))
+    queue.put_nowait(("mid", 1))
+
+    assert _drain(queue) == ["high", "mid", "low", "nan", "inf", "low2"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("priority", ["inf", "-inf", "nan"])
+async def test_receiver_priority_not_finite(priority: str) -> None:
+    """Tests that priority labels that aren't finite are replaced with 0."""
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    message = my_task.kicker().with_labels(priority=priority)._prepare_message()
+    receiver = Receiver(broker, priority_queue=True)
+
+    item = receiver._prioritize(broker.formatter.dumps(message).message)
+
+    assert item.priority == 0
+
+
+@pytest.mark.anyio
+async def test_receiver_priority_queue() -> None:
+    """Tests that receiver orders messages by priority label and field."""
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    def make_message(task_id: str, priority: int) -> bytes:
+        message = my_task.kicker().with_labels(priority=priority)._prepare_message()
+        message.task_id = task_id
+        return broker.formatter.dumps(message).message
+
+    receiver = Receiver(broker, priority_queue=True)
+    queue = receiver._create_queue()
+    await queue.put(receiver._prioritize(make_message("low", 0)))
+    await queue.put(QUEUE_DONE)
+    await queue.put(receiver._prioritize(make_message("high", 10)))
+    await queue.put(
+        receiver._prioritize(
+            AckableMessage(
+                data=make_message("native", 0),
+                ack=lambda: None,
+                priority=20,
+            ),
+        ),
+    )
+
+    received = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is QUEUE_DONE:
+            received.append("done")
+            continue
+        if item.taskiq_msg is None:
+            received.append(broker.formatter.loads(item.message.data).task_id)
+        else:
+            received.append(item.taskiq_msg.task_id)
+
+    assert received == ["native", "high", "low", "done"]
+
+
+@pytest.mark.anyio
+async def test_receiver_priority_decoded_once() -> None:
+    """Tests that prioritized messages aren't decoded again by callback."""
+    broker = InMemoryBroker()
+    calls = 0
+
+    @broker.task
+    async def my_task() -> int:
+        return 1
+
+    loads = broker.formatter.loads
+
+    def counting_loads(message: bytes) -> TaskiqMessage:
+        nonlocal calls
+        calls += 1
+        return loads(message)
+
+    receiver = Receiver(broker, priority_queue=True)
+    item = receiver._prioritize(
+        broker.formatter.dumps(my_task.kicker()._prepare_message()).message,
+    )
+    assert isinstance(item, PrioritizedMessage)
+    broker.formatter.loads = counting_loads  # type: ignore[method-assign]
+    await receiver.callback(item.message, taskiq_msg=item.taskiq_msg)
+
+    assert calls == 0
+    assert item.taskiq_msg is not None
+    result = await broker.result_backend.get_result(item.taskiq_msg.task_id)
+    assert result.return_value == 1
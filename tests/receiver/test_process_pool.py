@@ -0,0 +1,227 @@
+import multiprocessing
+import os
+import pickle
+import time
+from typing import Generator
+
+import pytest
+
+from taskiq.exceptions import TaskiqError, TaskTimeoutError
+from taskiq.message import TaskiqMessage
+from taskiq.receiver import Receiver
+from taskiq.receiver.process_pool import (
+    KillableProcessPool,
+    create_process_pool,
+    recv_object,
+    send_object,
+)
+from tests.utils import AsyncQueueBroker
+
+broker = AsyncQueueBroker()
+
+
+@broker.task("pid_task", process_pool=True)
+def pid_task(data: bytes) -> int:
+    return os.getpid() if data == b"\x00" * 1024 else -1
+
+
+@broker.task("thread_pid_task")
+def thread_pid_task() -> int:
+    return os.getpid()
+
+
+def stubborn_func() -> None:
+    """Function that ignores soft time limit."""
+    try:
+        time.sleep(5)
+    except TaskTimeoutError:
+        time.sleep(5)
+
+
+class UnpicklableError(Exception):
+    """Error that cannot be unpickled, because its args don't match __init__."""
+
+    def __init__(self, first: int, second: int) -> None:
+        super().__init__(f"{first} {second}")
+
+
+def raise_unpicklable() -> None:
+    raise UnpicklableError(1, 2)
+
+
+@pytest.fixture(scope="module")
+def process_pool() -> Generator[object, None, None]:
+    pool = create_process_pool(
+        max_workers=1,
+        broker_path="tests.receiver.test_process_pool:broker",
+        modules=[],
+        tasks_pattern=["**/tasks.py"],
+        fs_discover=False,
+    )
+    yield pool
+    pool.shutdown()
+
+
+def _message(task_name: str, *args: object) -> TaskiqMessage:
+    return TaskiqMessage(
+        task_id="",
+        task_name=task_name,
+        labels={},
+        args=list(args),
+        kwargs={},
+    )
+
+
+@pytest.mark.anyio
+async def test_process_pool_label(process_pool: object) -> None:
+    """Tests that tasks with the label are executed in the process pool."""
+    receiver = Receiver(broker, process_pool=process_pool)  # type: ignore
+
+    result = await receiver.run_task(
+        pid_task.original_func,
+        _message(pid_task.task_name, b"\x00" * 1024),
+    )
+    assert not result.is_err
+    assert result.return_value not in (os.getpid(), -1)
+
+    result = await receiver.run_task(
+        thread_pid_task.original_func,
+        _message(thread_pid_task.task_name),
+    )
+    assert result.return_value == os.getpid()
+
+
+@pytest.mark.anyio
+async def test_process_pool_tasks(process_pool: object) -> None:
+    """Tests that tasks can be routed to the process pool by name."""
+    receiver = Receiver(
+        broker,
+        process_pool=process_pool,  # type: ignore
+        process_pool_tasks=[thread_pid_task.task_name],
+    )
+
+    result = await receiver.run_task(
+        thread_pid_task.original_func,
+        _message(thread_pid_task.task_name),
+    )
+    assert result.return_value != os.getpid()
+
+
+@pytest.mark.anyio
+async def test_process_pool_disabled() -> None:
+    """Tests that sync tasks are executed in threads without the pool."""
+    receiver = Receiver(broker)
+
+    result = await receiver.run_task(
+        pid_task.original_func,
+        _message(pid_task.task_name, b"\x00" * 1024),
+    )
+    assert result.return_value == os.getpid()
+
+
+def test_soft_time_limit() -> None:
+    """Tests that functions are interrupted at the soft limit."""
+    pool = KillableProcessPool(max_workers=1, hard_timeout_grace=5)
+    try:
+        pid = pool.submit(os.getpid).result()
+        start = time.monotonic()
+        future = pool.submit_with_timeout(0.2, time.sleep, 5)
+        with pytest.raises(TaskTimeoutError):
+            future.result(timeout=2)
+        assert time.monotonic() - start < 1
+        # Process is reused.
+        assert pool.submit(os.getpid).result() == pid
+    finally:
+        pool.shutdown()
+
+
+def test_hard_time_limit() -> None:
+    """Tests that processes are killed at the hard limit."""
+    pool = KillableProcessPool(max_workers=2, hard_timeout_grace=0.2)
+    try:
+        pids = {pool.submit(os.getpid).result() for _ in range(2)}
+        start = time.monotonic()
+        future = pool.submit_with_timeout(0.2, stubborn_func)
+        with pytest.raises(TaskTimeoutError):
+            future.result(timeout=2)
+        assert time.monotonic() - start < 1
+        # Killed process is replaced.
+        assert pool.submit(time.sleep, 0).result(timeout=5) is None
+        assert len(pool.processes) == 2
+        assert {proc.process.pid for proc in pool.processes} != pids
+    finally:
+        pool.shutdown()
+
+
+def test_process_exit() -> None:
+    """Tests that pool works after unexpected exit of a process."""
+    pool = KillableProcessPool(max_workers=1)
+    try:
+        with pytest.raises(TaskiqError):
+            pool.submit(os._exit, 1).result(timeout=2)
+        assert pool.submit(sum, [1, 2]).result(timeout=5) == 3
+    finally:
+        pool.shutdown()
+
+
+def test_unpicklable_error() -> None:
+    """Tests that pool works after a result that cannot be unpickled."""
+    pool = KillableProcessPool(max_workers=1)
+    try:
+        with pytest.raises(TaskiqError, match="Cannot receive result"):
+            pool.submit(raise_unpicklable).result(timeout=5)
+        assert pool.submit(sum, [1, 2]).result(timeout=5) == 3
+    finally:
+        pool.shutdown()
+
+
+def test_pool_thread_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that functions fail if the pool thread fails."""
+
+    def broken_check(*_: object) -> None:
+        raise RuntimeError("Broken pool.")
+
+    pool = KillableProcessPool(max_workers=1)
+    monkeypatch.setattr(pool, "_check_process", broken_check)
+    try:
+        future = pool.submit(time.sleep, 5)
+        with pytest.raises(TaskiqError, match="Process pool has failed"):
+            future.result(timeout=2)
+        with pytest.raises(RuntimeError):
+            pool.submit(sum, [1, 2])
+    finally:
+        pool.shutdown()
+
+
+def test_out_of_band_buffers() -> None:
+    """Tests that buffers are sent separately from the pickle."""
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    data = bytearray(b"\x01" * 10_000)
+
+    send_object(writer, ([pickle.PickleBuffer(data)], {"key": "value"}))
+
+    assert len(reader.recv_bytes()) == 4
+    assert len(reader.recv_bytes()) < 1000
+    assert reader.recv_bytes() == data
+
+
+def test_object_round_trip() -> None:
+    """Tests that objects with buffers are received."""
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    data = bytearray(b"\x01" * 10_000)
+
+    send_object(writer, [pickle.PickleBuffer(data), {"key": "value"}])
+
+    buffer, mapping = recv_object(reader)
+    assert bytes(buffer) == data
+    assert mapping == {"key": "value"}
+
+
+def test_daemon_flag_restored() -> None:
+    """Tests that starting the pool doesn't change the current process."""
+    daemon = multiprocessing.current_process().daemon
+    pool = KillableProcessPool(max_workers=1)
+    try:
+        assert multiprocessing.current_process().daemon == daemon
+    finally:
+        pool.shutdown()
@@ -0,0 +1,165 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from taskiq.brokers.inmemory_broker import InMemoryBroker
+from taskiq.message import TaskiqMessage
+from taskiq.receiver import Receiver
+from taskiq.receiver.profiler import PROFILE_STATS_LABEL, should_profile
+
+
+def _message(
+    task_name: str = "profiled",
+    task_id: str = "profiled_id",
+    **labels: Any,
+) -> TaskiqMessage:
+    return TaskiqMessage(
+        task_id=task_id,
+        task_name=task_name,
+        labels=labels,
+        args=[],
+        kwargs={},
+    )
+
+
+def sync_work() -> int:
+    return sum(range(1000))
+
+
+def other_work() -> int:
+    return sum(range(1000))
+
+
+async def async_task() -> int:
+    await asyncio.sleep(0.01)
+    return sync_work()
+
+
+def sync_task() -> int:
+    return sync_work()
+
+
+async def other_task() -> None:
+    for _ in range(5):
+        other_work()
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (True, True),
+        ("true", True),
+        (1, True),
+        (False, False),
+        ("false", False),
+        (0, False),
+        ("invalid", False),
+    ],
+)
+def test_should_profile(value: Any, expected: bool) -> None:
+    """Tests values of the profile label."""
+    assert should_profile(value) == expected
+
+
+@pytest.mark.anyio
+async def test_profile_async() -> None:
+    """Tests that only steps of the profiled coroutine are profiled."""
+    receiver = Receiver(InMemoryBroker())
+
+    other = asyncio.create_task(other_task())
+    result = await receiver.run_task(async_task, _message(profile=True))
+    await other
+
+    assert result.return_value == sum(range(1000))
+    stats = result.labels[PROFILE_STATS_LABEL]
+    assert "sync_work" in stats
+    assert "other_work" not in stats
+
+
+@pytest.mark.anyio
+async def test_profile_sync() -> None:
+    """Tests that sync tasks are profiled in threads."""
+    receiver = Receiver(InMemoryBroker())
+
+    result = await receiver.run_task(sync_task, _message(profile="true"))
+
+    assert result.return_value == sum(range(1000))
+    assert "sync_work" in result.labels[PROFILE_STATS_LABEL]
+
+
+@pytest.mark.anyio
+async def test_no_profile() -> None:
+    """Tests that tasks without the label aren't profiled."""
+    receiver = Receiver(InMemoryBroker())
+
+    result = await receiver.run_task(async_task, _message())
+
+    assert PROFILE_STATS_LABEL not in result.labels
+
+
+@pytest.mark.anyio
+async def test_profile_dir(tmp_path: Path) -> None:
+    """Tests that profiles are saved to the directory."""
+    receiver = Receiver(InMemoryBroker(), profile_dir=str(tmp_path / "profiles"))
+
+    result = await receiver.run_task(async_task, _message(profile=True))
+
+    assert PROFILE_STATS_LABEL not in result.labels
+    assert (tmp_path / "profiles" / "profiled-profiled_id.prof").exists()
+
+
+@pytest.mark.anyio
+async def test_profile_dir_unsafe_names(tmp_path: Path) -> None:
+    """Tests that names of profile files are built from safe characters."""
+    receiver = Receiver(InMemoryBroker(), profile_dir=str(tmp_path / "profiles"))
+
+    await receiver.run_task(
+        async_task,
+        _message(task_name="tasks:my_task", task_id="../../id", profile=True),
+    )
+
+    assert [path.name for path in (tmp_path / "profiles").iterdir()] == [
+        "tasks_my_task-.._.._id.prof",
+    ]
+    assert not list(tmp_path.glob("*.prof"))
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 12),
+    reason="Profilers replace each other before Python 3.12.",
+)
+@pytest.mark.anyio
+async def test_profile_another_tool() -> None:
+    """Tests that tasks aren't profiled if another profiling tool is active."""
+    receiver = Receiver(InMemoryBroker())
+    tool_id = sys.monitoring.PROFILER_ID
+
+    sys.monitoring.use_tool_id(tool_id, "test")
+    try:
+        result = await receiver.run_task(async_task, _message(profile=True))
+    finally:
+        sys.monitoring.free_tool_id(tool_id)
+
+    assert result.return_value == sum(range(1000))
+    assert PROFILE_STATS_LABEL not in result.labels
+    assert not receiver.profiler.lock.locked()
+
+
+@pytest.mark.anyio
+async def test_profile_timeout() -> None:
+    """Tests that profiler is released after cancelled tasks."""
+    receiver = Receiver(InMemoryBroker())
+
+    async def slow_task() -> None:
+        await asyncio.sleep(1)
+
+    result = await receiver.run_task(slow_task, _message(profile=True, timeout=0.01))
+    assert result.is_err
+    assert PROFILE_STATS_LABEL in result.labels
+
+    result = await receiver.run_task(async_task, _message(profile=True))
+    assert "sync_work" in result.labels[PROFILE_STATS_LABEL]
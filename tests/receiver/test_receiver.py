@@ -1,5 +1,6 @@
 import asyncio
 import random
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, ClassVar, List, Optional
@@ -9,7 +10,9 @@ from taskiq_dependencies import Depends
 
 from taskiq.abc.broker import AckableMessage, AsyncBroker
 from taskiq.abc.middleware import TaskiqMiddleware
+from taskiq.acks import AcknowledgeType
 from taskiq.brokers.inmemory_broker import InMemoryBroker
+from taskiq.events import TaskiqEvents
 from taskiq.exceptions import NoResultError, TaskiqResultTimeoutError
 from taskiq.message import TaskiqMessage
 from taskiq.receiver import Receiver
@@ -152,6 +155,87 @@ async def test_run_timeouts_sync() -> None:
     assert result.is_err
 
 
+@pytest.mark.anyio
+async def test_run_timeouts_sync_frees_thread() -> None:
+    """Tests that timed out sync tasks don't keep executor's threads."""
+    stopped = False
+
+    def busy_func() -> None:
+        nonlocal stopped
+        try:
+            while True:
+                time.sleep(0.01)
+        finally:
+            stopped = True
+
+    receiver = Receiver(InMemoryBroker(), executor=ThreadPoolExecutor(max_workers=1))
+
+    result = await receiver.run_task(
+        busy_func,
+        TaskiqMessage(
+            task_id="",
+            task_name="",
+            labels={"timeout": "0.2"},
+            args=[],
+            kwargs={},
+        ),
+    )
+    assert result.is_err
+
+    result = await asyncio.wait_for(
+        receiver.run_task(
+            lambda: 1,
+            TaskiqMessage(task_id="", task_name="", labels={}, args=[], kwargs={}),
+        ),
+        timeout=1,
+    )
+    assert result.return_value == 1
+    assert stopped
+
+
+@pytest.mark.anyio
+async def test_run_timeouts_sync_blocked_in_c() -> None:
+    """
+    Tests that sync tasks blocked in C code keep their threads.
+
+    Timeout is raised in the thread only when
+    the function returns to python code.
+    """
+    release = threading.Event()
+
+    def blocked_func() -> None:
+        # Waiting for a lock is done in C code.
+        release.wait()
+
+    receiver = Receiver(InMemoryBroker(), executor=ThreadPoolExecutor(max_workers=1))
+
+    result = await receiver.run_task(
+        blocked_func,
+        TaskiqMessage(
+            task_id="",
+            task_name="",
+            labels={"timeout": "0.1"},
+            args=[],
+            kwargs={},
+        ),
+    )
+    assert result.is_err
+
+    quick_task = asyncio.create_task(
+        receiver.run_task(
+            lambda: 1,
+            TaskiqMessage(task_id="", task_name="", labels={}, args=[], kwargs={}),
+        ),
+    )
+    await asyncio.sleep(0.2)
+    # The only thread is still blocked.
+    assert not quick_task.done()
+
+    release.set()
+    result = await asyncio.wait_for(quick_task, timeout=1)
+    assert result.return_value == 1
+
+
 @pytest.mark.anyio
 async def test_run_task_exception_middlewares() -> None:
     """Tests that run_task can run sync tasks."""
@@ -472,3 +556,382 @@ async def test_error_result() -> None:
     assert resp.return_value is None
     assert not broker._running_tasks
     assert isinstance(resp.error, ValueError)
+
+
+def _get_ackable_message(broker: AsyncBroker, task_name: str, ack: Any) -> Any:
+    broker_message = broker.formatter.dumps(
+        TaskiqMessage(
+            task_id="task_id",
+            task_name=task_name,
+            labels={},
+            args=[],
+            kwargs={},
+        ),
+    )
+    return AckableMessage(data=broker_message.message, ack=ack)
+
+
+@pytest.mark.anyio
+async def test_batched_acks_by_size() -> None:
+    """Tests that acks are sent when the batch is full."""
+    broker = InMemoryBroker()
+    acked = 0
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    def ack_callback() -> None:
+        nonlocal acked
+        acked += 1
+
+    receiver = Receiver(broker, ack_batch_size=2, ack_batch_timeout=10)
+
+    await receiver.callback(
+        _get_ackable_message(broker, my_task.task_name, ack_callback),
+    )
+    assert acked == 0
+    await receiver.callback(
+        _get_ackable_message(broker, my_task.task_name, ack_callback),
+    )
+    assert acked == 2
+
+
+@pytest.mark.anyio
+async def test_batched_acks_by_time() -> None:
+    """Tests that acks are sent when the time window is over."""
+    broker = InMemoryBroker()
+    acked = 0
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    async def ack_callback() -> None:
+        nonlocal acked
+        acked += 1
+
+    receiver = Receiver(
+        broker,
+        ack_batch_size=100,
+        ack_batch_timeout=0.1,
+    )
+
+    await receiver.callback(
+        _get_ackable_message(broker, my_task.task_name, ack_callback),
+    )
+    assert acked == 0
+    await asyncio.sleep(0.3)
+    assert acked == 1
+
+
+@pytest.mark.anyio
+async def test_batched_acks_when_received() -> None:
+    """Tests that acks before execution aren't batched."""
+    broker = InMemoryBroker()
+    acked = 0
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    def ack_callback() -> None:
+        nonlocal acked
+        acked += 1
+
+    receiver = Receiver(
+        broker,
+        ack_batch_size=100,
+        ack_batch_timeout=100,
+        ack_type=AcknowledgeType.WHEN_RECEIVED,
+    )
+
+    await receiver.callback(
+        _get_ackable_message(broker, my_task.task_name, ack_callback),
+    )
+    assert acked == 1
+
+
+@pytest.mark.anyio
+async def test_batched_acks_flushed_on_exit() -> None:
+    """Tests that all pending acks are sent when listening is finished."""
+    broker = AsyncQueueBroker()
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    for _ in range(3):
+        await my_task.kiq()
+
+    receiver = Receiver(
+        broker,
+        max_async_tasks=10,
+        max_tasks_to_execute=3,
+        ack_batch_size=10,
+        ack_batch_timeout=100,
+    )
+    await asyncio.wait_for(receiver.listen(), timeout=2)
+    await asyncio.wait_for(broker.wait_tasks(), timeout=1)
+
+
+@pytest.mark.anyio
+async def test_execution_plan_middlewares_update() -> None:
+    """Tests that middlewares added after task preparation are used."""
+
+    class _TestMiddleware(TaskiqMiddleware):
+        def __init__(self) -> None:
+            super().__init__()
+            self.executed: List[str] = []
+
+        def post_execute(
+            self,
+            message: "TaskiqMessage",
+            result: "TaskiqResult[Any]",
+        ) -> None:
+            self.executed.append(message.task_id)
+
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    receiver = get_receiver(broker)
+    plan = receiver.execution_plans[my_task.task_name]
+    assert plan.is_coroutine
+    assert not plan.has_dependencies
+    assert plan.post_execute == ()
+
+    middleware = _TestMiddleware()
+    broker.add_middlewares(middleware)
+    broker_message = broker.formatter.dumps(
+        TaskiqMessage(
+            task_id="task_id",
+            task_name=my_task.task_name,
+            labels={},
+            args=[],
+            kwargs={},
+        ),
+    )
+    await receiver.callback(broker_message.message)
+
+    assert middleware.executed == ["task_id"]
+    assert len(receiver.execution_plans[my_task.task_name].post_execute) == 1
+
+
+@pytest.mark.anyio
+async def test_execution_plan_static_timeout() -> None:
+    """Tests that timeout from task labels is used by default."""
+    broker = InMemoryBroker()
+
+    @broker.task(timeout=0.3)
+    async def my_task() -> None:
+        await asyncio.sleep(2)
+
+    receiver = get_receiver(broker)
+
+    result = await receiver.run_task(
+        my_task.original_func,
+        TaskiqMessage(
+            task_id="",
+            task_name=my_task.task_name,
+            labels={},
+            args=[],
+            kwargs={},
+        ),
+    )
+    assert result.is_err
+    assert result.execution_time < 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("parse_in_executor", [True, False])
+async def test_run_task_strict_params(parse_in_executor: bool) -> None:
+    """Tests that invalid params fail the task in strict mode."""
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def my_task(param: int) -> int:
+        return param
+
+    receiver = Receiver(
+        broker,
+        executor=ThreadPoolExecutor(max_workers=1),
+        strict_params=True,
+        parse_in_executor=parse_in_executor,
+    )
+
+    def get_message(param: Any) -> TaskiqMessage:
+        return TaskiqMessage(
+            task_id="",
+            task_name=my_task.task_name,
+            labels={},
+            args=[param],
+            kwargs={},
+        )
+
+    result = await receiver.run_task(my_task.original_func, get_message("1"))
+    assert result.return_value == 1
+
+    result = await receiver.run_task(my_task.original_func, get_message("a"))
+    assert result.is_err
+    assert isinstance(result.error, ValueError)
+
+
+@pytest.mark.anyio
+async def test_task_concurrency_limit() -> None:
+    """Tests that saturated tasks don't block other tasks."""
+    broker = AsyncQueueBroker()
+    slow_running = 0
+    max_slow_running = 0
+    fast_done = 0
+
+    @broker.task(concurrency=1)
+    async def slow_task() -> None:
+        nonlocal slow_running, max_slow_running
+        slow_running += 1
+        max_slow_running = max(max_slow_running, slow_running)
+        await asyncio.sleep(0.2)
+        slow_running -= 1
+
+    @broker.task
+    async def fast_task() -> None:
+        nonlocal fast_done
+        fast_done += 1
+
+    for _ in range(3):
+        await slow_task.kiq()
+    for _ in range(3):
+        await fast_task.kiq()
+
+    receiver = get_receiver(broker, max_async_tasks=2)
+    listen_task = asyncio.create_task(receiver.listen())
+    await asyncio.sleep(0.1)
+    assert fast_done == 3
+    assert slow_running == 1
+    await asyncio.wait_for(broker.wait_tasks(), timeout=2)
+    assert max_slow_running == 1
+    listen_task.cancel()
+
+
+@pytest.mark.anyio
+async def test_task_concurrency_deferred_limit() -> None:
+    """Tests that saturated tasks don't drain the broker's queue."""
+    broker = AsyncQueueBroker()
+    event = asyncio.Event()
+
+    @broker.task(concurrency=1)
+    async def slow_task() -> None:
+        await event.wait()
+
+    for _ in range(10):
+        await slow_task.kiq()
+
+    receiver = get_receiver(broker, max_async_tasks=2)
+    listen_task = asyncio.create_task(receiver.listen())
+    await asyncio.sleep(0.1)
+    # Messages that were taken before the limit was exceeded
+    # wait too, but there are no more than max_async_tasks of them.
+    assert 2 < receiver.deferred_messages <= 4
+    # One task runs and other messages wait without slots.
+    assert len(receiver.running_tasks) == receiver.deferred_messages + 1
+    assert receiver.sem is not None
+    assert not receiver.sem.locked()
+    # Other messages stay in the broker.
+    assert broker.queue.qsize() >= 4
+
+    event.set()
+    await asyncio.wait_for(broker.wait_tasks(), timeout=2)
+    listen_task.cancel()
+
+
+@pytest.mark.anyio
+async def test_task_concurrency_cancel() -> None:
+    """Tests that waiting messages of saturated tasks can be cancelled."""
+    broker = AsyncQueueBroker()
+
+    @broker.task(concurrency=1)
+    async def slow_task() -> None:
+        await asyncio.sleep(10)
+
+    for _ in range(3):
+        await slow_task.kiq()
+
+    receiver = get_receiver(broker, max_async_tasks=3)
+    listen_task = asyncio.create_task(receiver.listen())
+    await asyncio.sleep(0.1)
+    assert receiver.deferred_messages == 2
+
+    running = list(receiver.running_tasks)
+    for task in running:
+        task.cancel()
+    await asyncio.wait_for(
+        asyncio.gather(*running, return_exceptions=True),
+        timeout=1,
+    )
+    assert receiver.deferred_messages == 0
+    assert receiver.slotless_tasks == set()
+    listen_task.cancel()
+
+
+@pytest.mark.anyio
+async def test_on_ready() -> None:
+    """Tests that on_ready is called after broker startup."""
+    broker = AsyncQueueBroker()
+    events: List[str] = []
+    broker.add_event_handler(
+        TaskiqEvents.WORKER_STARTUP,
+        lambda _: events.append("startup"),
+    )
+
+    @broker.task
+    async def my_task() -> None:
+        """Does nothing."""
+
+    await my_task.kiq()
+    broker.is_worker_process = True
+
+    receiver = Receiver(
+        broker,
+        max_tasks_to_execute=1,
+        on_ready=lambda _: events.append("ready"),
+    )
+    await asyncio.wait_for(receiver.listen(), timeout=2)
+
+    assert events == ["startup", "ready"]
+
+
+def test_receiver_positional_args() -> None:
+    """Tests that new options don't shift positional arguments."""
+    receiver = Receiver(
+        InMemoryBroker(),
+        None,
+        True,
+        None,
+        0,
+        True,
+        True,
+        None,
+        None,
+        5,
+        1.5,
+    )
+
+    assert receiver.max_tasks_to_execute == 5
+    assert receiver.wait_tasks_timeout == 1.5
+    with pytest.raises(TypeError):
+        Receiver(  # type: ignore[misc]
+            InMemoryBroker(),
+            None,
+            True,
+            None,
+            0,
+            True,
+            True,
+            None,
+            None,
+            5,
+            1.5,
+            None,
+        )
@@ -4,6 +4,7 @@ from typing import Any, Dict, List
 import pytest
 
 from taskiq.brokers.inmemory_broker import InMemoryBroker
+from taskiq.labels import prepare_labels
 from taskiq.schedule_sources.label_based import LabelScheduleSource
 from taskiq.scheduler.scheduled_task import ScheduledTask
 
@@ -55,3 +56,31 @@ async def test_label_discovery_no_cron() -> None:
     source = LabelScheduleSource(broker)
     schedules = await source.get_schedules()
     assert schedules == []
+
+
+def test_post_send_prepared_labels() -> None:
+    """Tests that removed time schedules aren't sent with the task's labels."""
+    broker = InMemoryBroker()
+    first, second = datetime(2030, 1, 1), datetime(2030, 1, 2)
+
+    @broker.task(
+        task_name="test_task",
+        schedule=[{"time": first}, {"time": second}],
+    )
+    def task() -> None:
+        pass
+
+    before = task.kicker()._prepare_message().labels["schedule"]
+    LabelScheduleSource(broker).post_send(
+        ScheduledTask(
+            task_name="test_task",
+            labels={},
+            args=[],
+            kwargs={},
+            time=first,
+        ),
+    )
+
+    after = task.kicker()._prepare_message().labels["schedule"]
+    assert after != before
+    assert task.prepared_labels() == prepare_labels(task.labels)
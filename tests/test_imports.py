@@ -0,0 +1,144 @@
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+import taskiq
+
+# Budget of `import taskiq` in milliseconds. It's much larger
+# than the actual time, so the check isn't flaky on slow machines,
+# but it fails if heavy modules are imported eagerly again.
+IMPORT_TIME_BUDGET_MS = 50
+# Budget of importing InMemoryBroker and sending a task with it.
+# Most of this time is spent importing pydantic and asyncio,
+# which taskiq needs to send anything.
+KIQ_TIME_BUDGET_MS = 1000
+
+# Imports InMemoryBroker and sends a task like a client does.
+KIQ_CODE = """
+import asyncio
+import sys
+from time import perf_counter
+
+start = perf_counter()
+from taskiq import InMemoryBroker
+
+broker = InMemoryBroker()
+
+
+@broker.task
+async def my_task() -> None:
+    pass
+
+
+asyncio.run(my_task.kiq())
+print((perf_counter() - start) * 1000)
+print(" ".join(sys.modules))
+"""
+
+
+def _run(code: str, *options: str) -> "subprocess.CompletedProcess[str]":
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def _import_time_ms(stderr: str) -> float:
+    """
+    Get time of `import taskiq` from `-X importtime` output.
+
+    :param stderr: output of the interpreter.
+    :return: cumulative time in milliseconds.
+    """
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented, so only the top-level import matches.
+        if name.rstrip() == " taskiq":
+            return int(cumulative) / 1000
+    raise AssertionError("taskiq wasn't imported.")
+
+
+def test_public_names() -> None:
+    """Tests that all public names can be imported."""
+    for name in taskiq.__all__:
+        assert getattr(taskiq, name) is not None
+    assert set(taskiq.__all__) <= set(dir(taskiq))
+
+
+def test_unknown_name() -> None:
+    """Tests that unknown names raise AttributeError."""
+    with pytest.raises(AttributeError):
+        taskiq.unknown  # type: ignore[attr-defined]  # noqa: B018
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "zmq",
+        "prometheus_client",
+        "importlib.metadata",
+        "taskiq.brokers.zmq_broker",
+        "taskiq.middlewares.prometheus_middleware",
+        "taskiq.scheduler.scheduler",
+        "taskiq.receiver",
+    ],
+)
+def test_lazy_imports(module: str) -> None:
+    """Tests that `import taskiq` doesn't import heavy modules."""
+    result = _run(f"import sys, taskiq; print({module!r} in sys.modules)")
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "taskiq.receiver",
+        "taskiq.metrics",
+        "taskiq.cli.utils",
+    ],
+)
+def test_broker_lazy_imports(module: str) -> None:
+    """Tests that importing InMemoryBroker doesn't import the receiver."""
+    result = _run(
+        "import sys; from taskiq import InMemoryBroker; "
+        f"print({module!r} in sys.modules)",
+    )
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "multiprocessing",
+        "zmq",
+        "prometheus_client",
+        "taskiq.cli.utils",
+        "taskiq.receiver.process_pool",
+        "taskiq.scheduler.scheduler",
+    ],
+)
+def test_kiq_lazy_imports(module: str) -> None:
+    """Tests that sending a task with InMemoryBroker doesn't import heavy modules."""
+    modules = _run(KIQ_CODE).stdout.splitlines()[1].split()
+    assert module not in modules
+
+
+def test_kiq_time() -> None:
+    """Tests that importing InMemoryBroker and sending a task fits the budget."""
+    times: List[float] = [
+        float(_run(KIQ_CODE).stdout.splitlines()[0]) for _ in range(3)
+    ]
+    assert min(times) < KIQ_TIME_BUDGET_MS
+
+
+def test_import_time() -> None:
+    """Tests that `import taskiq` fits the budget."""
+    times: List[float] = [
+        _import_time_ms(_run("import taskiq", "-X", "importtime").stderr)
+        for _ in range(3)
+    ]
+    assert min(times) < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,158 @@
+import threading
+from multiprocessing import Process
+
+import pytest
+
+from taskiq.metrics import MetricsRegistry, SharedMetrics, render_metrics
+
+
+def _write_metrics(shared: SharedMetrics) -> None:
+    registry = MetricsRegistry()
+    slot = shared.claim()
+    assert slot is not None
+    registry.attach(slot)
+    registry.counter("tasks", "Tasks", ["task_name"]).labels("a").inc(2)
+
+
+def test_local_metrics() -> None:
+    """Tests that metrics work without shared memory."""
+    registry = MetricsRegistry()
+    counter = registry.counter("tasks", "Number of tasks", ["task_name"])
+    histogram = registry.histogram("time", "Time", buckets=[1, 2])
+
+    counter.labels("a").inc()
+    counter.labels("a").inc(2)
+    histogram.observe(0.5)
+    histogram.observe(1.5)
+    histogram.observe(3)
+
+    assert registry.counter("tasks", "Number of tasks") is counter
+    assert counter.labels("a").values() == [3]
+    # Observations in every bucket and their sum.
+    assert histogram.labels().values() == [1, 1, 1, 5]
+    with pytest.raises(ValueError):
+        counter.labels()
+    with pytest.raises(ValueError):
+        registry.gauge("tasks", "Number of tasks")
+
+
+def test_render() -> None:
+    """Tests that metrics are rendered in Prometheus format."""
+    registry = MetricsRegistry()
+    registry.counter("tasks", "Number of tasks", ["task_name"]).labels('a"b').inc()
+    registry.histogram("time", "Time", buckets=[1]).observe(0.5)
+    registry.gauge("window", "Window").set(3)
+
+    assert render_metrics(registry.families()).splitlines() == [
+        "# HELP tasks Number of tasks",
+        "# TYPE tasks counter",
+        'tasks_total{task_name="a\\"b"} 1.0',
+        "# HELP time Time",
+        "# TYPE time histogram",
+        'time_bucket{le="1.0"} 1.0',
+        'time_bucket{le="+Inf"} 1.0',
+        "time_count 1.0",
+        "time_sum 0.5",
+        "# HELP window Window",
+        "# TYPE window gauge",
+        "window 3.0",
+    ]
+
+
+def test_shared_metrics() -> None:
+    """Tests that metrics of processes are summed."""
+    shared = SharedMetrics(slots=2)
+    process = Process(target=_write_metrics, args=(shared,))
+    process.start()
+    process.join()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("tasks", "Tasks", ["task_name"])
+    gauge = registry.gauge("window", "Window")
+    counter.labels("a").inc()
+    gauge.set(5)
+    slot = shared.claim()
+    assert slot is not None
+    # Values are moved to shared memory.
+    registry.attach(slot)
+    counter.labels("a").inc()
+    counter.labels("b").inc()
+
+    families = shared.collect()
+    assert families[counter.info] == {("a",): [4], ("b",): [1]}
+    [window] = [info for info in families if info.name == "window"]
+    assert window.labelnames == ("pid",)
+    assert list(families[window].values()) == [[5]]
+
+    # Slots are full.
+    assert shared.claim() is None
+
+
+def test_release() -> None:
+    """Tests that counters of exited processes are kept."""
+    shared = SharedMetrics(slots=1)
+    process = Process(target=_write_metrics, args=(shared,))
+    process.start()
+    process.join()
+
+    shared.release(alive_pids=set())
+
+    [family] = shared.collect().values()
+    assert family == {("a",): [2]}
+    # Slot is free again.
+    assert shared.claim() is not None
+
+
+def test_full_slot() -> None:
+    """Tests that metrics still work if shared memory is full."""
+    # The description of the metric and one series.
+    shared = SharedMetrics(slots=1, max_series=2)
+    slot = shared.claim()
+    assert slot is not None
+    registry = MetricsRegistry()
+    registry.attach(slot)
+    counter = registry.counter("tasks", "Tasks", ["task_name"])
+
+    counter.labels("a").inc()
+    counter.labels("b").inc()
+
+    assert counter.labels("b").values() == [1]
+    assert shared.collect()[counter.info] == {("a",): [1]}
+
+
+def test_long_labels() -> None:
+    """Tests that series with long label values are shared."""
+    shared = SharedMetrics(slots=1)
+    slot = shared.claim()
+    assert slot is not None
+    registry = MetricsRegistry()
+    registry.attach(slot)
+    histogram = registry.histogram(
+        "time",
+        "Time of execution of tasks. " * 10,
+        ["task_name"],
+    )
+    task_name = "my_project.tasks." * 20
+
+    histogram.labels(task_name).observe(1)
+    histogram.labels("short").observe(1)
+
+    assert set(shared.collect()[histogram.info]) == {(task_name,), ("short",)}
+
+
+def test_concurrent_inc() -> None:
+    """Tests that counters can be incremented from several threads."""
+    registry = MetricsRegistry()
+    counter = registry.counter("tasks", "Tasks")
+
+    def inc() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=inc) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.labels().values() == [40_000]
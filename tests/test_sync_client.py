@@ -0,0 +1,73 @@
+import threading
+from typing import Generator, List
+
+import pytest
+
+from taskiq import InMemoryBroker, TaskiqEvents, TaskiqState
+
+
+@pytest.fixture
+def broker() -> Generator[InMemoryBroker, None, None]:
+    broker = InMemoryBroker()
+    yield broker
+    broker.sync_client.shutdown()
+
+
+def test_kiq_sync(broker: InMemoryBroker) -> None:
+    """Tests that tasks can be sent and awaited from sync code."""
+    startups: List[str] = []
+
+    @broker.on_event(TaskiqEvents.CLIENT_STARTUP)
+    def startup(_: TaskiqState) -> None:
+        startups.append(threading.current_thread().name)
+
+    @broker.task
+    async def add(a: int, b: int) -> int:
+        return a + b
+
+    task = add.kiq_sync(1, 2)
+    assert task.wait_result(check_interval=0.01, timeout=5).return_value == 3
+    assert task.is_ready()
+    assert task.get_result().return_value == 3
+
+    task = add.kicker().with_labels(label="value").kiq_sync(a=2, b=2)
+    result = task.wait_result(check_interval=0.01, timeout=5)
+    assert result.return_value == 4
+    assert result.labels["label"] == "value"
+
+    # The broker is started once in the background loop.
+    assert startups == ["taskiq-sync-client"]
+
+
+def test_shutdown(broker: InMemoryBroker) -> None:
+    """Tests that the client shuts down the broker and can be restarted."""
+    shutdowns: List[bool] = []
+
+    @broker.on_event(TaskiqEvents.CLIENT_SHUTDOWN)
+    def shutdown(_: TaskiqState) -> None:
+        shutdowns.append(True)
+
+    @broker.task
+    async def ping() -> str:
+        return "pong"
+
+    assert ping.kiq_sync().wait_result(timeout=5).return_value == "pong"
+    broker.sync_client.shutdown()
+    assert shutdowns == [True]
+    assert broker.sync_client.thread is None
+
+    assert ping.kiq_sync().wait_result(timeout=5).return_value == "pong"
+
+
+def test_own_loop(broker: InMemoryBroker) -> None:
+    """Tests that the client can't wait for itself."""
+
+    @broker.task
+    async def ping() -> str:
+        return "pong"
+
+    async def nested() -> None:
+        ping.kiq_sync()
+
+    with pytest.raises(RuntimeError):
+        broker.sync_client.run(nested())
@@ -0,0 +1,155 @@
+import asyncio
+import uuid
+from typing import Dict
+
+import pytest
+from mock import AsyncMock
+
+from taskiq import InMemoryBroker
+from taskiq.formatters.json_formatter import JSONFormatter
+from taskiq.kicker import AsyncKicker
+from taskiq.tracing import (
+    NOOP_TRACER,
+    TRACEPARENT_LABEL,
+    InMemorySpanExporter,
+    Span,
+    SpanContext,
+    Tracer,
+    current_span,
+    get_tracer,
+)
+
+
+def test_traceparent() -> None:
+    """Tests that span context is passed in W3C format."""
+    context = SpanContext(trace_id="a" * 32, span_id="b" * 16)
+
+    assert context.traceparent == f"00-{'a' * 32}-{'b' * 16}-01"
+    assert SpanContext.from_traceparent(context.traceparent) == context
+    assert SpanContext.from_traceparent("invalid") is None
+    assert SpanContext.from_traceparent(None) is None
+
+
+def test_disabled_tracer() -> None:
+    """Tests that disabled tracer doesn't create spans."""
+    tracer = Tracer()
+
+    with tracer.start_span("test") as span:
+        assert span is None
+        assert current_span() is None
+
+
+def test_nested_spans() -> None:
+    """Tests that spans are children of the current span."""
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with pytest.raises(ValueError), tracer.start_span("parent") as parent:
+        with tracer.start_span("child") as child:
+            assert current_span() is child
+        tracer.record_span("recorded", 1, 2)
+        raise ValueError
+
+    assert current_span() is None
+    assert [span.name for span in exporter.spans] == ["child", "recorded", "parent"]
+    assert parent is not None
+    assert isinstance(parent.error, ValueError)
+    assert parent.parent_id is None
+    for span in exporter.spans[:2]:
+        assert span.context.trace_id == parent.context.trace_id
+        assert span.parent_id == parent.context.span_id
+
+
+@pytest.mark.anyio
+async def test_trace_propagation() -> None:
+    """Tests that workers continue traces of clients."""
+    exporter = InMemorySpanExporter()
+    broker = InMemoryBroker().with_span_exporter(exporter)
+
+    @broker.task
+    async def task() -> None:
+        with broker.tracer.start_span("inner"):
+            pass
+
+    await task.kiq()
+    await asyncio.gather(*broker._running_tasks)
+
+    spans: Dict[str, Span] = {span.name: span for span in exporter.spans}
+    send = spans[f"send {task.task_name}"]
+    process = spans[f"process {task.task_name}"]
+    assert process.parent_id == send.context.span_id
+    assert process.context.trace_id == send.context.trace_id
+    assert send.attributes["taskiq.task_id"] == process.attributes["taskiq.task_id"]
+    for name in ("decode", "pre_execute", "execute", "set_result"):
+        assert spans[name].parent_id == process.context.span_id
+    assert spans["inner"].parent_id == spans["execute"].context.span_id
+
+
+@pytest.mark.anyio
+async def test_kiq_many_propagation() -> None:
+    """Tests that messages of a batch are sent in one span."""
+    exporter = InMemorySpanExporter()
+    broker = InMemoryBroker().with_span_exporter(exporter)
+    labels = []
+
+    @broker.task
+    async def task(value: int) -> None:
+        span = current_span()
+        assert span is not None
+        labels.append(span.context.trace_id)
+
+    await task.kicker().kiq_many([(1,), (2,)])
+    await asyncio.gather(*broker._running_tasks)
+
+    [send] = [span for span in exporter.spans if span.name.startswith("send")]
+    assert send.attributes["taskiq.messages"] == 2
+    assert labels == [send.context.trace_id] * 2
+
+
+@pytest.mark.anyio
+async def test_no_label_without_tracing() -> None:
+    """Tests that messages aren't changed if tracing is disabled."""
+    broker = InMemoryBroker()
+
+    @broker.task
+    async def task() -> None:
+        pass
+
+    message = task.kicker()._prepare_message()
+    assert TRACEPARENT_LABEL not in message.labels
+    result = await (await task.kiq()).wait_result()
+    assert TRACEPARENT_LABEL not in result.labels
+
+
+def test_broken_exporter() -> None:
+    """Tests that errors of the exporter don't break traced operations."""
+
+    class BrokenExporter(InMemorySpanExporter):
+        def export(self, span: Span) -> None:
+            raise RuntimeError("Exporter is down.")
+
+    tracer = Tracer(BrokenExporter())
+
+    with tracer.start_span("test") as span:
+        tracer.record_span("recorded", 1, 2)
+
+    assert span is not None
+    assert span.end_time is not None
+
+
+@pytest.mark.anyio
+async def test_broker_without_tracer() -> None:
+    """Tests that tasks are sent by brokers without a tracer."""
+    broker = AsyncMock()
+    broker.id_generator = lambda: uuid.uuid4().hex
+    broker.formatter = JSONFormatter()
+    broker.middlewares = []
+    kicker: "AsyncKicker[[], None]" = AsyncKicker("my_task", broker, {})
+
+    await kicker.kiq()
+    await kicker.kiq_many([(), ()])
+
+    assert get_tracer(broker) is NOOP_TRACER
+    assert get_tracer(InMemoryBroker()) is not NOOP_TRACER
+    broker.kick.assert_awaited_once()
+    broker.kick_batch.assert_awaited_once()